@@ -269,7 +269,12 @@ def create_app():
                 return jsonify({"error": "Insufficient credits"}), 403
                 
             # Process video
-            # result = VideoProcessor(os.getenv("OPENAI_API_KEY")).process_video(video_url, format_type)
+            # result = VideoProcessor(os.getenv("OPENAI_API_KEY")).process_video(
+            #     video_url,
+            #     plan=user.get('subscription', {}).get('plan_id'),
+            #     db=Database().db,
+            #     user_id=session['user_id']
+            # )
             
             # Deduct credit
             # Database().update_user_credits(user['_id'], -1)
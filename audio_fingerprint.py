@@ -0,0 +1,207 @@
+import logging
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+from bson.binary import Binary
+from pydub.utils import mediainfo
+from pymongo import ASCENDING
+
+from preprocess_audio import decode_pcm
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Decoding / framing parameters (Haitsma-Kalker style sub-fingerprints)
+SAMPLE_RATE = 5512
+FINGERPRINT_SECONDS = 180
+FRAME_SIZE = 2048
+HOP_SIZE = 256
+NUM_BANDS = 33
+MIN_FREQ = 300
+MAX_FREQ = 2000
+
+# Only every Nth sub-fingerprint is indexed in Mongo for candidate lookup
+INDEX_STRIDE = 8
+
+# Matching thresholds
+MIN_OVERLAP_FRAMES = 256
+MAX_BIT_ERROR_RATE = 0.35
+
+# Only the opening minutes are fingerprinted, so a match is reused only if
+# the whole audio is as long as the stored one (to within the larger of
+# these); uploads sharing an intro, or trimmed or extended cuts, don't match
+DURATION_TOLERANCE_SECONDS = 2.0
+DURATION_TOLERANCE_FRACTION = 0.01
+
+COLLECTION = "audio_fingerprints"
+
+
+def decode_audio(audio_path, max_seconds=FINGERPRINT_SECONDS):
+    """Decode the first minutes of an audio file to mono PCM samples."""
+    return decode_pcm(audio_path, SAMPLE_RATE, max_seconds)
+
+
+def audio_duration(audio_path):
+    """Duration of an audio file in seconds, read from its container without decoding."""
+    return float(mediainfo(audio_path)['duration'])
+
+
+def durations_match(duration, stored_duration):
+    """Whether two audio durations are close enough for one transcript to cover both."""
+    if duration is None or stored_duration is None:
+        return False
+    tolerance = max(DURATION_TOLERANCE_SECONDS, DURATION_TOLERANCE_FRACTION * duration)
+    return abs(duration - stored_duration) <= tolerance
+
+
+def _band_edges():
+    """FFT bin boundaries of the log-spaced energy bands."""
+    edges_hz = np.geomspace(MIN_FREQ, MAX_FREQ, NUM_BANDS + 1)
+    return np.round(edges_hz * FRAME_SIZE / SAMPLE_RATE).astype(np.int64)
+
+
+def fingerprint_samples(samples):
+    """
+    Compute 32-bit sub-fingerprints from mono PCM samples.
+
+    Each bit encodes the sign of the energy difference between adjacent
+    bands, differenced again against the previous frame.
+
+    Args:
+        samples (np.ndarray): Mono float samples at SAMPLE_RATE.
+
+    Returns:
+        np.ndarray: uint32 sub-fingerprint per frame.
+    """
+    if len(samples) < FRAME_SIZE + HOP_SIZE:
+        return np.zeros(0, dtype=np.uint32)
+
+    frame_count = 1 + (len(samples) - FRAME_SIZE) // HOP_SIZE
+    frames = np.lib.stride_tricks.sliding_window_view(samples, FRAME_SIZE)[::HOP_SIZE][:frame_count]
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(FRAME_SIZE), axis=1)) ** 2
+
+    edges = _band_edges()
+    energies = np.add.reduceat(spectrum[:, edges[0]:edges[-1]], edges[:-1] - edges[0], axis=1)
+
+    band_diff = energies[:, :-1] - energies[:, 1:]
+    bits = (band_diff[1:] - band_diff[:-1]) > 0
+
+    weights = (1 << np.arange(NUM_BANDS - 2, -1, -1, dtype=np.uint64))
+    return (bits.astype(np.uint64) @ weights).astype(np.uint32)
+
+
+def compute_fingerprint(audio_path, max_seconds=FINGERPRINT_SECONDS):
+    """Compute the acoustic fingerprint of an audio file."""
+    samples = decode_audio(audio_path, max_seconds)
+    fingerprint = fingerprint_samples(samples)
+    logger.info(f"Computed fingerprint for {audio_path}: {len(fingerprint)} frames")
+    return fingerprint
+
+
+def _index_hashes(fingerprint):
+    """Sampled, non-silent sub-fingerprints used as lookup keys."""
+    sampled = np.unique(fingerprint[::INDEX_STRIDE])
+    return [int(h) for h in sampled if h != 0]
+
+
+def bit_error_rate(query, reference, offset):
+    """Fraction of differing bits when reference is shifted by offset frames."""
+    start = max(0, -offset)
+    end = min(len(query), len(reference) - offset)
+    if end - start < MIN_OVERLAP_FRAMES:
+        return 1.0
+    diff = np.bitwise_xor(query[start:end], reference[start + offset:end + offset])
+    differing = np.unpackbits(diff.view(np.uint8)).sum()
+    return differing / (32.0 * (end - start))
+
+
+def match_fingerprints(query, reference, candidate_offsets=3):
+    """
+    Find the best alignment between two fingerprints.
+
+    Returns:
+        tuple: (bit_error_rate, offset) of the best alignment.
+    """
+    positions = {}
+    for j, h in enumerate(reference):
+        if h:
+            positions.setdefault(int(h), []).append(j)
+
+    offsets = Counter()
+    for i, h in enumerate(query):
+        for j in positions.get(int(h), ()):
+            offsets[j - i] += 1
+
+    best = (1.0, 0)
+    for offset, _ in offsets.most_common(candidate_offsets):
+        ber = bit_error_rate(query, reference, offset)
+        if ber < best[0]:
+            best = (ber, offset)
+    return best
+
+
+def ensure_indexes(db):
+    """Create the fingerprint collection indexes."""
+    db[COLLECTION].create_index([("index_hashes", ASCENDING)])
+    db[COLLECTION].create_index([("video_id", ASCENDING)], unique=True)
+
+
+def find_matching_transcript(db, fingerprint, duration, max_candidates=5):
+    """
+    Look up a previously transcribed upload with the same audio.
+
+    Args:
+        db: pymongo database handle.
+        fingerprint (np.ndarray): Fingerprint of the new audio.
+        duration (float): Duration of the new audio in seconds.
+
+    Returns:
+        dict: Matching fingerprint document (with transcript_hash), or None.
+    """
+    if len(fingerprint) < MIN_OVERLAP_FRAMES or duration is None:
+        return None
+
+    tolerance = max(DURATION_TOLERANCE_SECONDS, DURATION_TOLERANCE_FRACTION * duration)
+    query_hashes = [int(h) for h in np.unique(fingerprint) if h != 0]
+    candidates = db[COLLECTION].aggregate([
+        {"$match": {
+            "index_hashes": {"$in": query_hashes},
+            "transcript_hash": {"$exists": True},
+            "duration": {"$gte": duration - tolerance, "$lte": duration + tolerance}
+        }},
+        {"$project": {
+            "video_id": 1, "hashes": 1, "transcript_hash": 1, "duration": 1,
+            "hits": {"$size": {"$setIntersection": ["$index_hashes", query_hashes]}}
+        }},
+        {"$sort": {"hits": -1}},
+        {"$limit": max_candidates}
+    ])
+
+    for candidate in candidates:
+        if not durations_match(duration, candidate.get("duration")):
+            continue
+        reference = np.frombuffer(candidate["hashes"], dtype="<u4")
+        ber, offset = match_fingerprints(fingerprint, reference)
+        logger.info(f"Fingerprint candidate {candidate['video_id']}: BER={ber:.3f}, offset={offset}")
+        if ber <= MAX_BIT_ERROR_RATE:
+            return candidate
+    return None
+
+
+def save_fingerprint(db, video_id, fingerprint, transcript_hash, duration):
+    """Store a fingerprint with the audio duration and the content hash of the transcript it produced."""
+    db[COLLECTION].update_one(
+        {"video_id": video_id},
+        {"$set": {
+            "hashes": Binary(fingerprint.astype("<u4").tobytes()),
+            "index_hashes": _index_hashes(fingerprint),
+            "frame_count": len(fingerprint),
+            "duration": duration,
+            "transcript_hash": transcript_hash,
+            "updated_at": datetime.utcnow()
+        }},
+        upsert=True
+    )
+    logger.info(f"Saved fingerprint for video {video_id}")
@@ -1,12 +1,39 @@
-import openai
+import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from typing import List, Dict
 
+from config import KEY_POINTS_CONFIG
+from key_points_extractor import split_transcript_windows, extract_key_points_offline
+from llm_dispatcher import PRIORITY_HIGH
+from llm_router import routed_chat_completion
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DEFAULT_TITLES = {
+    "transcript": "Video Transcript",
+    "key_points": "Key Points",
+    "summary": "Video Summary"
+}
+
+# Concurrent follow-up calls when the structured response is incomplete
+FOLLOW_UP_WORKERS = 3
+
+# Completion tokens of the structured analysis: each key point, the summary
+# (about 250 characters), the three titles and the JSON around them
+ANALYSIS_TOKENS_PER_POINT = 40
+ANALYSIS_SUMMARY_TOKENS = 80
+ANALYSIS_TITLE_TOKENS = 60
+ANALYSIS_JSON_TOKENS = 40
+
+def analysis_tokens(max_points: int) -> int:
+    """Completion tokens a complete structured analysis with max_points key points needs."""
+    return max_points * ANALYSIS_TOKENS_PER_POINT + ANALYSIS_SUMMARY_TOKENS + ANALYSIS_TITLE_TOKENS + ANALYSIS_JSON_TOKENS
+
 class ChatGPTExtractor:
     def __init__(self, api_key: str = None):
         """Initialize the ChatGPT extractor with API key."""
@@ -14,7 +41,12 @@ class ChatGPTExtractor:
         if not self.api_key:
             raise ValueError("OpenAI API key is required")
         
-        openai.api_key = self.api_key
+
+    @staticmethod
+    def _clean_title(title: str) -> str:
+        """Strip quotes and truncate a generated title."""
+        title = title.strip().strip('"\'')
+        return title[:60] + '...' if len(title) > 60 else title
 
     def generate_title(self, text: str, content_type: str) -> str:
         """Generate an engaging title for the content."""
@@ -42,99 +74,185 @@ class ChatGPTExtractor:
                 Summary:
                 {text}"""
             
-            # Call ChatGPT API
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
+            response = routed_chat_completion(
+                "title", "chatgpt_generate_title", [
                     {"role": "system", "content": "You are a professional content writer that creates engaging, concise titles."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7,
-                max_tokens=60
+                api_key=self.api_key
             )
             
             # Extract and clean title
-            title = response.choices[0].message.content.strip()
-            # Remove quotes if present
-            title = title.strip('"\'')
-            # Truncate if too long
-            title = title[:60] + '...' if len(title) > 60 else title
-            
-            return title
+            return self._clean_title(response.choices[0].message.content)
             
         except Exception as e:
             logger.error(f"Error generating title: {str(e)}")
             return f"Video {content_type.title()}"
         
     def extract_key_points(self, transcript: str, max_points: int = 6) -> Dict:
-        """Extract key points from transcript using ChatGPT."""
+        """
+        Extract key points, a summary and titles from a transcript.
+
+        Everything comes back from one structured JSON request. Transcripts
+        longer than one window are first mapped to candidate points and the
+        structured request runs on those. Fields missing from the response
+        are filled in with concurrent follow-up calls.
+        """
         try:
-            # Prepare the prompt
-            prompt = f"""Extract the {max_points} most important key points from this video transcript. 
-            Focus on actionable insights and main concepts. Format each point as a clear, concise sentence.
-            Make sure each point is unique and provides valuable information.
-            Return ONLY bullet points, one per line, starting with a hyphen (-).
-            
-            Transcript:
-            {transcript}"""
-            
-            # Call ChatGPT API
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a professional content analyzer that extracts key points from video transcripts. Format all points as bullet points starting with a hyphen (-)"},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.5,
-                max_tokens=500
-            )
-            
-            # Extract key points from response
-            content = response.choices[0].message.content
-            key_points = [point.strip('- ').strip() for point in content.split('\n') if point.strip().startswith('-')]
+            windows = split_transcript_windows(transcript)
+            if len(windows) > 1:
+                material = "\n".join(f"- {point}" for point in self.map_key_points(windows))
+                source = "candidate key points"
+            else:
+                material = transcript
+                source = "transcript"
+            analysis = self.analyze_transcript(material, max_points, source) if material else None
+            key_points = analysis["key_points"] if analysis else []
+            if not key_points:
+                analysis = analysis or {"key_points": [], "summary": "", "titles": {}}
+                try:
+                    key_points = self._request_key_points(material, max_points) if material else []
+                except Exception as e:
+                    logger.error(f"Error requesting key points: {str(e)}")
+            if not key_points:
+                # OpenAI is failing or degraded: use the offline extractor
+                key_points = extract_key_points_offline(transcript, max_points)
             
             # Ensure we have a valid list of points
             if not key_points:
-                return {
-                    "key_points": ["No key points could be extracted"],
-                    "summary": "Failed to extract key points from transcript.",
-                    "titles": {
-                        "transcript": "Video Transcript",
-                        "key_points": "Key Points",
-                        "summary": "Video Summary"
-                    }
-                }
-            
-            # Generate summary
-            summary = self.generate_summary(transcript)
-            
-            # Generate titles
-            transcript_title = self.generate_title(transcript, "transcript")
-            key_points_title = self.generate_title("\n".join(key_points), "key_points")
-            summary_title = self.generate_title(summary, "summary")
-            
+                return self._empty_result("No key points could be extracted", "Failed to extract key points from transcript.")
+
+            summary = analysis["summary"] or self.generate_summary(material)
+            titles = self._complete_titles(analysis["titles"], material, key_points, summary)
+
             return {
                 "key_points": key_points[:max_points],
                 "summary": summary,
-                "titles": {
-                    "transcript": transcript_title,
-                    "key_points": key_points_title,
-                    "summary": summary_title
-                }
+                "titles": titles
             }
             
         except Exception as e:
             logger.error(f"Error extracting key points: {str(e)}")
-            return {
-                "key_points": ["Error extracting key points"],
-                "summary": "Error processing transcript",
-                "titles": {
-                    "transcript": "Video Transcript",
-                    "key_points": "Key Points",
-                    "summary": "Video Summary"
-                }
+            return self._empty_result("Error extracting key points", "Error processing transcript")
+
+    @staticmethod
+    def _empty_result(key_point: str, summary: str) -> Dict:
+        """Result returned when no key points could be extracted."""
+        return {
+            "key_points": [key_point],
+            "summary": summary,
+            "titles": dict(DEFAULT_TITLES)
+        }
+
+    def analyze_transcript(self, text: str, max_points: int = 6, source: str = "transcript") -> Dict:
+        """
+        Get key points, summary and titles for a text in one JSON request.
+
+        Returns:
+            dict: {"key_points": list, "summary": str, "titles": dict}; fields
+            the model didn't return (or a failed request) come back empty.
+        """
+        analysis = {"key_points": [], "summary": "", "titles": {}}
+        try:
+            prompt = f"""Analyze this video {source} and respond with a JSON object with these fields:
+            "key_points": a list of the {max_points} most important key points, most important first. Focus on actionable insights and main concepts, one clear, concise sentence each, no duplicates.
+            "summary": a concise summary of about 250 characters. Focus on the main message and key takeaways.
+            "titles": an object with short, engaging titles (max 60 characters) for the "transcript", the "key_points" and the "summary".
+
+            {source.capitalize()}:
+            {text}"""
+
+            response = routed_chat_completion(
+                "analysis", "chatgpt_analyze_transcript", [
+                    {"role": "system", "content": "You are a professional content analyzer that extracts key points, summaries and titles from video transcripts. Respond only with JSON."},
+                    {"role": "user", "content": prompt}
+                ],
+                api_key=self.api_key, priority=PRIORITY_HIGH, response_format={"type": "json_object"},
+                min_tokens=analysis_tokens(max_points)
+            )
+
+            choice = response.choices[0]
+            if choice.finish_reason == "length":
+                # Truncated JSON can't be parsed; the caller falls back to separate calls
+                logger.warning(f"Structured analysis of {source} hit its token limit")
+                return analysis
+            data = json.loads(choice.message.content)
+
+            analysis["key_points"] = [
+                str(point).strip('- ').strip() for point in data.get("key_points") or [] if str(point).strip()
+            ]
+            analysis["summary"] = str(data.get("summary") or "").strip()
+            titles = data.get("titles") if isinstance(data.get("titles"), dict) else {}
+            analysis["titles"] = {
+                name: self._clean_title(str(titles[name])) for name in DEFAULT_TITLES if titles.get(name)
             }
+
+        except Exception as e:
+            logger.error(f"Error analyzing {source}: {str(e)}")
+        return analysis
+
+    def _complete_titles(self, titles: Dict, material: str, key_points: List[str], summary: str) -> Dict:
+        """Generate any missing titles concurrently."""
+        sources = {
+            "transcript": material,
+            "key_points": "\n".join(key_points),
+            "summary": summary
+        }
+        missing = [name for name in DEFAULT_TITLES if not titles.get(name)]
+        if not missing:
+            return titles
+
+        logger.info(f"Generating missing titles: {', '.join(missing)}")
+        with ThreadPoolExecutor(max_workers=FOLLOW_UP_WORKERS) as executor:
+            futures = {
+                name: executor.submit(copy_context().run, self.generate_title, sources[name], name)
+                for name in missing
+            }
+            return {name: titles.get(name) or futures[name].result() for name in DEFAULT_TITLES}
     
+    def _request_key_points(self, transcript: str, max_points: int) -> List[str]:
+        """Ask ChatGPT for the key points of a transcript that fits one prompt."""
+        # Prepare the prompt
+        prompt = f"""Extract the {max_points} most important key points from this video transcript. 
+        Focus on actionable insights and main concepts. Format each point as a clear, concise sentence.
+        Make sure each point is unique and provides valuable information.
+        Return ONLY bullet points, one per line, starting with a hyphen (-).
+        
+        Transcript:
+        {transcript}"""
+        
+        response = routed_chat_completion(
+            "key_points", "chatgpt_extract_key_points", [
+                {"role": "system", "content": "You are a professional content analyzer that extracts key points from video transcripts. Format all points as bullet points starting with a hyphen (-)"},
+                {"role": "user", "content": prompt}
+            ],
+            api_key=self.api_key
+        )
+        
+        # Extract key points from response
+        content = response.choices[0].message.content
+        return [point.strip('- ').strip() for point in content.split('\n') if point.strip().startswith('-')]
+
+    def _window_key_points(self, window: str, window_number: int, max_points: int) -> List[str]:
+        """Extract candidate key points from one window of a long transcript."""
+        try:
+            return self._request_key_points(window, max_points)
+        except Exception as e:
+            logger.error(f"Error extracting key points for window {window_number}: {str(e)}")
+            return []
+
+    def map_key_points(self, windows: List[str]) -> List[str]:
+        """Extract candidate key points from each window of a long transcript concurrently."""
+        points_per_window = KEY_POINTS_CONFIG['points_per_window']
+        logger.info(f"Extracting candidate key points from {len(windows)} windows")
+
+        with ThreadPoolExecutor(max_workers=KEY_POINTS_CONFIG['map_workers']) as executor:
+            futures = [
+                executor.submit(copy_context().run, self._window_key_points, window, i, points_per_window)
+                for i, window in enumerate(windows, 1)
+            ]
+            return [point for future in futures for point in future.result()]
+
     def generate_summary(self, transcript: str, max_length: int = 250) -> str:
         """Generate a concise summary of the transcript."""
         try:
@@ -145,15 +263,12 @@ class ChatGPTExtractor:
             Transcript:
             {transcript}"""
             
-            # Call ChatGPT API
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
+            response = routed_chat_completion(
+                "summary", "chatgpt_generate_summary", [
                     {"role": "system", "content": "You are a professional content summarizer that creates concise, engaging summaries."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.5,
-                max_tokens=200
+                api_key=self.api_key
             )
             
             # Extract summary from response
@@ -165,11 +280,6 @@ class ChatGPTExtractor:
             logger.error(f"Error generating summary: {str(e)}")
             return "Failed to generate summary."
     
-    def get_token_count(self, text: str) -> int:
-        """Estimate the number of tokens in the text."""
-        # Rough estimation: 1 token ≈ 4 characters
-        return len(text) // 4
-    
     def calculate_cost(self, input_tokens: int, output_tokens: int) -> float:
         """Calculate the approximate cost of API call."""
         input_cost = (input_tokens / 1000) * 0.001  # $0.001 per 1K tokens
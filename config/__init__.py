@@ -25,6 +25,54 @@ DB_CONFIG = {
     'mongodb_uri': os.getenv('MONGODB_URI')
 }
 
+# Transcription configuration
+TRANSCRIPTION_CONFIG = {
+    # 'off' keeps real-time audio, 'plan' uses the plan's transcription_speed,
+    # 'auto' picks a factor from the estimated speech rate
+    'speed_mode': os.getenv('TRANSCRIPTION_SPEED_MODE', 'off'),
+    'max_speed_factor': float(os.getenv('TRANSCRIPTION_MAX_SPEED', '1.5')),
+    # Syllables per second the accelerated audio should not exceed
+    'target_speech_rate': float(os.getenv('TRANSCRIPTION_TARGET_SPEECH_RATE', '6.5')),
+    # Audio is transcribed in chunks of this length so extraction can start early
+    'chunk_seconds': int(os.getenv('TRANSCRIPTION_CHUNK_SECONDS', '300')),
+    # Each chunk also covers this much of the next one, so words at a cut are
+    # heard whole by one chunk; the duplicated segments are dropped when stitching
+    'chunk_overlap_seconds': float(os.getenv('TRANSCRIPTION_CHUNK_OVERLAP_SECONDS', '2'))
+}
+
+# Key point extraction configuration
+KEY_POINTS_CONFIG = {
+    # Transcripts longer than this are split into windows of about this many
+    # tokens, mapped to candidate points concurrently and reduced in one call
+    'window_tokens': int(os.getenv('KEY_POINTS_WINDOW_TOKENS', '3000')),
+    'map_workers': int(os.getenv('KEY_POINTS_MAP_WORKERS', '4')),
+    # Candidate points requested from each window
+    'points_per_window': int(os.getenv('KEY_POINTS_PER_WINDOW', '5')),
+    # Optional local pre-filter: only the best-scoring sentences, at most
+    # this fraction of them and this many tokens, are sent to the LLM
+    'prefilter_enabled': os.getenv('KEY_POINTS_PREFILTER', 'false').lower() == 'true',
+    'prefilter_keep_fraction': float(os.getenv('KEY_POINTS_PREFILTER_KEEP', '0.4')),
+    'prefilter_max_tokens': int(os.getenv('KEY_POINTS_PREFILTER_MAX_TOKENS', '2500'))
+}
+
+# Transcript normalization before LLM calls
+TRANSCRIPT_NORMALIZATION_CONFIG = {
+    # 'auto' strips disfluencies from transcripts of at least min_tokens,
+    # 'always' from every transcript, 'off' never
+    'mode': os.getenv('TRANSCRIPT_NORMALIZATION', 'auto'),
+    'min_tokens': int(os.getenv('TRANSCRIPT_NORMALIZATION_MIN_TOKENS', '1000'))
+}
+
+# Summary generation configuration
+SUMMARY_CONFIG = {
+    # 'auto' summarizes transcripts longer than one section hierarchically
+    # (sections in parallel, then one call for the summary and title),
+    # 'always' does it for every transcript, 'off' never
+    'hierarchical_mode': os.getenv('SUMMARY_HIERARCHICAL', 'auto'),
+    'section_tokens': int(os.getenv('SUMMARY_SECTION_TOKENS', '3000')),
+    'section_workers': int(os.getenv('SUMMARY_SECTION_WORKERS', '4'))
+}
+
 # Google OAuth configuration
 GOOGLE_CONFIG = {
     'client_id': os.getenv('GOOGLE_CLIENT_ID'),
@@ -0,0 +1,63 @@
+"""LLM routing configuration for VidPoint."""
+
+# Chat models a task can be routed to. Costs are USD per 1K tokens.
+LLM_MODELS = {
+    "gpt-4o-mini": {
+        "prompt_cost_per_1k": 0.00015,
+        "completion_cost_per_1k": 0.0006
+    },
+    "gpt-3.5-turbo": {
+        "prompt_cost_per_1k": 0.0005,
+        "completion_cost_per_1k": 0.0015
+    },
+    "gpt-4o": {
+        "prompt_cost_per_1k": 0.0025,
+        "completion_cost_per_1k": 0.01
+    }
+}
+
+# Per-plan model, temperature and completion token cap of each task type.
+# Tasks are:
+#   title            short titles for summaries and key point lists
+#   summary          prose summaries (with their title when hierarchical)
+#   key_points       key points of a whole transcript
+#   section_notes    candidate points of one transcript window (map step)
+#   section_summary  summary of one transcript section (map step)
+#   reduce           merging the section notes into key points
+#   analysis         structured JSON analysis (summary, points and titles)
+# Titles and map steps are cheap and go to the fast model on every plan;
+# paid plans get the stronger model where the output is the product.
+# max_tokens is further capped by the plan's max_tokens in PRICING_PLANS.
+# Routes can be overridden at runtime with an LLM_ROUTING_FILE (see llm_router).
+LLM_ROUTES = {
+    "free": {
+        "title": {"model": "gpt-4o-mini", "temperature": 0.7, "max_tokens": 50},
+        "summary": {"model": "gpt-4o-mini", "temperature": 0.5, "max_tokens": 300},
+        "key_points": {"model": "gpt-4o-mini", "temperature": 0.5, "max_tokens": 500},
+        "section_notes": {"model": "gpt-4o-mini", "temperature": 0.3, "max_tokens": 200},
+        "section_summary": {"model": "gpt-4o-mini", "temperature": 0.3, "max_tokens": 200},
+        "reduce": {"model": "gpt-4o-mini", "temperature": 0.5, "max_tokens": 400},
+        "analysis": {"model": "gpt-4o-mini", "temperature": 0.3, "max_tokens": 700}
+    },
+    "starter": {
+        "title": {"model": "gpt-4o-mini", "temperature": 0.7, "max_tokens": 50},
+        "summary": {"model": "gpt-4o-mini", "temperature": 0.5, "max_tokens": 300},
+        "key_points": {"model": "gpt-4o", "temperature": 0.5, "max_tokens": 500},
+        "section_notes": {"model": "gpt-4o-mini", "temperature": 0.3, "max_tokens": 200},
+        "section_summary": {"model": "gpt-4o-mini", "temperature": 0.3, "max_tokens": 200},
+        "reduce": {"model": "gpt-4o", "temperature": 0.5, "max_tokens": 400},
+        "analysis": {"model": "gpt-4o", "temperature": 0.3, "max_tokens": 700}
+    },
+    "pro": {
+        "title": {"model": "gpt-4o-mini", "temperature": 0.7, "max_tokens": 50},
+        "summary": {"model": "gpt-4o", "temperature": 0.5, "max_tokens": 400},
+        "key_points": {"model": "gpt-4o", "temperature": 0.5, "max_tokens": 600},
+        "section_notes": {"model": "gpt-4o-mini", "temperature": 0.3, "max_tokens": 250},
+        "section_summary": {"model": "gpt-4o-mini", "temperature": 0.3, "max_tokens": 250},
+        "reduce": {"model": "gpt-4o", "temperature": 0.5, "max_tokens": 600},
+        "analysis": {"model": "gpt-4o", "temperature": 0.3, "max_tokens": 900}
+    }
+}
+
+# Plan used for calls made outside a usage context or with an unknown plan
+DEFAULT_ROUTING_PLAN = "free"
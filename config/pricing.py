@@ -6,6 +6,7 @@ PRICING_PLANS = {
         "price": 0,
         "monthly_summaries": 3,
         "max_tokens": 200,
+        "transcription_speed": 1.5,
         "features": [
             "Word document export",
             "Basic support"
@@ -16,6 +17,7 @@ PRICING_PLANS = {
         "price": 4.99,
         "monthly_summaries": 50,
         "max_tokens": 500,
+        "transcription_speed": 1.25,
         "features": [
             "Word document export",
             "Priority email support",
@@ -27,6 +29,7 @@ PRICING_PLANS = {
         "price": 9.99,
         "monthly_summaries": 1000,
         "max_tokens": 2000,
+        "transcription_speed": 1.0,
         "features": [
             "Word document export",
             "Bulk processing",
@@ -0,0 +1,80 @@
+"""Transcription routing configuration for VidPoint."""
+
+# Engines a job can be routed to. Costs are USD per audio minute, speed is
+# the real-time factor (processing seconds per audio second) measured on
+# our workers, and quality is a relative rank (higher is better).
+TRANSCRIPTION_ENGINES = {
+    "captions": {
+        "engine": "captions",
+        "model": None,
+        "cost_per_minute": 0.0,
+        "realtime_factor": 0.0,
+        "overhead_seconds": 2,
+        "quality": 1,
+        "multilingual": True
+    },
+    "local-tiny": {
+        "engine": "local",
+        "model": "tiny.en",
+        "cost_per_minute": 0.0002,
+        "realtime_factor": 0.04,
+        "overhead_seconds": 1,
+        "quality": 1,
+        "multilingual": False
+    },
+    "local-base": {
+        "engine": "local",
+        "model": "base.en",
+        "cost_per_minute": 0.0004,
+        "realtime_factor": 0.08,
+        "overhead_seconds": 2,
+        "quality": 2,
+        "multilingual": False
+    },
+    "local-small": {
+        "engine": "local",
+        "model": "small",
+        "cost_per_minute": 0.001,
+        "realtime_factor": 0.25,
+        "overhead_seconds": 4,
+        "quality": 3,
+        "multilingual": True
+    },
+    "openai-whisper-1": {
+        "engine": "openai",
+        "model": "whisper-1",
+        "cost_per_minute": 0.006,
+        "realtime_factor": 0.05,
+        "overhead_seconds": 5,
+        "quality": 4,
+        "multilingual": True
+    }
+}
+
+# Per-plan routing policy: which caption tracks may replace transcription
+# ("any", "manual" or "none"), the cost and latency targets per job, and
+# the minimum quality rank acceptable for the plan.
+TRANSCRIPTION_ROUTING = {
+    "free": {
+        "captions": "any",
+        "max_cost_per_job": 0.02,
+        "target_latency_seconds": 300,
+        "min_quality": 1
+    },
+    "starter": {
+        "captions": "any",
+        "max_cost_per_job": 0.15,
+        "target_latency_seconds": 180,
+        "min_quality": 2
+    },
+    "pro": {
+        "captions": "manual",
+        "max_cost_per_job": 1.00,
+        "target_latency_seconds": 120,
+        "min_quality": 3
+    }
+}
+
+# Clips shorter than this always go to the highest-quality engine, where
+# the absolute cost difference is negligible
+SHORT_CLIP_SECONDS = 60
@@ -0,0 +1,173 @@
+import logging
+import os
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+from pymongo import DESCENDING, UpdateOne
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TERMS_COLLECTION = "corpus_terms"
+STATS_COLLECTION = "corpus_stats"
+STATS_ID = "idf"
+
+# The corpus table replaces per-transcript IDF once it has this many transcripts
+MIN_DOCUMENTS = int(os.getenv('CORPUS_IDF_MIN_DOCUMENTS', '20'))
+# Terms seen in fewer transcripts are not loaded; they score as unseen terms
+MIN_DOCUMENT_FREQUENCY = int(os.getenv('CORPUS_IDF_MIN_DF', '2'))
+# How often a worker reloads the table to pick up new transcripts
+REFRESH_SECONDS = int(os.getenv('CORPUS_IDF_REFRESH_SECONDS', '3600'))
+
+# Same tokenization and stop words as the per-transcript vectorizers
+analyze = TfidfVectorizer(stop_words='english').build_analyzer()
+
+
+class CorpusIDF:
+    """Document frequencies of terms across all stored transcripts."""
+
+    def __init__(self, documents, document_frequency):
+        self.documents = documents
+        self.document_frequency = document_frequency
+
+    @classmethod
+    def load(cls, db, min_df=MIN_DOCUMENT_FREQUENCY):
+        """Load the table stored by update_document_frequencies."""
+        stats = db[STATS_COLLECTION].find_one({"_id": STATS_ID}) or {}
+        terms = db[TERMS_COLLECTION].find({"df": {"$gte": min_df}}, {"df": 1})
+        return cls(stats.get("documents", 0), {term["_id"]: term["df"] for term in terms})
+
+    def idf(self, terms):
+        """
+        Smoothed IDF of each term, as TfidfVectorizer computes it.
+
+        Terms the corpus hasn't seen (often the most specific ones) get the
+        highest weight.
+        """
+        df = np.fromiter((self.document_frequency.get(term, 0) for term in terms), dtype=np.float64, count=len(terms))
+        return np.log((1 + self.documents) / (1 + df)) + 1
+
+
+_lock = threading.Lock()
+_db = None
+_corpus = None
+_loaded_at = 0.0
+
+
+def configure(db):
+    """Use the corpus table stored in this database for scoring in this process."""
+    global _db, _corpus, _loaded_at
+    with _lock:
+        _db = db
+        _corpus = None
+        _loaded_at = 0.0
+
+
+def get_corpus_idf():
+    """
+    The corpus table, loaded once per process and refreshed periodically.
+
+    Returns:
+        CorpusIDF: The table, or None if no database is configured, it can't
+        be read or it covers too few transcripts to beat per-transcript IDF.
+    """
+    global _corpus, _loaded_at
+    with _lock:
+        if _db is None:
+            return None
+        if time.time() - _loaded_at >= REFRESH_SECONDS:
+            # Set first so a failing database is retried on the next refresh, not every call
+            _loaded_at = time.time()
+            try:
+                _corpus = CorpusIDF.load(_db)
+                logger.info(
+                    f"Loaded corpus IDF: {len(_corpus.document_frequency)} terms "
+                    f"from {_corpus.documents} transcripts"
+                )
+            except Exception as e:
+                logger.warning(f"Could not load corpus IDF, using per-transcript IDF: {str(e)}")
+                _corpus = None
+        if _corpus is None or _corpus.documents < MIN_DOCUMENTS:
+            return None
+        return _corpus
+
+
+def tfidf_matrix(sentences, sublinear_tf=False):
+    """
+    L2-normalized sparse TF-IDF rows of sentences.
+
+    With a corpus table this only counts terms; IDF comes from the corpus.
+    Without one, IDF is fitted on the sentences themselves.
+    """
+    corpus = get_corpus_idf()
+    if corpus is None:
+        return TfidfVectorizer(stop_words='english', sublinear_tf=sublinear_tf).fit_transform(sentences)
+
+    counter = CountVectorizer(stop_words='english', dtype=np.float64)
+    counts = counter.fit_transform(sentences)
+    if sublinear_tf:
+        counts.data = np.log(counts.data) + 1
+    idf = corpus.idf(counter.get_feature_names_out())
+    return normalize(counts @ sparse.diags(idf), norm='l2', copy=False).tocsr()
+
+
+def ensure_indexes(db):
+    """Create the corpus term index."""
+    db[TERMS_COLLECTION].create_index([("df", DESCENDING)])
+
+
+def update_document_frequencies(db, text):
+    """Count one more transcript containing each of its terms."""
+    terms = set(analyze(text))
+    if terms:
+        db[TERMS_COLLECTION].bulk_write(
+            [UpdateOne({"_id": term}, {"$inc": {"df": 1}}, upsert=True) for term in terms],
+            ordered=False
+        )
+    db[STATS_COLLECTION].update_one({"_id": STATS_ID}, {"$inc": {"documents": 1}}, upsert=True)
+    return len(terms)
+
+
+def rebuild_document_frequencies(db, texts, batch_size=1000):
+    """
+    Recount the table from scratch over an iterable of transcript texts.
+
+    Counts are written to staging collections that replace the live ones
+    when done, so workers never load a half-built table.
+
+    Returns:
+        tuple: (documents, terms) counted.
+    """
+    counts = Counter()
+    documents = 0
+    for text in texts:
+        counts.update(set(analyze(text)))
+        documents += 1
+
+    staging_terms = db[f"{TERMS_COLLECTION}_rebuild"]
+    staging_stats = db[f"{STATS_COLLECTION}_rebuild"]
+    staging_terms.drop()
+    staging_stats.drop()
+    batch = []
+    for term, df in counts.items():
+        batch.append({"_id": term, "df": df})
+        if len(batch) >= batch_size:
+            staging_terms.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        staging_terms.insert_many(batch, ordered=False)
+    staging_stats.insert_one({"_id": STATS_ID, "documents": documents})
+
+    if counts:
+        staging_terms.rename(TERMS_COLLECTION, dropTarget=True)
+    else:
+        db[TERMS_COLLECTION].drop()
+    staging_stats.rename(STATS_COLLECTION, dropTarget=True)
+    ensure_indexes(db)
+    return documents, len(counts)
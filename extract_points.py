@@ -1,15 +1,67 @@
-from transformers import pipeline
-import re
-from sklearn.feature_extraction.text import TfidfVectorizer
 import numpy as np
 import logging
 
+from corpus_idf import tfidf_matrix
+from sentence_segmenter import split_sentences
+
+# Position weights: favor sentences near the beginning and end
+OPENING_FRACTION, OPENING_WEIGHT = 0.2, 1.5
+CLOSING_FRACTION, CLOSING_WEIGHT = 0.8, 1.2
+
+# Sentences longer than this many words are penalized
+LONG_SENTENCE_WORDS = 20
+LONG_SENTENCE_PENALTY = 0.8
+
+# Weight of the TF-IDF score against the position score
+TFIDF_WEIGHT = 0.7
+POSITION_WEIGHT = 0.3
+
 def split_into_sentences(text):
-    """Split text into sentences using regex"""
-    text = text.strip()
-    text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
-    sentences = re.split(r'[.!?]+\s*', text)
-    return [s.strip() for s in sentences if s.strip()]
+    """Split text into sentences, without their closing punctuation"""
+    sentences = (' '.join(sentence.split()).rstrip('.!?…') for sentence in split_sentences(text))
+    return [s for s in sentences if s]
+
+def score_sentences(sentences):
+    """
+    Score sentences by TF-IDF weight, position and length.
+
+    The TF-IDF matrix stays sparse and every weight is computed as a NumPy
+    array, so memory and time grow linearly with the transcript. IDF comes
+    from the stored transcript corpus when one is configured.
+
+    Returns:
+        numpy.ndarray: One score per sentence.
+    """
+    tfidf_scores = np.asarray(tfidf_matrix(sentences).sum(axis=1)).ravel()
+
+    count = len(sentences)
+    positions = np.arange(count)
+    position_scores = np.where(
+        positions < count * OPENING_FRACTION, OPENING_WEIGHT,
+        np.where(positions > count * CLOSING_FRACTION, CLOSING_WEIGHT, 1.0)
+    )
+
+    # Whitespace is normalized, so words are spaces plus one
+    word_counts = np.fromiter((s.count(' ') + 1 for s in sentences), dtype=np.int64, count=count)
+    length_penalties = np.where(word_counts > LONG_SENTENCE_WORDS, LONG_SENTENCE_PENALTY, 1.0)
+
+    return (TFIDF_WEIGHT * tfidf_scores + POSITION_WEIGHT * position_scores) * length_penalties
+
+def top_k_indices(scores, k):
+    """
+    Indices of the k highest scores, in ascending (transcript) order.
+
+    Selects in linear time with argpartition; ties at the cut-off go to the
+    earliest sentences.
+    """
+    if k >= len(scores):
+        return np.arange(len(scores))
+    if k <= 0:
+        return np.arange(0)
+    threshold = scores[np.argpartition(scores, -k)[-k]]
+    above = np.flatnonzero(scores > threshold)
+    ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+    return np.sort(np.concatenate([above, ties]))
 
 def extract_key_points(transcript, num_points=5):
     """Extract key points using TF-IDF and position-based scoring"""
@@ -19,39 +71,9 @@ def extract_key_points(transcript, num_points=5):
         if len(sentences) < num_points:
             return sentences
         
-        # Calculate TF-IDF scores
-        vectorizer = TfidfVectorizer(stop_words='english')
-        tfidf_matrix = vectorizer.fit_transform(sentences)
-        importance_scores = np.array([sum(row) for row in tfidf_matrix.toarray()])
-        
-        # Calculate final scores
-        final_scores = []
-        for i, sentence in enumerate(sentences):
-            # TF-IDF score
-            tfidf_score = importance_scores[i]
-            
-            # Position score (favor sentences near the beginning and end)
-            position_score = 1.0
-            if i < len(sentences) * 0.2:  # First 20%
-                position_score = 1.5
-            elif i > len(sentences) * 0.8:  # Last 20%
-                position_score = 1.2
-            
-            # Length penalty for very long sentences
-            length_penalty = 1.0
-            if len(sentence.split()) > 20:  # If sentence is longer than 20 words
-                length_penalty = 0.8
-            
-            # Combine scores
-            final_score = (0.7 * tfidf_score + 0.3 * position_score) * length_penalty
-            final_scores.append((sentence, final_score))
-        
-        # Sort by score and get top points
-        sorted_points = sorted(final_scores, key=lambda x: x[1], reverse=True)
-        key_points = [point[0] for point in sorted_points[:num_points]]
-        
-        # Sort points by their original order in the transcript
-        key_points.sort(key=lambda x: sentences.index(x))
+        # Pick the top points, kept in their original order in the transcript
+        scores = score_sentences(sentences)
+        key_points = [sentences[i] for i in top_k_indices(scores, num_points)]
         
         # Shorten and format points
         formatted_points = []
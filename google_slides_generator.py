@@ -6,6 +6,8 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from sentence_segmenter import split_sentences
+
 # If modifying these scopes, delete the file token.json.
 SCOPES = ['https://www.googleapis.com/auth/presentations']
 
@@ -116,7 +118,7 @@ def format_summary_for_slides(summary):
         list: A list of dictionaries containing slide content
     """
     # Split the summary into sentences
-    sentences = summary.split('. ')
+    sentences = split_sentences(summary)
     slides = []
     current_slide = []
     char_count = 0
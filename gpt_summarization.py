@@ -1,8 +1,15 @@
-import os
+import json
 import logging
-import openai
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from dotenv import load_dotenv
 
+from config import SUMMARY_CONFIG
+from key_points_extractor import split_transcript_windows
+from llm_dispatcher import PRIORITY_HIGH
+from llm_router import routed_chat_completion
+from transcript_store import load_content_hash, load_section_summaries, save_section_summaries
+
 # Load environment variables
 load_dotenv()
 
@@ -10,20 +17,17 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Configure OpenAI
-openai.api_key = os.getenv('OPENAI_API_KEY')
+# Completion tokens the title and JSON keys add to the combined summary
+TITLE_TOKENS = 40
 
 def generate_title(text):
     """Generate a title for the given text using GPT."""
     try:
-        response = openai.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
+        response = routed_chat_completion(
+            "title", "summary_title", [
                 {"role": "system", "content": "You are a professional content writer. Generate a concise, engaging title for the given text. The title should be 3-8 words and capture the main topic."},
                 {"role": "user", "content": f"Generate a title for this text:\n\n{text[:1000]}"}  # Use first 1000 chars for context
-            ],
-            max_tokens=30,
-            temperature=0.7
+            ]
         )
         title = response.choices[0].message.content.strip().strip('"')
         logger.info(f"Generated title: {title}")
@@ -32,20 +36,172 @@ def generate_title(text):
         logger.error(f"Error generating title: {str(e)}")
         return "Video Summary"
 
-def generate_summary(transcript, max_length=300):
+def summarize_section(section, section_number):
+    """
+    Summarize one section of a long transcript (map step).
+
+    Returns:
+        str: Section summary, or None if the call failed.
+    """
+    try:
+        response = routed_chat_completion(
+            "section_summary", "section_summary", [
+                {"role": "system", "content": "You are a professional content summarizer. You will receive one section of a longer transcript. Summarize what this section covers in a few sentences, keeping names, figures and conclusions."},
+                {"role": "user", "content": f"Summarize section {section_number}:\n\n{section}"}
+            ]
+        )
+        return response.choices[0].message.content.strip()
+    except Exception as e:
+        logger.error(f"Error summarizing section {section_number}: {str(e)}")
+        return None
+
+def summarize_sections(sections, max_workers=None):
+    """Summaries of transcript sections, requested concurrently, in section order."""
+    max_workers = max_workers or SUMMARY_CONFIG['section_workers']
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(copy_context().run, summarize_section, section, i)
+            for i, section in enumerate(sections, 1)
+        ]
+        return [future.result() for future in futures]
+
+def combine_section_summaries(section_summaries, max_length=300):
+    """
+    Summary and title of a transcript from its section summaries, in one call (reduce step).
+
+    The completion cap fits the whole summary plus its title, whatever the
+    route and plan caps are.
+
+    Returns:
+        dict: {"title", "content"}, or None if the call failed or its JSON
+        was truncated or invalid.
+    """
+    try:
+        sections_text = "\n\n".join(
+            f"Section {i}: {summary}" for i, summary in enumerate(section_summaries, 1) if summary
+        )
+        response = routed_chat_completion(
+            "summary", "summary_combine", [
+                {"role": "system", "content": "You are a professional content summarizer. You will receive summaries of consecutive sections of a transcript. Respond only with JSON."},
+                {"role": "user", "content": f"""Write a clear, concise summary of the whole transcript that captures its main points and key ideas, and a concise, engaging title of 3-8 words.
+Return a JSON object with "title" and "summary" strings.
+
+Section summaries:
+{sections_text}"""}
+            ],
+            max_tokens=max_length + TITLE_TOKENS, min_tokens=max_length + TITLE_TOKENS,
+            priority=PRIORITY_HIGH, response_format={"type": "json_object"}
+        )
+        choice = response.choices[0]
+        if choice.finish_reason == "length":
+            # Truncated JSON would end up in the summary; summarize the flat transcript instead
+            logger.warning("Combined summary hit its token limit")
+            return None
+        try:
+            data = json.loads(choice.message.content)
+            summary = str(data.get("summary") or "").strip()
+            title = str(data.get("title") or "").strip().strip('"')
+        except (ValueError, AttributeError):
+            logger.warning("Combined summary was not valid JSON")
+            return None
+        if not summary:
+            return None
+        return {
+            "title": title or generate_title(summary),
+            "content": summary
+        }
+    except Exception as e:
+        logger.error(f"Error combining section summaries: {str(e)}")
+        return None
+
+def generate_hierarchical_summary(sections, max_length=300, db=None, video_id=None, transcript_hash=None):
+    """
+    Summarize a transcript section by section, then summarize the summaries.
+
+    With db, video_id and transcript_hash, section summaries are reused from
+    and stored on the stored transcript, so re-exports only make the final
+    call.
+
+    Returns:
+        dict: {"title", "content", "sections"}, or None if it failed.
+    """
+    section_tokens = SUMMARY_CONFIG['section_tokens']
+    store = db is not None and video_id and transcript_hash
+
+    section_summaries = None
+    if store:
+        try:
+            section_summaries = load_section_summaries(db, video_id, transcript_hash, section_tokens)
+        except Exception as e:
+            logger.warning(f"Error loading section summaries for video {video_id}: {str(e)}")
+    if section_summaries:
+        logger.info(f"Reusing {len(section_summaries)} stored section summaries")
+    else:
+        logger.info(f"Summarizing {len(sections)} sections")
+        section_summaries = summarize_sections(sections)
+        # Incomplete sets are not stored, so the next export retries the failed sections
+        if store and all(section_summaries):
+            try:
+                save_section_summaries(db, video_id, transcript_hash, section_summaries, section_tokens)
+            except Exception as e:
+                logger.warning(f"Error saving section summaries for video {video_id}: {str(e)}")
+
+    if not any(section_summaries):
+        return None
+    result = combine_section_summaries(section_summaries, max_length)
+    if result is None:
+        return None
+    result["sections"] = section_summaries
+    return result
+
+def generate_summary(transcript, max_length=300, hierarchical=None, db=None, video_id=None, transcript_hash=None):
     """
     Summarize a transcript using OpenAI's GPT model.
+
+    Long transcripts are summarized hierarchically (see SUMMARY_CONFIG):
+    sections in parallel, then one call for the summary and its title.
+
+    Args:
+        transcript (str): Transcript text.
+        max_length (int): Token cap of the summary.
+        hierarchical (bool): Force the hierarchical mode on or off; defaults
+            to SUMMARY_CONFIG.
+        db: pymongo database holding the stored transcript, to reuse and
+            store section summaries.
+        video_id (str): Video of the stored transcript.
+        transcript_hash (str): Content hash of the stored transcript; looked
+            up when not given. The text passed in may be normalized or
+            prefiltered, so its own hash wouldn't match the stored one.
+
+    Returns:
+        dict: {"title", "content"}, plus "sections" (section summaries in
+        transcript order) when summarized hierarchically.
     """
     try:
+        if hierarchical is None:
+            # 'auto' only goes hierarchical for transcripts with several sections
+            hierarchical = {'always': True, 'off': False}.get(SUMMARY_CONFIG['hierarchical_mode'], 'auto')
+        if hierarchical:
+            sections = split_transcript_windows(transcript, SUMMARY_CONFIG['section_tokens'])
+            if len(sections) > 1 or (hierarchical is True and sections):
+                if db is not None and video_id and not transcript_hash:
+                    try:
+                        transcript_hash = load_content_hash(db, video_id)
+                    except Exception as e:
+                        logger.warning(f"Error loading transcript hash for video {video_id}: {str(e)}")
+                result = generate_hierarchical_summary(sections, max_length, db, video_id, transcript_hash)
+                if result:
+                    logger.info("Summary generated successfully")
+                    return result
+                logger.warning("Hierarchical summary failed, summarizing the whole transcript")
+
         # First, generate a summary
-        response = openai.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
+        response = routed_chat_completion(
+            "summary", "summary", [
                 {"role": "system", "content": "You are a professional content summarizer. Create a clear, concise summary that captures the main points and key ideas from the transcript."},
                 {"role": "user", "content": f"Summarize this transcript:\n\n{transcript}"}
             ],
-            max_tokens=max_length,
-            temperature=0.7
+            max_tokens=max_length
         )
         summary = response.choices[0].message.content.strip()
         
@@ -1,8 +1,16 @@
 import logging
 import os
-from openai import OpenAI
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from dotenv import load_dotenv
 
+from config import KEY_POINTS_CONFIG, TRANSCRIPT_NORMALIZATION_CONFIG
+from llm_dispatcher import PRIORITY_HIGH
+from sentence_segmenter import split_sentences
+from llm_router import routed_chat_completion
+from token_budget import count_tokens
+
 # Load environment variables
 load_dotenv()
 
@@ -10,27 +18,201 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+# Number of section-notes requests allowed in flight at once
+SECTION_NOTES_WORKERS = int(os.getenv('SECTION_NOTES_WORKERS', '4'))
+
+# Phrase tables for text cleaning. They are compiled once into a handful of
+# case-insensitive alternations (longest phrase first) so each sentence is
+# cleaned in one pass per table instead of one re.sub per phrase.
+FILLER_WORDS = ['basically', 'actually', 'literally', 'really', 'very', 'quite', 'simply', 'just', 'so', 'well']
+
+INTRO_PHRASES = [
+    'so', 'well', 'you see', 'you know', 'like', 'i mean', 'basically', 'actually',
+    'what im saying is', 'what i am saying is',
+    'what im trying to say is', 'what i am trying to say is',
+    'the point is', 'the thing is',
+    'in other words',
+    'as you can see',
+    'as we know',
+]
+
+REDUNDANT_PHRASES = [
+    'if you know what i mean',
+    'if you will',
+    'sort of',
+    'kind of',
+    'more or less',
+    'in my opinion',
+    'i think that',
+    'i believe that',
+    'you know',
+    'as you can see',
+    'what this means is',
+    'what im trying to say is',
+    'the thing is',
+    'the point is',
+    'going to',
+    'want to',
+    'trying to',
+    'in the future',
+    'at this point',
+    'at this time',
+    'for the most part',
+    'in terms of',
+    'when it comes to',
+    'the fact that',
+    'in order to',
+    'with respect to',
+    'with regard to',
+    'in relation to',
+    'in the process of',
+    'in the context of',
+    'in the case of',
+    'due to the fact that',
+    'for all intents and purposes',
+    'at the end of the day',
+    'that being said',
+    'needless to say',
+    'to be honest',
+    'to tell you the truth',
+    'as a matter of fact',
+]
+
+VERBOSE_REPLACEMENTS = {
+    'in spite of': 'despite',
+    'take into account': 'consider',
+    'in the event that': 'if',
+    'in the near future': 'soon',
+    'at this point in time': 'now',
+    'due to': 'because',
+    'prior to': 'before',
+    'subsequent to': 'after',
+    'in addition': 'also',
+    'with the exception of': 'except',
+    'in order to': 'to',
+    'a large number of': 'many',
+    'a majority of': 'most',
+    'a small number of': 'few',
+    'in a situation where': 'when',
+    'make a decision': 'decide',
+    'at the present time': 'now',
+    'in the process of': '',
+    'on a regular basis': 'regularly',
+    'in a manner of speaking': '',
+}
+
+UNNECESSARY_WORDS = [
+    'really', 'very', 'quite', 'basically', 'actually', 'literally', 'simply', 'just', 'like',
+    'totally', 'definitely', 'probably', 'maybe', 'perhaps', 'somewhat',
+    'sort of', 'kind of', 'a bit', 'a little',
+    'in my opinion', 'i think', 'i believe', 'i feel',
+    'seems to', 'appears to', 'tends to',
+]
+
+FILLER_PHRASES = [
+    'you know', 'i mean', 'kind of', 'sort of', 'like', 'basically', 'actually', 'literally',
+    'really', 'very', 'quite', 'just', 'so', 'well', 'um', 'uh',
+]
+
+# Disfluency tables for transcript normalization. Unlike the tables above
+# these run on the LLM input, so they only remove what never carries
+# meaning: hesitations anywhere, discourse markers only when set off by
+# commas.
+DISFLUENCIES = ['um', 'umm', 'uh', 'uhh', 'uh-huh', 'er', 'erm', 'hmm', 'mm', 'mhm', 'mm-hmm']
+
+OPENING_MARKERS = [
+    'so', 'well', 'okay', 'ok', 'alright', 'right', 'anyway', 'like',
+    'you know', 'i mean', 'basically', 'actually',
+]
+
+PARENTHETICAL_MARKERS = ['you know', 'i mean', 'like', 'sort of', 'kind of', 'basically', 'actually', 'i guess']
+
+# Legitimately doubled words ("I know that that works")
+_ALLOWED_REPEATS = {'that', 'had'}
+
+def _phrase_alternation(phrases):
+    """
+    Regex alternation of literal phrases factored into a prefix trie.
+
+    'kind of|known' becomes 'k(?:ind\\ of|nown)', so the regex engine checks
+    each character once instead of retrying every phrase at every position.
+    Longer phrases win over their own prefixes.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase.lower():
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        end = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 and not end else '(?:' + '|'.join(branches) + ')'
+        return pattern + '?' if end else pattern
+
+    return build(trie)
+
+def _phrase_pattern(phrases):
+    """Compile whole-word phrases into a single case-insensitive pattern."""
+    # A first-letter lookahead lets the engine skip most word starts cheaply
+    initials = ''.join(sorted({p[0].lower() for p in phrases} | {p[0].upper() for p in phrases}))
+    return re.compile(rf'\b(?=[{re.escape(initials)}])(?:{_phrase_alternation(phrases)})\b', re.IGNORECASE)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_SPACE_RUN_RE = re.compile(r' {2,}')
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s.,!?-]')
+_SPACE_BEFORE_PUNCT_RE = re.compile(r'\s+([.,!?])')
+_REPEATED_DOTS_RE = re.compile(r'\.+')
+_DUPLICATE_PUNCT_RE = re.compile(r'([.!?])\1+')
+_CLAUSE_SPLIT_RE = re.compile(r'[,;]')
+
+_FILLER_WORDS_RE = _phrase_pattern(FILLER_WORDS)
+_INTRO_RE = re.compile(rf'^(?:(?:{_phrase_alternation(INTRO_PHRASES)})\b[\s,]*)+', re.IGNORECASE)
+_REDUNDANT_RE = _phrase_pattern(REDUNDANT_PHRASES)
+_VERBOSE_RE = _phrase_pattern(VERBOSE_REPLACEMENTS)
+_VERBOSE_LOOKUP = {phrase.lower(): replacement for phrase, replacement in VERBOSE_REPLACEMENTS.items()}
+_UNNECESSARY_RE = _phrase_pattern(UNNECESSARY_WORDS)
+_FILLER_PHRASES_RE = _phrase_pattern(FILLER_PHRASES)
+
+# Hesitations go with the commas around them: "is, uh, $49" -> "is $49"
+_DISFLUENCY_RE = re.compile(rf'(?:,\s*)?\b(?:{_phrase_alternation(DISFLUENCIES)})\b(?:\s*,)?', re.IGNORECASE)
+_OPENING_MARKERS_RE = re.compile(
+    rf'(?:^|(?<=[.!?] ))(?:(?:{_phrase_alternation(OPENING_MARKERS + DISFLUENCIES)}),\s*)+',
+    re.IGNORECASE | re.MULTILINE
+)
+# Like hesitations, taken out with their commas
+_PARENTHETICAL_RE = re.compile(rf',\s*(?:(?:{_phrase_alternation(PARENTHETICAL_MARKERS)})\s*,\s*)+', re.IGNORECASE)
+# A word or phrase of up to four words said again right away
+_REPEATED_NGRAM_RE = re.compile(r"\b(\w+(?:[ ']\w+){0,3})(?:[ ,]+\1\b)+", re.IGNORECASE)
+# Cut-off words followed by the full word: "pri- pricing" (letters only, so "5- 50" stays)
+_FALSE_START_RE = re.compile(r'\b([^\W\d_]+)-\s+(?=\1)', re.IGNORECASE)
+_DANGLING_COMMA_RE = re.compile(r',\s*(?=[.!?,]|$)')
+# Left behind when a whole sentence ("Hmm.") was a disfluency
+_EMPTY_SENTENCE_RE = re.compile(r'([.!?])(?:\s*[.!?])+')
+_LOWERCASE_START_RE = re.compile(r'(^|[.!?] )([a-z])')
+
+def _collapse_repeat(match):
+    if match.group(1).lower() in _ALLOWED_REPEATS and match.group(0).lower().count(match.group(1).lower()) == 2:
+        return match.group(0)
+    return match.group(1)
+
+def _replace_verbose(match):
+    return _VERBOSE_LOOKUP[match.group(0).lower()]
 
 def clean_text(text):
     """Clean text for processing."""
     try:
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        
         # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s.,!?-]', '', text)
+        text = _SPECIAL_CHARS_RE.sub('', text)
         
         # Remove common filler words
-        filler_words = ['basically', 'actually', 'literally', 'really', 'very', 'quite', 'simply', 'just', 'so', 'well']
-        for word in filler_words:
-            text = re.sub(rf'\b{word}\b', '', text, flags=re.IGNORECASE)
+        text = _FILLER_WORDS_RE.sub('', text)
         
         # Clean up multiple spaces
-        text = ' '.join(text.split())
-        
-        return text.strip()
+        return _WHITESPACE_RE.sub(' ', text).strip()
     except Exception as e:
         logger.error(f"Error cleaning text: {str(e)}")
         return text
@@ -39,127 +221,24 @@ def shorten_sentence(sentence):
     """Aggressively shorten a sentence to make it more concise."""
     try:
         # Remove introductory phrases
-        intros = [
-            r'^(so|well|you see|you know|like|i mean|basically|actually)',
-            r'^(what (im|i am) (saying|trying to say) is)',
-            r'^(the (point|thing) is)',
-            r'^(in other words)',
-            r'^(as you can see)',
-            r'^(as we know)',
-        ]
-        for intro in intros:
-            sentence = re.sub(intro, '', sentence, flags=re.IGNORECASE).strip()
+        sentence = _INTRO_RE.sub('', sentence.strip())
         
         # Remove redundant phrases
-        redundant = [
-            r'if you know what i mean',
-            r'if you will',
-            r'sort of',
-            r'kind of',
-            r'more or less',
-            r'in my opinion',
-            r'i think that',
-            r'i believe that',
-            r'you know',
-            r'as you can see',
-            r'what this means is',
-            r'what im trying to say is',
-            r'the thing is',
-            r'the point is',
-            r'going to',
-            r'want to',
-            r'trying to',
-            r'in the future',
-            r'at this point',
-            r'at this time',
-            r'for the most part',
-            r'in terms of',
-            r'when it comes to',
-            r'the fact that',
-            r'in order to',
-            r'with respect to',
-            r'with regard to',
-            r'in relation to',
-            r'in the process of',
-            r'in the context of',
-            r'in the case of',
-            r'due to the fact that',
-            r'for all intents and purposes',
-            r'at the end of the day',
-            r'that being said',
-            r'needless to say',
-            r'to be honest',
-            r'to tell you the truth',
-            r'as a matter of fact',
-        ]
-        for phrase in redundant:
-            sentence = re.sub(phrase, '', sentence, flags=re.IGNORECASE).strip()
+        sentence = _REDUNDANT_RE.sub('', sentence)
             
         # Replace common verbose phrases with shorter ones
-        replacements = {
-            r'in spite of': 'despite',
-            r'take into account': 'consider',
-            r'in the event that': 'if',
-            r'in the near future': 'soon',
-            r'at this point in time': 'now',
-            r'due to': 'because',
-            r'prior to': 'before',
-            r'subsequent to': 'after',
-            r'in addition': 'also',
-            r'with the exception of': 'except',
-            r'in order to': 'to',
-            r'a large number of': 'many',
-            r'a majority of': 'most',
-            r'a small number of': 'few',
-            r'in a situation where': 'when',
-            r'make a decision': 'decide',
-            r'at the present time': 'now',
-            r'in the process of': '',
-            r'on a regular basis': 'regularly',
-            r'in a manner of speaking': '',
-        }
-        for verbose, concise in replacements.items():
-            sentence = re.sub(verbose, concise, sentence, flags=re.IGNORECASE)
+        sentence = _VERBOSE_RE.sub(_replace_verbose, sentence)
         
         # Remove unnecessary words
-        unnecessary = [
-            r'\breally\b',
-            r'\bvery\b',
-            r'\bquite\b',
-            r'\bbasically\b',
-            r'\bactually\b',
-            r'\bliterally\b',
-            r'\bsimply\b',
-            r'\bjust\b',
-            r'\blike\b',
-            r'\btotally\b',
-            r'\bdefinitely\b',
-            r'\bprobably\b',
-            r'\bmaybe\b',
-            r'\bperhaps\b',
-            r'\bsomewhat\b',
-            r'\bsort of\b',
-            r'\bkind of\b',
-            r'\ba bit\b',
-            r'\ba little\b',
-            r'\bin my opinion\b',
-            r'\bi think\b',
-            r'\bi believe\b',
-            r'\bi feel\b',
-            r'\bseems to\b',
-            r'\bappears to\b',
-            r'\btends to\b',
-        ]
-        for word in unnecessary:
-            sentence = re.sub(word, '', sentence, flags=re.IGNORECASE)
+        sentence = _UNNECESSARY_RE.sub('', sentence)
         
         # Clean up multiple spaces and punctuation
-        sentence = ' '.join(sentence.split())
-        sentence = re.sub(r'\s+([.,!?])', r'\1', sentence)
-        sentence = re.sub(r'\.+', '.', sentence)
+        sentence = _WHITESPACE_RE.sub(' ', sentence).strip()
+        sentence = _SPACE_BEFORE_PUNCT_RE.sub(r'\1', sentence)
+        sentence = _REPEATED_DOTS_RE.sub('.', sentence)
         
         # Extract main clause (try to get core message)
-        clauses = re.split(r'[,;]', sentence)
+        clauses = _CLAUSE_SPLIT_RE.split(sentence)
         if clauses:
             main_clause = max(clauses, key=len).strip()
             if len(main_clause.split()) >= 5:  # Only use if substantial
@@ -182,6 +261,26 @@ def shorten_sentence(sentence):
         logger.error(f"Error shortening sentence: {str(e)}")
         return sentence
 
+def _finish_sentence(text):
+    """Capitalize, punctuate and tidy an already filtered sentence."""
+    if not text:
+        return ""
+
+    # Capitalize first letter
+    text = text[0].upper() + text[1:]
+        
+    # Ensure proper ending punctuation
+    if text[-1] not in '.!?':
+        text += '.'
+        
+    # Remove duplicate punctuation
+    text = _DUPLICATE_PUNCT_RE.sub(r'\1', text)
+    
+    # Clean up spaces around punctuation
+    text = _SPACE_BEFORE_PUNCT_RE.sub(r'\1', text)
+    
+    return text.strip()
+
 def clean_sentence(text):
     """Clean and format a sentence for better readability."""
     try:
@@ -194,54 +293,167 @@ def clean_sentence(text):
             return ""
             
         # Remove common filler phrases
-        filler_phrases = [
-            r'\byou know\b',
-            r'\bi mean\b',
-            r'\bkind of\b',
-            r'\bsort of\b',
-            r'\blike\b',
-            r'\bbasically\b',
-            r'\bactually\b',
-            r'\bliterally\b',
-            r'\breally\b',
-            r'\bvery\b',
-            r'\bquite\b',
-            r'\bjust\b',
-            r'\bso\b',
-            r'\bwell\b',
-            r'\bum\b',
-            r'\buh\b'
-        ]
-        
-        for phrase in filler_phrases:
-            text = re.sub(phrase, '', text, flags=re.IGNORECASE)
+        text = _FILLER_PHRASES_RE.sub('', text)
         
         # Clean up multiple spaces
-        text = ' '.join(text.split())
+        text = _WHITESPACE_RE.sub(' ', text).strip()
         
-        # Capitalize first letter
-        if text:
-            text = text[0].upper() + text[1:]
-            
-        # Ensure proper ending punctuation
-        if text and text[-1] not in '.!?':
-            text += '.'
-            
-        # Remove duplicate punctuation
-        text = re.sub(r'([.!?])\1+', r'\1', text)
-        
-        # Clean up spaces around punctuation
-        text = re.sub(r'\s+([.!?,])', r'\1', text)
-        
-        return text.strip()
+        return _finish_sentence(text)
         
     except Exception as e:
         logger.error(f"Error cleaning sentence: {str(e)}")
         return text
 
-def extract_key_points(transcript, num_points=6):
-    """Extract key points from a transcript using GPT-3.5-turbo."""
+def clean_sentences(sentences):
+    """
+    Clean a whole transcript's sentences at once.
+
+    Sentences are joined with newlines so every pattern runs once over the
+    batch instead of once per sentence. Output matches clean_sentence.
+
+    Args:
+        sentences (list): Sentences to clean.
+
+    Returns:
+        list: Cleaned sentences, one per input ("" for empty input).
+    """
+    try:
+        # Newlines inside a sentence would break the one-line-per-sentence batch
+        text = '\n'.join(_WHITESPACE_RE.sub(' ', s or '') for s in sentences)
+        text = _SPECIAL_CHARS_RE.sub('', text)
+        text = _FILLER_WORDS_RE.sub('', text)
+        # Whitespace is already single spaces, so removals only leave space runs
+        text = _SPACE_RUN_RE.sub(' ', text)
+        text = _FILLER_PHRASES_RE.sub('', text)
+        text = _SPACE_RUN_RE.sub(' ', text)
+        return [_finish_sentence(line.strip()) for line in text.split('\n')]
+
+    except Exception as e:
+        logger.error(f"Error cleaning sentences: {str(e)}")
+        return [clean_sentence(s) for s in sentences]
+
+def normalize_transcript(text):
+    """
+    Strip disfluencies from transcript text before it is sent to an LLM.
+
+    Removes hesitations (um, uh), comma-delimited discourse markers
+    (", you know,"), stutters and repeated phrases ("we offer we offer")
+    and false starts ("pri- pricing"). Wording is otherwise untouched.
+    """
+    try:
+        text = _WHITESPACE_RE.sub(' ', text)
+        text = _OPENING_MARKERS_RE.sub('', text)
+        text = _DISFLUENCY_RE.sub(' ', text)
+        text = _FALSE_START_RE.sub('', text)
+        text = _REPEATED_NGRAM_RE.sub(_collapse_repeat, text)
+        text = _SPACE_RUN_RE.sub(' ', text)
+        text = _OPENING_MARKERS_RE.sub('', text)
+        text = _PARENTHETICAL_RE.sub(' ', text)
+        text = _DANGLING_COMMA_RE.sub('', text)
+        text = _SPACE_BEFORE_PUNCT_RE.sub(r'\1', text)
+        text = _EMPTY_SENTENCE_RE.sub(r'\1', text)
+        text = _SPACE_RUN_RE.sub(' ', text).strip()
+        # Sentences that lost their opening words start with a capital again
+        return _LOWERCASE_START_RE.sub(lambda m: m.group(1) + m.group(2).upper(), text)
+
+    except Exception as e:
+        logger.error(f"Error normalizing transcript: {str(e)}")
+        return text
+
+def normalize_for_llm(transcript, mode=None):
+    """
+    Normalize a transcript per TRANSCRIPT_NORMALIZATION_CONFIG.
+
+    In 'auto' mode only transcripts of at least min_tokens are normalized,
+    where the savings are worth it.
+
+    Returns:
+        tuple: (text to send, {"tokens", "normalized_tokens"})
+    """
+    mode = mode or TRANSCRIPT_NORMALIZATION_CONFIG['mode']
+    tokens = count_tokens(transcript)
+    if mode == 'off' or (mode == 'auto' and tokens < TRANSCRIPT_NORMALIZATION_CONFIG['min_tokens']):
+        return transcript, {"tokens": tokens, "normalized_tokens": tokens}
+
+    normalized = normalize_transcript(transcript)
+    return normalized, {"tokens": tokens, "normalized_tokens": count_tokens(normalized)}
+
+def prefilter_transcript(transcript, keep_fraction=None, max_tokens=None):
+    """
+    Keep only the sentences most likely to carry key points.
+
+    Sentences are scored locally with the extract_points TF-IDF scorer and
+    the best ones are kept, in their original order, up to keep_fraction of
+    the sentences and max_tokens tokens. Transcripts already within
+    max_tokens are returned whole.
+
+    Args:
+        transcript (str): Full transcript text.
+        keep_fraction (float): Share of sentences to keep; defaults to KEY_POINTS_CONFIG.
+        max_tokens (int): Token budget of the result; defaults to KEY_POINTS_CONFIG.
+
+    Returns:
+        tuple: (filtered transcript, {"sentences", "kept", "tokens", "kept_tokens"})
+    """
+    keep_fraction = keep_fraction or KEY_POINTS_CONFIG['prefilter_keep_fraction']
+    max_tokens = max_tokens or KEY_POINTS_CONFIG['prefilter_max_tokens']
+    tokens = count_tokens(transcript)
+    unchanged = {"sentences": None, "kept": None, "tokens": tokens, "kept_tokens": tokens}
+    if tokens <= max_tokens:
+        return transcript, unchanged
+
     try:
+        # Imported here: the extractive module pulls in heavy ML dependencies
+        from extract_points import score_sentences, split_into_sentences
+
+        sentences = split_into_sentences(transcript)
+        keep = max(1, int(len(sentences) * keep_fraction))
+        scores = score_sentences(sentences)
+
+        selected = []
+        budget = max_tokens
+        for i in sorted(range(len(sentences)), key=lambda i: -scores[i]):
+            # Joined with ". ", so each sentence costs about one token more
+            sentence_tokens = count_tokens(sentences[i]) + 1
+            if sentence_tokens <= budget:
+                selected.append(i)
+                budget -= sentence_tokens
+                if len(selected) == keep:
+                    break
+
+        filtered = '. '.join(sentences[i] for i in sorted(selected)) + '.'
+        return filtered, {
+            "sentences": len(sentences),
+            "kept": len(selected),
+            "tokens": tokens,
+            "kept_tokens": count_tokens(filtered)
+        }
+
+    except Exception as e:
+        logger.warning(f"Transcript pre-filter failed, sending the full transcript: {str(e)}")
+        return transcript, unchanged
+
+def extract_key_points(transcript, num_points=6, prefilter=None):
+    """
+    Extract key points from a transcript using GPT-3.5-turbo.
+
+    With prefilter (default KEY_POINTS_CONFIG['prefilter_enabled']) only the
+    best-scoring sentences are sent, see prefilter_transcript.
+    """
+    try:
+        if prefilter if prefilter is not None else KEY_POINTS_CONFIG['prefilter_enabled']:
+            transcript, stats = prefilter_transcript(transcript)
+            if stats['kept'] is not None:
+                logger.info(
+                    f"Pre-filter kept {stats['kept']}/{stats['sentences']} sentences: "
+                    f"{stats['tokens']} -> {stats['kept_tokens']} tokens "
+                    f"({stats['tokens'] - stats['kept_tokens']} saved)"
+                )
+
+        # Transcripts that don't fit one window go through map-reduce
+        if len(split_transcript_windows(transcript)) > 1:
+            return extract_key_points_map_reduce(transcript, num_points)
+
         logger.info("Starting key points extraction")
         
         # Create the prompt with clear instructions
@@ -254,15 +466,11 @@ def extract_key_points(transcript, num_points=6):
         
         user_prompt = f"Extract {num_points} key business points from this transcript:\n\n{transcript}"
         
-        # Call GPT-3.5-turbo
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
+        response = routed_chat_completion(
+            "key_points", "key_points", [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.7,
-            max_tokens=300
+            ]
         )
         
         # Extract and clean the key points
@@ -277,8 +485,193 @@ def extract_key_points(transcript, num_points=6):
         
     except Exception as e:
         logger.error(f"Error extracting key points: {str(e)}")
+        return extract_key_points_offline(transcript, num_points)
+
+def extract_key_points_offline(transcript, num_points=6):
+    """
+    Extract key points without the LLM.
+
+    Fallback engine used when OpenAI calls fail or its circuit is open, so a
+    degraded provider doesn't fail the whole job.
+    """
+    logger.warning("Falling back to offline key point extraction")
+    # Imported here: the extractive module pulls in heavy ML dependencies
+    from textrank_extractor import extract_key_points as extract_points_locally
+    return [clean_sentence(point) for point in extract_points_locally(transcript, num_points) if point]
+
+def extract_section_notes(section, section_number, max_notes=5):
+    """Extract short running notes from one section of a transcript."""
+    try:
+        system_prompt = """You are an expert at extracting key business insights and value propositions from text.
+        You will receive one section of a longer transcript.
+        Write short notes capturing the business-relevant facts, figures and actionable insights in this section.
+        Return one note per line, starting with a hyphen (-). Skip filler."""
+
+        user_prompt = f"Write at most {max_notes} notes for section {section_number}:\n\n{section}"
+
+        response = routed_chat_completion(
+            "section_notes", "section_notes", [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ]
+        )
+
+        notes_text = response.choices[0].message.content.strip()
+        notes = [note.strip('- ').strip() for note in notes_text.split('\n') if note.strip()]
+        logger.info(f"Extracted {len(notes)} notes from section {section_number}")
+        return notes[:max_notes]
+
+    except Exception as e:
+        logger.error(f"Error extracting notes for section {section_number}: {str(e)}")
+        return []
+
+def merge_section_notes(section_notes, num_points=6):
+    """Merge per-section notes into the final key points with one small call."""
+    try:
+        notes_text = "\n\n".join(
+            f"Section {i}:\n" + "\n".join(f"- {note}" for note in notes)
+            for i, notes in enumerate(section_notes, 1) if notes
+        )
+        if not notes_text:
+            return []
+
+        system_prompt = """You are an expert at extracting key business insights and value propositions from text.
+        You will receive notes taken section by section from a transcript.
+        Combine them into the most important business-focused key points, merging duplicates.
+        List the points from most to least important.
+        Format each point as a clear, concise statement on its own line."""
+
+        user_prompt = f"Extract {num_points} key business points from these notes:\n\n{notes_text}"
+
+        response = routed_chat_completion(
+            "reduce", "merge_section_notes", [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            priority=PRIORITY_HIGH
+        )
+
+        key_points_text = response.choices[0].message.content.strip()
+        key_points = [point.strip('- ').strip() for point in key_points_text.split('\n') if point.strip()]
+        return key_points[:num_points]
+
+    except Exception as e:
+        logger.error(f"Error merging section notes: {str(e)}")
         return []
 
+def extract_key_points_incremental(sections, num_points=6):
+    """
+    Extract key points from transcript sections as they arrive.
+
+    Notes are extracted for each section while later sections are still
+    being transcribed, then merged in one final call. A transcript that
+    arrives as a single section goes through extract_key_points instead.
+
+    Args:
+        sections: Iterable of transcript section strings (e.g. a generator
+            fed by chunked transcription).
+        num_points (int): Number of key points to return.
+
+    Returns:
+        list: Key points.
+    """
+    futures = []
+    received = []
+    pending = None
+    with ThreadPoolExecutor(max_workers=SECTION_NOTES_WORKERS) as executor:
+        for section in sections:
+            received.append(section)
+            # Hold back one section so a single-section transcript is detected
+            if pending is not None:
+                futures.append(executor.submit(copy_context().run, extract_section_notes, pending, len(futures) + 1))
+            pending = section
+
+        if pending is None:
+            return []
+        if not futures:
+            return extract_key_points(pending, num_points)
+
+        futures.append(executor.submit(copy_context().run, extract_section_notes, pending, len(futures) + 1))
+        section_notes = [future.result() for future in futures]
+
+    logger.info(f"Merging notes from {len(section_notes)} sections")
+    return merge_section_notes(section_notes, num_points) or extract_key_points_offline(" ".join(received), num_points)
+
+def split_transcript_windows(transcript, window_tokens=None):
+    """
+    Split a transcript into windows of about window_tokens at sentence boundaries.
+
+    A sentence longer than a whole window is split between words.
+
+    Args:
+        transcript (str): Transcript text.
+        window_tokens (int): Target window size; defaults to KEY_POINTS_CONFIG.
+
+    Returns:
+        list: Window strings, in transcript order.
+    """
+    window_tokens = window_tokens or KEY_POINTS_CONFIG['window_tokens']
+    windows = []
+    current = []
+    current_tokens = 0
+
+    for sentence in split_sentences(transcript):
+        sentence_tokens = count_tokens(sentence) + 1
+        if sentence_tokens > window_tokens:
+            # Break a runaway sentence (e.g. unpunctuated captions) into word runs
+            words = sentence.split()
+            step = max(1, len(words) * window_tokens // sentence_tokens)
+            pieces = [' '.join(words[i:i + step]) for i in range(0, len(words), step)]
+        else:
+            pieces = [sentence]
+
+        for piece in pieces:
+            piece_tokens = count_tokens(piece) + 1
+            if current and current_tokens + piece_tokens > window_tokens:
+                windows.append(' '.join(current))
+                current = []
+                current_tokens = 0
+            current.append(piece)
+            current_tokens += piece_tokens
+
+    if current:
+        windows.append(' '.join(current))
+    return windows
+
+def extract_key_points_map_reduce(transcript, num_points=6, window_tokens=None, max_workers=None):
+    """
+    Extract key points from a transcript too long for a single prompt.
+
+    The transcript is split into windows at sentence boundaries, candidate
+    points are extracted from every window concurrently (map), and one final
+    call ranks and deduplicates them down to num_points (reduce).
+
+    Args:
+        transcript (str): Transcript text.
+        num_points (int): Number of key points to return.
+        window_tokens (int): Window size; defaults to KEY_POINTS_CONFIG.
+        max_workers (int): Concurrent map calls; defaults to KEY_POINTS_CONFIG.
+
+    Returns:
+        list: Key points.
+    """
+    windows = split_transcript_windows(transcript, window_tokens)
+    if len(windows) <= 1:
+        return extract_key_points(transcript, num_points)
+
+    max_workers = max_workers or KEY_POINTS_CONFIG['map_workers']
+    points_per_window = KEY_POINTS_CONFIG['points_per_window']
+    logger.info(f"Map-reduce key points over {len(windows)} windows with {max_workers} workers")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(copy_context().run, extract_section_notes, window, i, points_per_window)
+            for i, window in enumerate(windows, 1)
+        ]
+        window_notes = [future.result() for future in futures]
+
+    return merge_section_notes(window_notes, num_points) or extract_key_points_offline(transcript, num_points)
+
 def generate_key_points_title(key_points):
     """Generate a title for the key points using GPT-3.5-turbo."""
     try:
@@ -295,15 +688,11 @@ def generate_key_points_title(key_points):
         
         user_prompt = f"Create a title for these key points:\n\n{points_text}"
         
-        # Call GPT-3.5-turbo
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
+        response = routed_chat_completion(
+            "title", "key_points_title", [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.7,
-            max_tokens=50
+            ]
         )
         
         title = response.choices[0].message.content.strip().strip('"')
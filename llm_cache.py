@@ -0,0 +1,216 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from openai.types.chat import ChatCompletion
+from redis import Redis
+
+from llm_dispatcher import dispatcher as shared_dispatcher, PRIORITY_NORMAL
+from token_budget import record_usage
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "llm_cache:"
+STATS_KEY = "llm_cache:stats"
+
+# Entries expire after this long. Size is bounded by Redis itself: run it
+# with maxmemory and maxmemory-policy volatile-lru (or allkeys-lru).
+CACHE_TTL_SECONDS = int(os.getenv('LLM_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+
+# After a Redis error the Redis tier is skipped for this long
+REDIS_RETRY_SECONDS = 30
+
+
+def cache_key(params):
+    """
+    Cache key for a chat completion request.
+
+    Hashes the model, messages and every other request parameter. Message
+    whitespace is normalized so re-indented prompt templates still hit.
+    """
+    normalized = dict(params)
+    normalized['messages'] = [
+        dict(message, content=' '.join((message.get('content') or '').split()))
+        for message in params.get('messages', [])
+    ]
+    payload = json.dumps(normalized, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """Two-tier (Redis, then optional disk) cache of chat completion responses."""
+
+    def __init__(self, redis_client=None, disk_dir=None, ttl_seconds=CACHE_TTL_SECONDS, enabled=True,
+                 dispatcher=None):
+        self.dispatcher = dispatcher or shared_dispatcher
+        self.redis = redis_client
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.counts = defaultdict(lambda: {'hits': 0, 'misses': 0})
+        self.redis_retry_at = 0.0
+
+    @classmethod
+    def from_env(cls):
+        """Cache configured from REDIS_URL, LLM_CACHE_DIR and LLM_CACHE_ENABLED."""
+        redis_client = None
+        redis_url = os.getenv('REDIS_URL')
+        if redis_url:
+            try:
+                redis_client = Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+            except Exception as e:
+                logger.warning(f"LLM cache Redis tier disabled: {str(e)}")
+        return cls(redis_client, os.getenv('LLM_CACHE_DIR'), enabled=CACHE_ENABLED)
+
+    def _redis_available(self):
+        return self.redis is not None and time.time() >= self.redis_retry_at
+
+    def _redis_failed(self, action, error):
+        logger.warning(f"LLM cache Redis {action} failed, skipping Redis for {REDIS_RETRY_SECONDS}s: {str(error)}")
+        self.redis_retry_at = time.time() + REDIS_RETRY_SECONDS
+
+    def _disk_path(self, key):
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        """Cached response JSON for a key, or None."""
+        if self._redis_available():
+            try:
+                value = self.redis.get(KEY_PREFIX + key)
+                if value is not None:
+                    return value.decode('utf-8')
+            except Exception as e:
+                self._redis_failed("read", e)
+
+        if self.disk_dir is not None:
+            path = self._disk_path(key)
+            try:
+                if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                    path.unlink()
+                    return None
+                value = path.read_text(encoding='utf-8')
+            except FileNotFoundError:
+                return None
+            except Exception as e:
+                logger.warning(f"LLM cache disk read failed: {str(e)}")
+                return None
+            # Promote disk hits so other workers find them in Redis
+            self._set_redis(key, value)
+            return value
+        return None
+
+    def _set_redis(self, key, value):
+        if not self._redis_available():
+            return
+        try:
+            self.redis.set(KEY_PREFIX + key, value, ex=self.ttl_seconds)
+        except Exception as e:
+            self._redis_failed("write", e)
+
+    def set(self, key, value):
+        """Store response JSON in every configured tier."""
+        self._set_redis(key, value)
+        if self.disk_dir is not None:
+            path = self._disk_path(key)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                temp_path.write_text(value, encoding='utf-8')
+                os.replace(temp_path, path)
+            except Exception as e:
+                logger.warning(f"LLM cache disk write failed: {str(e)}")
+
+    def record(self, call_site, hit):
+        """Count a lookup for a call site, locally and in Redis."""
+        field = 'hits' if hit else 'misses'
+        with self.lock:
+            self.counts[call_site][field] += 1
+        if self._redis_available():
+            try:
+                self.redis.hincrby(STATS_KEY, f"{call_site}:{field}", 1)
+            except Exception as e:
+                self._redis_failed("stats update", e)
+
+    def stats(self):
+        """
+        Hit and miss counts per call site in this process.
+
+        Returns:
+            dict: {call_site: {"hits", "misses", "hit_rate"}}
+        """
+        with self.lock:
+            return {
+                call_site: dict(counts, hit_rate=round(counts['hits'] / max(1, counts['hits'] + counts['misses']), 3))
+                for call_site, counts in self.counts.items()
+            }
+
+    def chat_completion(self, call_site, bypass=False, priority=PRIORITY_NORMAL, api_key=None, **params):
+        """
+        Create a chat completion, answering repeated requests from the cache.
+
+        Misses are sent through the LLM dispatcher.
+
+        Args:
+            call_site (str): Name used for hit metrics and token usage.
+            bypass (bool): Always call the API and don't store the result,
+                for callers that want a fresh sample.
+            priority (int): Dispatcher priority of the request.
+            api_key (str): API key to call with; defaults to OPENAI_API_KEY.
+            **params: chat.completions.create parameters.
+
+        Returns:
+            ChatCompletion: The API or cached response.
+        """
+        response, _ = self.chat_completion_with_status(
+            call_site, bypass=bypass, priority=priority, api_key=api_key, **params
+        )
+        return response
+
+    def chat_completion_with_status(self, call_site, bypass=False, priority=PRIORITY_NORMAL, api_key=None, **params):
+        """
+        Like chat_completion, also telling whether the cache answered.
+
+        Returns:
+            tuple: (ChatCompletion, True if it came from the cache).
+        """
+        if bypass or not self.enabled:
+            response = self.dispatcher.chat_completion(priority=priority, api_key=api_key, **params)
+            record_usage(response, call_site, params.get('model'))
+            return response, False
+
+        key = cache_key(params)
+        cached = self.get(key)
+        if cached is not None:
+            try:
+                response = ChatCompletion.model_validate_json(cached)
+                self.record(call_site, True)
+                logger.info(f"LLM cache hit for {call_site}")
+                return response, True
+            except Exception as e:
+                logger.warning(f"Discarding unreadable LLM cache entry for {call_site}: {str(e)}")
+
+        self.record(call_site, False)
+        response = self.dispatcher.chat_completion(priority=priority, api_key=api_key, **params)
+        record_usage(response, call_site, params.get('model'))
+
+        # Truncated answers are not worth repeating
+        if response.choices and response.choices[0].finish_reason != 'length':
+            self.set(key, response.model_dump_json())
+        return response, False
+
+
+llm_cache = LLMCache.from_env()
+
+
+def cached_chat_completion(call_site, bypass=False, priority=PRIORITY_NORMAL, api_key=None, **params):
+    """Create a chat completion through the shared LLM cache and dispatcher."""
+    return llm_cache.chat_completion(call_site, bypass=bypass, priority=priority, api_key=api_key, **params)
@@ -0,0 +1,317 @@
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+
+from openai import OpenAI
+from redis import Redis
+from dotenv import load_dotenv
+
+from llm_resilience import (
+    CircuitBreaker, CircuitOpenError, LatencyTracker, MAX_ATTEMPTS, HEDGE_ENABLED, HEDGE_PERCENTILE,
+    backoff_delay, is_provider_failure, is_retryable, retry_after_seconds
+)
+from token_budget import count_message_tokens
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Account-wide OpenAI limits shared by every worker process
+RPM_LIMIT = int(os.getenv('OPENAI_RPM_LIMIT', '3500'))
+TPM_LIMIT = int(os.getenv('OPENAI_TPM_LIMIT', '90000'))
+
+# Requests in flight per process, and how many may wait behind them
+DISPATCH_CONCURRENCY = int(os.getenv('LLM_DISPATCH_CONCURRENCY', '8'))
+DISPATCH_QUEUE_SIZE = int(os.getenv('LLM_DISPATCH_QUEUE_SIZE', '64'))
+
+# Per-request timeout of the shared client
+HTTP_TIMEOUT_SECONDS = float(os.getenv('OPENAI_HTTP_TIMEOUT_SECONDS', '60'))
+
+# Audio uploads and their transcription take far longer than chat requests
+AUDIO_HTTP_TIMEOUT_SECONDS = float(os.getenv('OPENAI_AUDIO_HTTP_TIMEOUT_SECONDS', '600'))
+
+# Lower numbers are dispatched first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9
+
+BUCKET_KEY = "llm_rate_limit:{}"
+
+# Refill both buckets continuously and take from them only if both have
+# enough; otherwise return how long to wait. Uses the Redis clock so all
+# hosts agree on time.
+_TOKEN_BUCKET_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local wait = 0
+local levels = {}
+for i = 1, 2 do
+    local capacity = tonumber(ARGV[i * 2 - 1])
+    local needed = math.min(tonumber(ARGV[i * 2]), capacity)
+    local state = redis.call('HMGET', KEYS[i], 'level', 'updated')
+    local level = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    level = math.min(capacity, level + (now - updated) * capacity / 60)
+    levels[i] = {level, needed}
+    if level < needed then
+        wait = math.max(wait, (needed - level) * 60 / capacity)
+    end
+end
+for i = 1, 2 do
+    local level = levels[i][1]
+    if wait == 0 then
+        level = level - levels[i][2]
+    end
+    redis.call('HSET', KEYS[i], 'level', level, 'updated', now)
+    redis.call('EXPIRE', KEYS[i], 120)
+end
+return tostring(wait)
+"""
+
+
+class TokenBucketLimiter:
+    """
+    Requests-per-minute and tokens-per-minute buckets.
+
+    Buckets live in Redis so every process shares the account limits; if
+    Redis is unavailable each process falls back to local buckets.
+    """
+
+    def __init__(self, rpm=RPM_LIMIT, tpm=TPM_LIMIT, redis_client=None):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.redis = redis_client
+        self.script = redis_client.register_script(_TOKEN_BUCKET_SCRIPT) if redis_client is not None else None
+        self.lock = threading.Lock()
+        self.levels = [float(rpm), float(tpm)]
+        self.updated = time.monotonic()
+
+    def _try_local(self, tokens):
+        with self.lock:
+            now = time.monotonic()
+            elapsed = now - self.updated
+            self.updated = now
+            wait = 0.0
+            needed = [1, min(tokens, self.tpm)]
+            for i, capacity in enumerate((self.rpm, self.tpm)):
+                self.levels[i] = min(capacity, self.levels[i] + elapsed * capacity / 60)
+                if self.levels[i] < needed[i]:
+                    wait = max(wait, (needed[i] - self.levels[i]) * 60 / capacity)
+            if wait == 0:
+                self.levels = [level - need for level, need in zip(self.levels, needed)]
+            return wait
+
+    def _try(self, tokens):
+        if self.script is not None:
+            try:
+                return float(self.script(
+                    keys=[BUCKET_KEY.format('requests'), BUCKET_KEY.format('tokens')],
+                    args=[self.rpm, 1, self.tpm, tokens]
+                ))
+            except Exception as e:
+                logger.warning(f"Shared rate limiter unavailable, using local buckets: {str(e)}")
+                self.script = None
+        return self._try_local(tokens)
+
+    def acquire(self, tokens=0):
+        """Block until one request and the given tokens are available."""
+        waited = 0.0
+        while True:
+            wait = self._try(tokens)
+            if wait <= 0:
+                if waited > 1:
+                    logger.info(f"Rate limiter delayed a request by {waited:.1f}s")
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+
+class LLMDispatcher:
+    """
+    Bounded priority queue in front of the OpenAI API.
+
+    A fixed pool of worker threads takes requests in priority order, waits
+    for rate-limit capacity and runs them on a shared keep-alive client.
+    Submitting blocks when the queue is full. Calls are retried with
+    jittered backoff, guarded by a circuit breaker per endpoint and
+    optionally hedged.
+    """
+
+    def __init__(self, limiter, concurrency=DISPATCH_CONCURRENCY, queue_size=DISPATCH_QUEUE_SIZE):
+        self.limiter = limiter
+        self.concurrency = concurrency
+        self.queue = queue.PriorityQueue(maxsize=queue_size)
+        self.sequence = itertools.count()
+        self.clients = {}
+        self.lock = threading.Lock()
+        self.workers = []
+        self.breakers = {}
+        self.latencies = {}
+
+    def breaker(self, endpoint):
+        """Circuit breaker of an endpoint ('chat' or 'audio')."""
+        with self.lock:
+            if endpoint not in self.breakers:
+                self.breakers[endpoint] = CircuitBreaker(f"openai-{endpoint}")
+                self.latencies[endpoint] = LatencyTracker()
+            return self.breakers[endpoint]
+
+    def client(self, api_key=None):
+        """
+        Shared OpenAI client, one per API key.
+
+        Each client keeps its own keep-alive HTTP connection pool, so sharing
+        it reuses connections across every call site in the process.
+        """
+        api_key = api_key or os.getenv('OPENAI_API_KEY')
+        with self.lock:
+            if api_key not in self.clients:
+                self.clients[api_key] = OpenAI(
+                    api_key=api_key,
+                    timeout=HTTP_TIMEOUT_SECONDS,
+                    # Retries are handled by call() so they respect the rate limiter
+                    max_retries=0
+                )
+            return self.clients[api_key]
+
+    def _start_workers(self):
+        with self.lock:
+            while len(self.workers) < self.concurrency:
+                worker = threading.Thread(target=self._work, name=f"llm-dispatch-{len(self.workers)}", daemon=True)
+                worker.start()
+                self.workers.append(worker)
+
+    def _work(self):
+        while True:
+            _, _, call, tokens, api_key, future = self.queue.get()
+            try:
+                if future.set_running_or_notify_cancel():
+                    self.limiter.acquire(tokens)
+                    future.set_result(call(self.client(api_key)))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                self.queue.task_done()
+
+    def submit(self, call, tokens=0, priority=PRIORITY_NORMAL, api_key=None):
+        """
+        Queue an API call.
+
+        Args:
+            call: Function taking the OpenAI client and making one request.
+            tokens (int): Tokens the request counts against the TPM limit.
+            priority (int): PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW.
+            api_key (str): API key to call with; defaults to OPENAI_API_KEY.
+
+        Returns:
+            Future: Resolves to the call's return value.
+        """
+        if not self.workers:
+            self._start_workers()
+        future = Future()
+        self.queue.put((priority, next(self.sequence), call, tokens, api_key, future))
+        return future
+
+    def _attempt(self, call, tokens, priority, api_key, endpoint, hedge):
+        """One attempt, with a hedged duplicate if it outlives the latency percentile."""
+        started = time.monotonic()
+        latencies = self.latencies[endpoint]
+        futures = [self.submit(call, tokens, priority, api_key)]
+
+        threshold = latencies.percentile(HEDGE_PERCENTILE) if hedge else None
+        if threshold is not None:
+            done, _ = wait(futures, timeout=threshold)
+            if not done:
+                logger.info(f"Hedging {endpoint} request after {threshold:.1f}s")
+                futures.append(self.submit(call, tokens, PRIORITY_HIGH, api_key))
+
+        pending = set(futures)
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    latencies.add(time.monotonic() - started)
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def call(self, call, tokens=0, priority=PRIORITY_NORMAL, api_key=None, endpoint='chat', hedge=False):
+        """
+        Queue an API call and wait for its result.
+
+        Transient errors (429, 5xx, timeouts) are retried with jittered
+        exponential backoff, honoring Retry-After. Raises CircuitOpenError
+        without calling the API while the endpoint's circuit is open.
+        """
+        breaker = self.breaker(endpoint)
+        for attempt in range(MAX_ATTEMPTS):
+            if not breaker.allow():
+                raise CircuitOpenError(f"OpenAI {endpoint} circuit is open")
+            try:
+                result = self._attempt(call, tokens, priority, api_key, endpoint, hedge)
+            except Exception as e:
+                if is_provider_failure(e):
+                    breaker.record_failure()
+                else:
+                    # The provider answered; the request was bad or rate limited
+                    breaker.record_success()
+                if not is_retryable(e) or attempt == MAX_ATTEMPTS - 1:
+                    raise
+                delay = backoff_delay(attempt, retry_after_seconds(e))
+                logger.warning(
+                    f"OpenAI {endpoint} request failed ({str(e)}), "
+                    f"retry {attempt + 1}/{MAX_ATTEMPTS - 1} in {delay:.1f}s"
+                )
+                time.sleep(delay)
+            else:
+                breaker.record_success()
+                return result
+
+    def chat_completion(self, priority=PRIORITY_NORMAL, api_key=None, hedge=None, **params):
+        """Create a chat completion through the queue, rate limiter and retries."""
+        # OpenAI counts the prompt plus max_tokens against the TPM limit
+        tokens = count_message_tokens(params.get('messages', []), params.get('model', 'gpt-3.5-turbo'))
+        tokens += params.get('max_tokens') or 0
+        return self.call(
+            lambda client: client.chat.completions.create(**params),
+            tokens, priority, api_key,
+            endpoint='chat',
+            hedge=HEDGE_ENABLED if hedge is None else hedge
+        )
+
+    def transcription(self, priority=PRIORITY_NORMAL, api_key=None, **params):
+        """Create an audio transcription through the queue, rate limiter and retries."""
+        upload = params.get('file')
+
+        def call(client):
+            # A retried upload has to be re-read from the start
+            if hasattr(upload, 'seek'):
+                upload.seek(0)
+            # Same connection pool, longer timeout
+            return client.with_options(timeout=AUDIO_HTTP_TIMEOUT_SECONDS).audio.transcriptions.create(**params)
+
+        return self.call(call, 0, priority, api_key, endpoint='audio')
+
+
+def _shared_redis():
+    redis_url = os.getenv('REDIS_URL')
+    if not redis_url:
+        return None
+    try:
+        return Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+    except Exception as e:
+        logger.warning(f"Could not connect rate limiter to Redis: {str(e)}")
+        return None
+
+
+dispatcher = LLMDispatcher(TokenBucketLimiter(redis_client=_shared_redis()))
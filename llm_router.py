@@ -0,0 +1,207 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+import numpy as np
+
+from config.llm_routing import LLM_ROUTES, DEFAULT_ROUTING_PLAN
+from llm_cache import llm_cache
+from llm_dispatcher import PRIORITY_NORMAL
+from token_budget import completion_cost, current_plan, fit_chat_request
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Optional JSON file of route overrides, shaped like LLM_ROUTES:
+#   {"pro": {"key_points": {"model": "gpt-4o-mini"}}}
+# Only the fields given are overridden. The file is re-read when it
+# changes, so routes can be switched without restarting workers.
+ROUTING_FILE = os.getenv('LLM_ROUTING_FILE')
+# How often the override file's modification time is checked
+RELOAD_SECONDS = float(os.getenv('LLM_ROUTING_RELOAD_SECONDS', '10'))
+
+# Latencies kept per route for the percentiles in stats()
+LATENCY_SAMPLES = 500
+
+
+class RoutingTable:
+    """LLM_ROUTES merged with the overrides of a hot-reloaded JSON file."""
+
+    def __init__(self, routes=None, path=ROUTING_FILE, reload_seconds=RELOAD_SECONDS):
+        self.defaults = routes or LLM_ROUTES
+        self.path = path
+        self.reload_seconds = reload_seconds
+        self.lock = threading.Lock()
+        self.routes = self.defaults
+        self.mtime = None
+        self.checked_at = 0.0
+
+    def _merge(self, overrides):
+        routes = {plan: {task: dict(route) for task, route in tasks.items()} for plan, tasks in self.defaults.items()}
+        for plan, tasks in overrides.items():
+            for task, route in tasks.items():
+                routes.setdefault(plan, {}).setdefault(task, {}).update(route)
+        return routes
+
+    def _reload(self):
+        """Re-read the override file if it changed. Keeps the last good table on errors."""
+        self.checked_at = time.time()
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            if self.mtime is not None:
+                logger.info(f"LLM routing file {self.path} removed, using default routes")
+                self.routes, self.mtime = self.defaults, None
+            return
+        except Exception as e:
+            logger.warning(f"Could not check LLM routing file {self.path}: {str(e)}")
+            return
+        if mtime == self.mtime:
+            return
+
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                routes = self._merge(json.load(f))
+            for plan, tasks in routes.items():
+                for task, route in tasks.items():
+                    missing = {'model', 'temperature', 'max_tokens'} - set(route)
+                    if missing:
+                        raise ValueError(f"route {plan}/{task} is missing {', '.join(sorted(missing))}")
+        except Exception as e:
+            logger.error(f"Ignoring invalid LLM routing file {self.path}: {str(e)}")
+            # Don't re-read the same broken file on every check
+            self.mtime = mtime
+            return
+        self.routes, self.mtime = routes, mtime
+        logger.info(f"Loaded LLM routes from {self.path}")
+
+    def route(self, task, plan=None):
+        """
+        Model, temperature and token cap for a task on a plan.
+
+        Plan defaults to the current usage context; unknown plans use
+        DEFAULT_ROUTING_PLAN.
+
+        Returns:
+            dict: {"task", "plan", "model", "temperature", "max_tokens"}
+
+        Raises:
+            KeyError: If no route exists for the task.
+        """
+        if self.path:
+            with self.lock:
+                if time.time() - self.checked_at >= self.reload_seconds:
+                    self._reload()
+        routes = self.routes
+
+        plan = plan or current_plan()
+        plan = plan if plan in routes else DEFAULT_ROUTING_PLAN
+        route = routes[plan].get(task) or routes[DEFAULT_ROUTING_PLAN][task]
+        return dict(route, task=task, plan=plan)
+
+
+class RouteMetrics:
+    """Calls, cache hits, errors, latency and cost per route in this process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = defaultdict(lambda: {
+            'calls': 0, 'cache_hits': 0, 'errors': 0,
+            'prompt_tokens': 0, 'completion_tokens': 0, 'cost': 0.0,
+            'latencies': deque(maxlen=LATENCY_SAMPLES)
+        })
+
+    def record(self, route, seconds, response=None, cache_hit=False, error=False):
+        """Count one call of a route. Cache hits cost nothing."""
+        usage = getattr(response, 'usage', None)
+        prompt_tokens = usage.prompt_tokens if usage and not cache_hit else 0
+        completion_tokens = usage.completion_tokens if usage and not cache_hit else 0
+        key = f"{route['task']}:{route['plan']}:{route['model']}"
+        with self.lock:
+            counts = self.routes[key]
+            counts['calls'] += 1
+            counts['cache_hits'] += int(cache_hit)
+            counts['errors'] += int(error)
+            counts['prompt_tokens'] += prompt_tokens
+            counts['completion_tokens'] += completion_tokens
+            counts['cost'] += completion_cost(route['model'], prompt_tokens, completion_tokens)
+            counts['latencies'].append(seconds)
+
+    def stats(self):
+        """
+        Metrics per route in this process.
+
+        Returns:
+            dict: {"task:plan:model": {"calls", "cache_hits", "errors",
+            "prompt_tokens", "completion_tokens", "cost", "latency_p50",
+            "latency_p95"}}, latencies in seconds over the recent calls.
+        """
+        with self.lock:
+            stats = {}
+            for key, counts in self.routes.items():
+                latencies = np.fromiter(counts['latencies'], dtype=np.float64)
+                stats[key] = {name: value for name, value in counts.items() if name != 'latencies'}
+                stats[key]['cost'] = round(counts['cost'], 6)
+                stats[key]['latency_p50'] = round(float(np.percentile(latencies, 50)), 3) if len(latencies) else None
+                stats[key]['latency_p95'] = round(float(np.percentile(latencies, 95)), 3) if len(latencies) else None
+            return stats
+
+
+routing_table = RoutingTable()
+route_metrics = RouteMetrics()
+
+
+def route(task, plan=None):
+    """Route of a task on a plan in the shared routing table."""
+    return routing_table.route(task, plan)
+
+
+def routed_chat_completion(task, call_site, messages, max_tokens=None, plan=None, bypass=False,
+                           priority=PRIORITY_NORMAL, api_key=None, min_tokens=None, **params):
+    """
+    Create a chat completion with the model, temperature and token cap routed for a task.
+
+    The request is fitted to the model context and the plan budget, sent
+    through the shared LLM cache and dispatcher, and its latency and cost
+    recorded for the route.
+
+    Args:
+        task (str): Task type, a key of the LLM_ROUTES plans.
+        call_site (str): Name used for cache metrics and token usage.
+        messages (list): Chat messages.
+        max_tokens (int): Completion cap below the route's, if the caller
+            needs a shorter answer.
+        plan (str): Pricing plan; defaults to the current usage context.
+        bypass, priority, api_key: As for cached_chat_completion.
+        min_tokens (int): Completion tokens a structured answer needs to be
+            complete; neither the route nor the plan cap goes below it.
+        **params: Other chat.completions.create parameters.
+
+    Returns:
+        ChatCompletion: The API or cached response.
+    """
+    selected = route(task, plan)
+    cap = min(max_tokens, selected['max_tokens']) if max_tokens else selected['max_tokens']
+    if min_tokens:
+        cap = max(cap, min_tokens)
+    messages, cap = fit_chat_request(messages, selected['model'], cap, plan, min_tokens)
+
+    started = time.perf_counter()
+    try:
+        response, cache_hit = llm_cache.chat_completion_with_status(
+            call_site, bypass=bypass, priority=priority, api_key=api_key,
+            model=selected['model'],
+            messages=messages,
+            temperature=selected['temperature'],
+            max_tokens=cap,
+            **params
+        )
+    except Exception:
+        route_metrics.record(selected, time.perf_counter() - started, error=True)
+        raise
+    route_metrics.record(selected, time.perf_counter() - started, response, cache_hit)
+    return response
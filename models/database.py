@@ -351,17 +351,41 @@ class Database:
             if result:
                 stats = result[0]
                 del stats['_id']
-                print(f"Found statistics for user {user_id}: {stats}")
-                return stats
-            print("No statistics found for user")
-            return {
-                'videos_processed': 0,
-                'total_processing_time': 0
-            }
+            else:
+                print("No statistics found for user")
+                stats = {
+                    'videos_processed': 0,
+                    'total_processing_time': 0
+                }
+            stats.update(self.get_user_token_usage(user_id))
+            print(f"Found statistics for user {user_id}: {stats}")
+            return stats
         except Exception as e:
             print(f"Error getting statistics: {str(e)}")
             raise
 
+    def get_user_token_usage(self, user_id):
+        """Get the user's LLM token usage recorded by token_budget."""
+        pipeline = [
+            {'$match': {'user_id': user_id}},
+            {'$group': {
+                '_id': None,
+                'prompt_tokens': {'$sum': '$prompt_tokens'},
+                'completion_tokens': {'$sum': '$completion_tokens'},
+                'total_tokens': {'$sum': '$total_tokens'}
+            }}
+        ]
+        result = list(self.db.token_usage.aggregate(pipeline))
+        if result:
+            usage = result[0]
+            del usage['_id']
+            return usage
+        return {
+            'prompt_tokens': 0,
+            'completion_tokens': 0,
+            'total_tokens': 0
+        }
+
     def get_notification_history(self, user_id, limit=10, skip=0):
         """Get user's notification history."""
         print(f"Getting notification history for user {user_id}")
@@ -1,5 +1,10 @@
 import subprocess
 import os
+import numpy as np
+
+# ffmpeg's atempo filter only accepts factors in this range per instance
+ATEMPO_MIN = 0.5
+ATEMPO_MAX = 2.0
 
 def preprocess_audio(input_file, output_file="processed_audio.mp3"):
     """
@@ -19,3 +24,139 @@ def preprocess_audio(input_file, output_file="processed_audio.mp3"):
     ]
     subprocess.run(command, check=True)
     return output_file
+
+def decode_pcm(input_file, sample_rate=16000, max_seconds=None):
+    """
+    Decode an audio file to mono float PCM samples.
+
+    Args:
+        input_file (str): Path to the input audio file.
+        sample_rate (int): Output sample rate.
+        max_seconds (float): Only decode this many seconds from the start.
+
+    Returns:
+        np.ndarray: float32 samples in [-1, 1].
+    """
+    if not os.path.exists(input_file):
+        raise FileNotFoundError(f"Input file '{input_file}' not found.")
+    command = ["ffmpeg", "-v", "error", "-i", input_file]
+    if max_seconds:
+        command += ["-t", str(max_seconds)]
+    command += ["-ac", "1", "-ar", str(sample_rate), "-f", "s16le", "-"]
+    result = subprocess.run(command, check=True, capture_output=True)
+    return np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+
+def probe_duration(input_file):
+    """Duration of an audio file in seconds, read with ffprobe without decoding it."""
+    if not os.path.exists(input_file):
+        raise FileNotFoundError(f"Input file '{input_file}' not found.")
+    command = [
+        "ffprobe", "-v", "error", "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1", input_file
+    ]
+    result = subprocess.run(command, check=True, capture_output=True, text=True)
+    return float(result.stdout.strip())
+
+def extract_audio_segment(input_file, output_file, start_seconds, duration_seconds):
+    """
+    Cut a time range out of an audio file.
+
+    Seeks with -ss before the input, so only the requested range is decoded.
+
+    Args:
+        input_file (str): Path to the input audio file.
+        output_file (str): Path to save the extracted range.
+        start_seconds (float): Start of the range.
+        duration_seconds (float): Length of the range.
+
+    Returns:
+        str: Path to the extracted audio file.
+    """
+    if not os.path.exists(input_file):
+        raise FileNotFoundError(f"Input file '{input_file}' not found.")
+    command = [
+        "ffmpeg", "-y", "-v", "error",
+        "-ss", f"{start_seconds:.3f}", "-t", f"{duration_seconds:.3f}", "-i", input_file,
+        "-vn", "-ac", "1", "-ar", "16000", output_file
+    ]
+    subprocess.run(command, check=True)
+    return output_file
+
+def atempo_filter(speed_factor):
+    """Build an ffmpeg atempo filter chain for any positive speed factor."""
+    if speed_factor <= 0:
+        raise ValueError("Speed factor must be positive")
+    stages = []
+    remaining = speed_factor
+    while remaining > ATEMPO_MAX:
+        stages.append(ATEMPO_MAX)
+        remaining /= ATEMPO_MAX
+    while remaining < ATEMPO_MIN:
+        stages.append(ATEMPO_MIN)
+        remaining /= ATEMPO_MIN
+    stages.append(remaining)
+    return ",".join(f"atempo={stage:.4f}" for stage in stages)
+
+def speed_up_audio(input_file, output_file, speed_factor):
+    """
+    Change audio tempo without changing pitch.
+
+    Args:
+        input_file (str): Path to the input audio file.
+        output_file (str): Path to save the accelerated audio file.
+        speed_factor (float): Playback speed, e.g. 1.25 or 1.5.
+
+    Returns:
+        str: Path to the accelerated audio file.
+    """
+    if not os.path.exists(input_file):
+        raise FileNotFoundError(f"Input file '{input_file}' not found.")
+    command = [
+        "ffmpeg", "-y", "-v", "error", "-i", input_file,
+        "-filter:a", atempo_filter(speed_factor),
+        "-ac", "1", "-ar", "16000", output_file
+    ]
+    subprocess.run(command, check=True)
+    return output_file
+
+def estimate_speech_rate(input_file, max_seconds=120, sample_rate=16000):
+    """
+    Estimate speaking rate in syllables per second.
+
+    Counts peaks of the smoothed speech-band energy envelope, which roughly
+    correspond to syllable nuclei, and divides by the voiced duration.
+
+    Args:
+        input_file (str): Path to the input audio file.
+        max_seconds (float): Amount of audio to analyse.
+
+    Returns:
+        float: Estimated syllables per second (0.0 for silent audio).
+    """
+    samples = decode_pcm(input_file, sample_rate, max_seconds)
+    return speech_rate_from_samples(samples, sample_rate)
+
+def speech_rate_from_samples(samples, sample_rate=16000):
+    """Estimate syllables per second from mono PCM samples."""
+    hop = sample_rate // 100  # 10 ms frames
+    frame_count = len(samples) // hop
+    if frame_count < 10:
+        return 0.0
+
+    energy = np.sqrt(np.mean(samples[:frame_count * hop].reshape(frame_count, hop) ** 2, axis=1))
+    envelope = np.convolve(energy, np.hanning(9) / np.hanning(9).sum(), mode="same")
+
+    voiced = envelope > 0.3 * np.median(envelope[envelope > 0]) if np.any(envelope > 0) else np.zeros_like(envelope, dtype=bool)
+    if not voiced.any():
+        return 0.0
+
+    threshold = np.percentile(envelope[voiced], 40)
+    is_peak = (envelope[1:-1] > envelope[:-2]) & (envelope[1:-1] >= envelope[2:]) & (envelope[1:-1] > threshold)
+    peaks = np.flatnonzero(is_peak) + 1
+
+    # Syllable nuclei are at least ~100 ms apart
+    if len(peaks):
+        peaks = peaks[np.concatenate(([True], np.diff(peaks) >= 10))]
+
+    voiced_seconds = voiced.sum() * hop / sample_rate
+    return len(peaks) / voiced_seconds if voiced_seconds else 0.0
@@ -4,8 +4,10 @@ from typing import Dict
 from datetime import datetime
 from video_downloader import download_video
 from audio_extractor import extract_audio
-from transcriber import transcribe_audio
+from transcriber import transcribe_audio, preload_models
 from chatgpt_extractor import ChatGPTExtractor
+from key_points_extractor import normalize_for_llm
+from token_budget import usage_context
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -16,18 +18,32 @@ class VideoProcessor:
         """Initialize the video processor with optional API key."""
         self.api_key = api_key
         self.chatgpt = ChatGPTExtractor(api_key)
+
+        # Warm the Whisper model cache so the first job doesn't pay for loading
+        preload = os.getenv('WHISPER_PRELOAD_MODELS')
+        if preload:
+            preload_models([size.strip() for size in preload.split(',') if size.strip()])
         
-    def process_video(self, video_url: str, is_premium: bool = False) -> Dict:
+    def process_video(self, video_url: str, is_premium: bool = False, plan: str = None,
+                      db=None, user_id: str = None) -> Dict:
         """
         Process a video URL to extract key insights.
         
         Args:
             video_url (str): URL of the video to process
             is_premium (bool): Whether this is a premium user request
+            plan (str): Pricing plan whose token budget applies to LLM calls
+            db: pymongo database the token usage of LLM calls is stored in
+            user_id (str): User the token usage is billed to
             
         Returns:
             dict: Dictionary containing transcript, key points, summary, and titles
         """
+        with usage_context(db, user_id=user_id, plan=plan):
+            return self._process_video(video_url)
+
+    def _process_video(self, video_url: str) -> Dict:
+        """Download, transcribe and analyze a video."""
         try:
             # Download video
             video_path = download_video(video_url)
@@ -44,8 +60,15 @@ class VideoProcessor:
             if not transcript:
                 raise Exception("Failed to transcribe audio")
                 
-            # Extract key points, titles, and get summary
-            results = self.chatgpt.extract_key_points(transcript)
+            # Extract key points, titles, and get summary from the transcript
+            # without disfluencies; the raw transcript is still returned
+            normalized, stats = normalize_for_llm(transcript)
+            if stats["normalized_tokens"] < stats["tokens"]:
+                logger.info(
+                    f"Transcript normalization saved {stats['tokens'] - stats['normalized_tokens']} "
+                    f"of {stats['tokens']} LLM input tokens"
+                )
+            results = self.chatgpt.extract_key_points(normalized)
             if not results or "error" in results:
                 raise Exception("Failed to analyze transcript")
             
@@ -1,20 +1,47 @@
 import json
-from youtube_downloader import download_audio
-from transcription import transcribe_audio
-from key_points_extractor import extract_key_points, format_key_points
+from youtube_downloader import download_audio, probe_video
+from transcription import iter_transcribe_chunks, choose_speed_factor
+from key_points_extractor import extract_key_points, extract_key_points_incremental, format_key_points, normalize_for_llm
 from pptx_creator import create_presentation
+import audio_fingerprint
+import corpus_idf
+import transcript_store
+from audio_fingerprint import audio_duration, compute_fingerprint, find_matching_transcript, save_fingerprint
+from transcript_store import save_transcript, load_transcript
+import transcription_router
+import token_budget
+from token_budget import usage_context
+from transcription_router import route_transcription, log_routing_decision, record_routing_outcome, fetch_captions
+from transcriber import transcribe_audio_verbose as transcribe_local
+from sentence_segmenter import split_sentences
 import logging
 import os
+import time
 from pymongo import MongoClient
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Local Whisper model used when OpenAI transcription is unavailable
+TRANSCRIPTION_FALLBACK_MODEL = os.getenv('TRANSCRIPTION_FALLBACK_MODEL', 'small')
+
 # Connect to MongoDB
 client = MongoClient()
 db = client.vidpoint
 
+try:
+    audio_fingerprint.ensure_indexes(db)
+    transcript_store.ensure_indexes(db)
+    transcription_router.ensure_indexes(db)
+    token_budget.ensure_indexes(db)
+    corpus_idf.ensure_indexes(db)
+except Exception as e:
+    logger.warning(f"Could not create indexes: {str(e)}")
+
+# Score sentences with IDF from every stored transcript
+corpus_idf.configure(db)
+
 def update_status(video_id, status, step=None, error=None, presentation_url=None):
     """Update processing status in MongoDB."""
     try:
@@ -34,36 +61,177 @@ def update_status(video_id, status, step=None, error=None, presentation_url=None
     except Exception as e:
         logger.error(f"Error updating status: {str(e)}")
 
-def process_youtube_video(url, video_id):
+def route_job(metadata, plan):
+    """Route a job and log the decision, returning (decision, decision_id)."""
+    decision = route_transcription(metadata, plan)
+    try:
+        decision_id = log_routing_decision(db, decision)
+    except Exception as e:
+        logger.warning(f"Error logging routing decision: {str(e)}")
+        decision_id = None
+    return decision, decision_id
+
+def record_outcome(decision_id, started, success, error=None, transcript=None):
+    """Record how a routed transcription turned out."""
+    if not decision_id:
+        return
+    try:
+        record_routing_outcome(
+            db,
+            decision_id,
+            success,
+            time.perf_counter() - started,
+            error=error,
+            word_count=len(transcript.split()) if transcript else None
+        )
+    except Exception as e:
+        logger.warning(f"Error recording routing outcome: {str(e)}")
+
+def process_youtube_video(url, video_id, plan=None, user_id=None):
     """Complete workflow to process a YouTube video."""
+    # LLM calls made for this job are budgeted by plan and billed to the user
+    with usage_context(db, user_id=user_id, plan=plan, video_id=video_id):
+        return _process_youtube_video(url, video_id, plan)
+
+def _process_youtube_video(url, video_id, plan=None):
+    """Pipeline steps of process_youtube_video."""
     audio_file = None
     try:
         logger.info(f"Starting video processing for URL: {url}, Video ID: {video_id}")
 
-        # Update MongoDB status
-        update_status(video_id, "processing", "downloading")
-        logger.info("Updated MongoDB status to downloading")
-
-        # Step 1: Download audio
+        # Step 1: Probe the video and choose a transcription engine
+        metadata = None
+        decision = None
+        decision_id = None
         try:
-            logger.info(f"Downloading audio from YouTube for video {video_id}...")
-            audio_file = download_audio(url)
-            if not audio_file or not os.path.exists(audio_file):
-                raise Exception("Audio file not found after download")
-            logger.info(f"Audio downloaded successfully to {audio_file}")
+            metadata = probe_video(url)
+            decision, decision_id = route_job(metadata, plan)
         except Exception as e:
-            error_msg = f"Failed to download audio: {str(e)}"
-            logger.error(error_msg)
-            raise Exception(error_msg)
+            logger.warning(f"Probe or routing failed, using default transcription: {str(e)}")
+        engine = decision["engine"] if decision else "openai"
+        started = time.perf_counter()
+
+        # Caption tracks replace download and transcription entirely
+        result = None
+        if engine == "captions":
+            update_status(video_id, "processing", "fetching_captions")
+            try:
+                result = fetch_captions(metadata["video_id"], decision["caption_language"])
+                logger.info(f"Using {decision['caption_language']} captions as transcript")
+            except Exception as e:
+                logger.warning(f"Caption fetch failed, transcribing audio instead: {str(e)}")
+                record_outcome(decision_id, started, False, error=str(e))
+                decision, decision_id = route_job(
+                    dict(metadata, manual_captions=[], automatic_captions=[]), plan
+                )
+                engine = decision["engine"]
+                started = time.perf_counter()
+
+        fingerprint = None
+        fingerprint_duration = None
+        stored = None
+        if not result:
+            # Update MongoDB status
+            update_status(video_id, "processing", "downloading")
+            logger.info("Updated MongoDB status to downloading")
+
+            # Step 2: Download audio
+            try:
+                logger.info(f"Downloading audio from YouTube for video {video_id}...")
+                audio_file = download_audio(url)
+                if not audio_file or not os.path.exists(audio_file):
+                    raise Exception("Audio file not found after download")
+                logger.info(f"Audio downloaded successfully to {audio_file}")
+            except Exception as e:
+                error_msg = f"Failed to download audio: {str(e)}"
+                logger.error(error_msg)
+                raise Exception(error_msg)
+
+            # Update status for transcription
+            update_status(video_id, "processing", "transcribing")
+            logger.info("Updated MongoDB status to transcribing")
+
+            # Step 3: Fingerprint audio so re-uploads can reuse an existing transcript
+            try:
+                fingerprint_duration = audio_duration(audio_file)
+                fingerprint = compute_fingerprint(audio_file)
+                match = find_matching_transcript(db, fingerprint, fingerprint_duration)
+                if match:
+                    stored = load_transcript(db, content_hash=match["transcript_hash"])
+                    if stored:
+                        logger.info(f"Audio matches video {match['video_id']}, reusing its transcript")
+            except Exception as e:
+                logger.warning(f"Fingerprint lookup failed, transcribing normally: {str(e)}")
+
+        # Step 4: Transcribe audio, extracting key points as each chunk completes
+        key_points = None
+        normalization = {"tokens": 0, "normalized_tokens": 0}
 
-        # Update status for transcription
-        update_status(video_id, "processing", "transcribing")
-        logger.info("Updated MongoDB status to transcribing")
+        def normalize(text):
+            """Strip disfluencies from text sent to the LLM, counting the tokens saved."""
+            text, stats = normalize_for_llm(text)
+            normalization["tokens"] += stats["tokens"]
+            normalization["normalized_tokens"] += stats["normalized_tokens"]
+            return text
 
-        # Step 2: Transcribe audio
         try:
-            logger.info(f"Transcribing audio file: {audio_file}")
-            transcript = transcribe_audio(audio_file)
+            if result:
+                pass
+            elif stored:
+                result = stored
+            elif engine == "local":
+                logger.info(f"Transcribing audio file locally with Whisper {decision['model']}: {audio_file}")
+                result = transcribe_local(audio_file, decision["model"])
+            else:
+                logger.info(f"Transcribing audio file: {audio_file}")
+                speed_factor = choose_speed_factor(audio_file, plan)
+                chunks = []
+                transcription_failed = []
+
+                def transcript_sections():
+                    try:
+                        for chunk in iter_transcribe_chunks(audio_file, speed_factor=speed_factor):
+                            chunks.append(chunk)
+                            if chunk["index"] == 0:
+                                # Extraction starts with the first chunk, alongside transcription
+                                update_status(video_id, "processing", "extracting")
+                            yield normalize(chunk["text"])
+                    except Exception:
+                        transcription_failed.append(True)
+                        raise
+
+                sections = transcript_sections()
+                try:
+                    try:
+                        key_points = extract_key_points_incremental(sections)
+                    except Exception as e:
+                        if transcription_failed:
+                            raise
+                        # Extraction failed, not transcription: finish transcribing and
+                        # extract from the whole transcript in step 5
+                        logger.warning(f"Incremental key point extraction failed, retrying after transcription: {str(e)}")
+                        key_points = None
+                        for _ in sections:
+                            pass
+                        normalization.update(tokens=0, normalized_tokens=0)
+                    result = {
+                        "text": " ".join(chunk["text"] for chunk in chunks),
+                        "segments": [segment for chunk in chunks for segment in chunk["segments"]],
+                        "language": chunks[0]["language"] if chunks else None,
+                        "duration": chunks[0]["duration"] if chunks else None
+                    }
+                except Exception as e:
+                    # OpenAI transcription is failing or its circuit is open
+                    logger.warning(
+                        f"OpenAI transcription failed, falling back to local Whisper "
+                        f"{TRANSCRIPTION_FALLBACK_MODEL}: {str(e)}"
+                    )
+                    record_outcome(decision_id, started, False, error=str(e))
+                    decision_id = None
+                    key_points = None
+                    normalization.update(tokens=0, normalized_tokens=0)
+                    result = transcribe_local(audio_file, TRANSCRIPTION_FALLBACK_MODEL)
+            transcript = result["text"] if result else ""
             
             # Validate transcript
             if not transcript:
@@ -71,30 +239,61 @@ def process_youtube_video(url, video_id):
             if len(transcript.split()) < 10:  # At least 10 words
                 raise Exception("Transcript too short")
                 
+            record_outcome(decision_id, started, True, transcript=transcript)
             logger.info(f"Transcription completed. Length: {len(transcript)} chars")
             logger.info(f"Transcript preview: {transcript[:500]}...")
+
+            # Persist the transcript with its segments for later stages and re-exports
+            transcript_hash = None
+            try:
+                transcript_hash = save_transcript(
+                    db,
+                    video_id,
+                    transcript,
+                    segments=result.get("segments"),
+                    language=result.get("language"),
+                    duration=result.get("duration")
+                )
+            except Exception as e:
+                logger.warning(f"Error saving transcript: {str(e)}")
+
+            if transcript_hash and fingerprint is not None and len(fingerprint) and fingerprint_duration:
+                try:
+                    save_fingerprint(db, video_id, fingerprint, transcript_hash, fingerprint_duration)
+                except Exception as e:
+                    logger.warning(f"Error saving fingerprint: {str(e)}")
             
         except Exception as e:
             error_msg = f"Failed to transcribe audio: {str(e)}"
             logger.error(error_msg)
+            record_outcome(decision_id, started, False, error=error_msg)
             update_status(video_id, "error", error=error_msg)
             raise Exception(error_msg)
 
-        # Update status for key points extraction
-        update_status(video_id, "processing", "extracting")
-        logger.info("Updated MongoDB status to extracting")
+        # Update status for key points extraction, unless it already ran with transcription
+        if not key_points:
+            update_status(video_id, "processing", "extracting")
+            logger.info("Updated MongoDB status to extracting")
 
-        # Step 3: Extract key points
+        # Step 5: Extract key points
         try:
             logger.info("Extracting key points from transcript...")
             logger.info(f"Input transcript length: {len(transcript)} chars")
             
             # Split transcript into sentences for debugging
-            sentences = transcript.split('.')
+            sentences = split_sentences(transcript)
             logger.info(f"Found {len(sentences)} sentences in transcript")
-            logger.info(f"First few sentences: {'. '.join(sentences[:3])}...")
+            logger.info(f"First few sentences: {' '.join(sentences[:3])}...")
             
-            key_points = extract_key_points(transcript)
+            if not key_points:
+                key_points = extract_key_points(normalize(transcript))
+
+            saved = normalization["tokens"] - normalization["normalized_tokens"]
+            if saved:
+                logger.info(
+                    f"Transcript normalization saved {saved} of {normalization['tokens']} LLM input tokens "
+                    f"({100 * saved / normalization['tokens']:.1f}%) for video {video_id}"
+                )
             
             if not key_points:
                 raise Exception("No key points extracted from transcript")
@@ -125,7 +324,7 @@ def process_youtube_video(url, video_id):
         update_status(video_id, "processing", "creating_slides")
         logger.info("Updated MongoDB status to creating_slides")
 
-        # Step 4: Create presentation
+        # Step 6: Create presentation
         try:
             logger.info("Creating PowerPoint presentation...")
             
@@ -206,8 +405,10 @@ if __name__ == "__main__":
     # Example YouTube video URL
     video_url = "https://youtu.be/75i0tiz49MA?si=F7S4YpI5X1cgrNro"
     video_id = "75i0tiz49MA"
+    # Token usage of the run is billed to this user on the dashboard
+    user_id = os.getenv('VIDPOINT_USER_ID')
     
-    result = process_youtube_video(video_url, video_id)
+    result = process_youtube_video(video_url, video_id, user_id=user_id)
     if "error" in result:
         print(f"\nError: {result['error']}")
     else:
@@ -0,0 +1,94 @@
+"""Benchmark the sparse key point scoring engine against the dense one.
+
+Usage:
+    python scripts/benchmark_key_point_scoring.py [--sizes 100,1000,10000,50000] [--legacy-max 10000]
+
+Times extract_points.extract_key_points on synthetic transcripts of
+increasing sentence counts, next to the previous implementation (dense
+toarray(), Python scoring loop, sentences.index reordering). The legacy
+engine is O(n^2) and needs sentences x vocabulary floats of memory, so it
+is skipped above --legacy-max sentences.
+"""
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Add project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from extract_points import extract_key_points, split_into_sentences
+
+def legacy_extract_key_points(transcript, num_points=5):
+    """The previous extract_key_points, without the final formatting."""
+    sentences = split_into_sentences(transcript)
+    if len(sentences) < num_points:
+        return sentences
+    vectorizer = TfidfVectorizer(stop_words='english')
+    tfidf_matrix = vectorizer.fit_transform(sentences)
+    importance_scores = np.array([sum(row) for row in tfidf_matrix.toarray()])
+    final_scores = []
+    for i, sentence in enumerate(sentences):
+        position_score = 1.0
+        if i < len(sentences) * 0.2:
+            position_score = 1.5
+        elif i > len(sentences) * 0.8:
+            position_score = 1.2
+        length_penalty = 0.8 if len(sentence.split()) > 20 else 1.0
+        final_scores.append((sentence, (0.7 * importance_scores[i] + 0.3 * position_score) * length_penalty))
+    sorted_points = sorted(final_scores, key=lambda x: x[1], reverse=True)
+    key_points = [point[0] for point in sorted_points[:num_points]]
+    key_points.sort(key=lambda x: sentences.index(x))
+    return [' '.join(p.split()[:15]) + '...' if len(p.split()) > 15 else p for p in key_points]
+
+def make_transcript(sentence_count, seed=0):
+    """Synthetic transcript with a vocabulary that grows with its length, like real speech."""
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(max(200, sentence_count // 5))]
+    common = "the pricing model revenue customers growth retention support platform month".split()
+    sentences = []
+    for _ in range(sentence_count):
+        words = [rng.choice(common) if rng.random() < 0.4 else rng.choice(vocabulary)
+                 for _ in range(rng.randint(6, 30))]
+        sentences.append(' '.join(words))
+    return '. '.join(sentences) + '.'
+
+def measure(fn, transcript):
+    """Wall-clock seconds of one run, and peak traced memory in MB of a second run."""
+    started = time.perf_counter()
+    result = fn(transcript, 6)
+    seconds = time.perf_counter() - started
+    # Traced separately: tracemalloc slows allocation-heavy code down
+    tracemalloc.start()
+    fn(transcript, 6)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak / 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='100,1000,10000,50000', help="Comma-separated sentence counts")
+    parser.add_argument('--legacy-max', type=int, default=10000, help="Largest size to run the legacy engine on")
+    args = parser.parse_args()
+
+    print(f"{'sentences':>10s} {'sparse':>10s} {'peak MB':>8s} {'legacy':>10s} {'peak MB':>8s} {'speedup':>8s}  same points")
+    for size in (int(s) for s in args.sizes.split(',')):
+        transcript = make_transcript(size)
+        points, seconds, peak = measure(extract_key_points, transcript)
+        line = f"{size:10d} {seconds * 1000:8.1f}ms {peak:8.1f}"
+        if size <= args.legacy_max:
+            legacy_points, legacy_seconds, legacy_peak = measure(legacy_extract_key_points, transcript)
+            line += (f" {legacy_seconds * 1000:8.1f}ms {legacy_peak:8.1f} {legacy_seconds / seconds:7.1f}x"
+                     f"  {points == legacy_points}")
+        else:
+            line += f" {'skipped':>10s}"
+        print(line)
+
+if __name__ == '__main__':
+    main()
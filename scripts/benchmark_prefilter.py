@@ -0,0 +1,129 @@
+"""Measure what the key point pre-filter saves and what it costs in quality.
+
+Usage:
+    OPENAI_BASE_URL=http://localhost:8089/v1 OPENAI_API_KEY=stub \\
+        python scripts/benchmark_prefilter.py [--transcript FILE] [--keep 0.4] [--max-tokens 2500]
+
+Runs key_points_extractor.extract_key_points on the same transcript with
+and without the pre-filter (LLM cache disabled) and reports prompt tokens,
+latency and the quality delta:
+
+- term recall: share of the transcript's 50 highest TF-IDF terms that
+  survive the pre-filter (no LLM needed);
+- point overlap: ROUGE-1 F1 of each baseline key point against its best
+  match among the pre-filtered key points, averaged.
+
+Point overlap is only meaningful against the real API.
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from config import KEY_POINTS_CONFIG
+from corpus_idf import analyze, tfidf_matrix
+from key_points_extractor import extract_key_points, prefilter_transcript
+from llm_cache import llm_cache
+from token_budget import usage_context
+
+SAMPLE_SENTENCES = [
+    "Our pricing starts at forty nine dollars per month for the basic tier",
+    "So yeah that is basically how it works",
+    "The professional tier adds analytics and white label reports for ninety nine dollars",
+    "Let me know if you have any questions about that",
+    "Customers save forty percent on operational costs in the first quarter",
+    "Okay moving on to the next part",
+    "Onboarding takes less than a week with the dedicated support team",
+    "I think that is really important to remember",
+    "Retention across all plans is ninety five percent year over year",
+    "Enterprise contracts include single sign on and a four hour support window",
+]
+SAMPLE_TRANSCRIPT = '. '.join(SAMPLE_SENTENCES * 40) + '.'
+
+class UsageLog:
+    """Collects usage documents in place of the token_usage collection."""
+
+    def __init__(self):
+        self.documents = []
+
+    def __getitem__(self, collection):
+        return self
+
+    def insert_one(self, document):
+        self.documents.append(document)
+
+def rouge1_f1(reference, candidate):
+    """Unigram overlap F1 of two texts."""
+    reference_words = re.findall(r"\w+", reference.lower())
+    candidate_words = re.findall(r"\w+", candidate.lower())
+    if not reference_words or not candidate_words:
+        return 0.0
+    overlap = sum(min(reference_words.count(w), candidate_words.count(w)) for w in set(candidate_words))
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / len(candidate_words), overlap / len(reference_words)
+    return 2 * precision * recall / (precision + recall)
+
+def point_overlap(baseline_points, points):
+    """Mean best ROUGE-1 F1 of each baseline point among the other points."""
+    if not baseline_points or not points:
+        return 0.0
+    return float(np.mean([max(rouge1_f1(b, p) for p in points) for b in baseline_points]))
+
+def term_recall(transcript, filtered, top=50):
+    """Share of the transcript's top TF-IDF terms still in the filtered text."""
+    weights = np.asarray(tfidf_matrix([transcript]).todense()).ravel()
+    vocabulary = sorted(set(analyze(transcript)))
+    top_terms = {vocabulary[i] for i in np.argsort(-weights)[:top]}
+    return len(top_terms & set(analyze(filtered))) / max(1, len(top_terms))
+
+def run(transcript, prefilter):
+    """Key points, prompt tokens and seconds of one extraction."""
+    usage = UsageLog()
+    started = time.perf_counter()
+    with usage_context(db=usage, plan="pro"):
+        points = extract_key_points(transcript, prefilter=prefilter)
+    seconds = time.perf_counter() - started
+    return points, sum(d['prompt_tokens'] for d in usage.documents), seconds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--transcript', help="Transcript text file (defaults to a built-in sample)")
+    parser.add_argument('--keep', type=float, default=None, help="Share of sentences to keep")
+    parser.add_argument('--max-tokens', type=int, default=None, help="Token budget of the filtered transcript")
+    args = parser.parse_args()
+
+    transcript = SAMPLE_TRANSCRIPT
+    if args.transcript:
+        with open(args.transcript, encoding='utf-8') as f:
+            transcript = f.read()
+
+    # Every run should reach the API
+    llm_cache.enabled = False
+
+    filtered, stats = prefilter_transcript(transcript, args.keep, args.max_tokens)
+    print(f"Transcript: {stats['tokens']} tokens; pre-filter keeps {stats['kept_tokens']} tokens "
+          f"({stats['kept']}/{stats['sentences']} sentences)")
+    print(f"  term recall: {term_recall(transcript, filtered):.2f}")
+
+    if args.keep or args.max_tokens:
+        # extract_key_points reads the configured pre-filter settings
+        KEY_POINTS_CONFIG['prefilter_keep_fraction'] = args.keep or KEY_POINTS_CONFIG['prefilter_keep_fraction']
+        KEY_POINTS_CONFIG['prefilter_max_tokens'] = args.max_tokens or KEY_POINTS_CONFIG['prefilter_max_tokens']
+
+    baseline_points, baseline_tokens, baseline_seconds = run(transcript, prefilter=False)
+    points, tokens, seconds = run(transcript, prefilter=True)
+    print(f"  full transcript: {baseline_tokens:7d} prompt tokens  {baseline_seconds:6.2f}s  {len(baseline_points)} points")
+    print(f"  pre-filtered:    {tokens:7d} prompt tokens  {seconds:6.2f}s  {len(points)} points")
+    print(f"  prompt tokens saved: {baseline_tokens - tokens} ({100 * (1 - tokens / max(1, baseline_tokens)):.0f}%)")
+    print(f"  point overlap with baseline (ROUGE-1 F1): {point_overlap(baseline_points, points):.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Benchmark sentence_segmenter against the splitters it replaced.
+
+Usage:
+    python scripts/benchmark_sentence_segmenter.py [--megabytes 10] [--repeat 3]
+
+Reports throughput (MB/s) and peak extra memory on a synthetic transcript,
+and accuracy on a sample with abbreviations, decimals, initials and
+ellipses. NLTK punkt is included when nltk and its punkt data are
+installed.
+"""
+import argparse
+import random
+import re
+import sys
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+
+# Add project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from sentence_segmenter import iter_sentence_spans, split_sentences
+
+# Sentences a correct splitter keeps whole
+GOLD_SENTENCES = [
+    "Dr. Smith joined us at 5 p.m. on Monday.",
+    "Revenue grew 3.5% to $1.2 million in Q3.",
+    "Version 2.0.1 ships next week, e.g. to enterprise customers first.",
+    "J. K. Rowling spoke about writing vs. editing.",
+    "Prices start at $49... and go up from there.",
+    "Is it worth it?",
+    "Absolutely!",
+    "We compared it with No. 5 on the list.",
+    "Our team in the U.S. grew fast.",
+    "Then we expanded.",
+]
+
+FILLER_SENTENCES = [
+    "Our pricing starts at forty nine dollars per month for the basic tier.",
+    "Customers save 40.5% on operational costs in the first quarter!",
+    "Dr. Lee runs onboarding, which takes less than a week.",
+    "Does retention really reach 95% year over year?",
+    "Enterprise contracts include SSO, audit logs, etc. and a 4 hour support window.",
+]
+
+def legacy_process_video(text):
+    return text.split('.')
+
+def legacy_extract_points(text):
+    text = re.sub(r'\s+', ' ', text.strip())
+    return [s.strip() for s in re.split(r'[.!?]+\s*', text) if s.strip()]
+
+def legacy_slides(text):
+    return text.split('. ')
+
+def consume_spans(text):
+    """Walk the segmenter without building a list."""
+    deque(iter_sentence_spans(text), maxlen=0)
+
+def punkt_splitter():
+    """NLTK punkt sent_tokenize, or None if it isn't installed."""
+    try:
+        import nltk
+        nltk.sent_tokenize("Test sentence. Another one.")
+        return nltk.sent_tokenize
+    except Exception:
+        return None
+
+def make_text(megabytes, seed=0):
+    rng = random.Random(seed)
+    sentences, size = [], 0
+    while size < megabytes * 1_000_000:
+        sentence = rng.choice(FILLER_SENTENCES)
+        sentences.append(sentence)
+        size += len(sentence) + 1
+    return ' '.join(sentences)
+
+def measure(fn, text, repeat):
+    """Best throughput in MB/s, and peak traced memory in MB of one more run."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    fn(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(text) / 1e6 / best, peak / 1e6
+
+def accuracy(fn):
+    """Share of gold sentences returned intact."""
+    found = {' '.join(s.split()).rstrip('.!?') for s in fn(' '.join(GOLD_SENTENCES))}
+    return sum(s.rstrip('.!?') in found for s in GOLD_SENTENCES) / len(GOLD_SENTENCES)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--megabytes', type=float, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    splitters = [
+        ("str.split('.') (process_video)", legacy_process_video),
+        ("re.split (extract_points)", legacy_extract_points),
+        ("str.split('. ') (slides)", legacy_slides),
+    ]
+    punkt = punkt_splitter()
+    if punkt:
+        splitters.append(("nltk punkt", punkt))
+    splitters += [
+        ("split_sentences", split_sentences),
+        ("iter_sentence_spans (streamed)", consume_spans),
+    ]
+
+    text = make_text(args.megabytes)
+    print(f"{len(text) / 1e6:.1f} MB transcript, best of {args.repeat}")
+    for name, fn in splitters:
+        throughput, peak = measure(fn, text, args.repeat)
+        correct = f"{accuracy(fn):4.0%}" if fn is not consume_spans else "   -"
+        print(f"  {name:32s} {throughput:7.1f} MB/s  {peak:8.1f} MB peak  {correct} of tricky sentences intact")
+    if not punkt:
+        print("  nltk punkt skipped (nltk or punkt data not installed)")
+
+if __name__ == '__main__':
+    main()
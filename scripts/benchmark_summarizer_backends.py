@@ -0,0 +1,130 @@
+"""Compare the PyTorch and quantized ONNX summarization backends.
+
+Usage:
+    python scripts/benchmark_summarizer_backends.py [FIXTURE_DIR]
+        [--backends pytorch onnx] [--repeat 3]
+
+Each backend runs in its own process so peak memory isn't shared. Reports
+model load time, peak resident memory, seconds per window (one at a time
+and batched) and ROUGE-1/2/L F1: against NAME.summary.txt references when
+FIXTURE_DIR has them, and of every backend against the first one. Without
+FIXTURE_DIR a built-in sample transcript is used. Export the ONNX model
+with scripts/export_summarizer_onnx.py first.
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from summarization import get_summarizer, split_token_windows, summarize_text, token_lengths, _run_pipeline
+from utils.fixtures import load_summary_fixtures
+from utils.metrics import rouge_n, rouge_l
+
+SAMPLE_TRANSCRIPT = " ".join([
+    "Our pricing starts at forty nine dollars per month for the basic tier.",
+    "The professional tier adds analytics and white label reports for ninety nine dollars.",
+    "Customers save forty percent on operational costs in the first quarter.",
+    "Onboarding takes less than a week with the dedicated support team.",
+    "Retention across all plans is ninety five percent year over year.",
+    "Enterprise contracts include single sign on and a four hour support window.",
+    "Next quarter we are launching a self serve API for partners.",
+    "Partners get a revenue share of twenty percent on referred accounts.",
+] * 12)
+
+def peak_memory_mb():
+    """Peak resident memory of this process (ru_maxrss is KB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_backend(backend, fixtures, repeat):
+    """Measure one backend in this process; returns a JSON-serializable report."""
+    started = time.perf_counter()
+    get_summarizer(backend)
+    load_seconds = time.perf_counter() - started
+
+    windows = []
+    for _, transcript, _ in fixtures:
+        windows += split_token_windows(transcript, lambda texts: token_lengths(texts, backend))
+
+    single = float('inf')
+    batched = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for window in windows:
+            _run_pipeline([window], 130, 30, backend)
+        single = min(single, (time.perf_counter() - started) / len(windows))
+
+        started = time.perf_counter()
+        _run_pipeline(windows, 130, 30, backend)
+        batched = min(batched, (time.perf_counter() - started) / len(windows))
+
+    summaries = {name: summarize_text(transcript, backend=backend) for name, transcript, _ in fixtures}
+    return {
+        "load_seconds": load_seconds,
+        "peak_mb": peak_memory_mb(),
+        "windows": len(windows),
+        "single_seconds": single,
+        "batched_seconds": batched,
+        "summaries": summaries
+    }
+
+def rouge(reference, candidate):
+    return rouge_n(reference, candidate, 1), rouge_n(reference, candidate, 2), rouge_l(reference, candidate)
+
+def mean_rouge(pairs):
+    scores = [rouge(reference, candidate) for reference, candidate in pairs]
+    return [sum(column) / len(scores) for column in zip(*scores)] if scores else None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('fixture_dir', nargs='?')
+    parser.add_argument('--backends', nargs='+', default=['pytorch', 'onnx'])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    fixtures = list(load_summary_fixtures(args.fixture_dir)) if args.fixture_dir else [("sample", SAMPLE_TRANSCRIPT, None)]
+
+    if args.worker:
+        print(json.dumps(run_backend(args.worker, fixtures, args.repeat)))
+        return
+
+    reports = {}
+    for backend in args.backends:
+        command = [sys.executable, __file__, '--worker', backend, '--repeat', str(args.repeat)]
+        if args.fixture_dir:
+            command.insert(2, args.fixture_dir)
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"{backend}: failed\n{result.stderr.strip().splitlines()[-1] if result.stderr.strip() else ''}")
+            continue
+        reports[backend] = json.loads(result.stdout.strip().splitlines()[-1])
+
+    if not reports:
+        return
+    print(f"{len(fixtures)} transcripts, best of {args.repeat}")
+    baseline = next(iter(reports))
+    for backend, report in reports.items():
+        print(f"\n{backend} (loaded in {report['load_seconds']:.1f}s, peak {report['peak_mb']:.0f} MB)")
+        print(f"  {report['windows']} windows: {report['single_seconds']:.2f}s per window one at a time, "
+              f"{report['batched_seconds']:.2f}s per window batched")
+
+        references = mean_rouge([
+            (reference, report['summaries'][name]) for name, _, reference in fixtures if reference
+        ])
+        if references:
+            print(f"  ROUGE-1/2/L vs references: {references[0]:.3f} / {references[1]:.3f} / {references[2]:.3f}")
+        if backend != baseline:
+            agreement = mean_rouge([
+                (reports[baseline]['summaries'][name], report['summaries'][name]) for name, _, _ in fixtures
+            ])
+            print(f"  ROUGE-1/2/L vs {baseline}: {agreement[0]:.3f} / {agreement[1]:.3f} / {agreement[2]:.3f}")
+
+if __name__ == '__main__':
+    main()
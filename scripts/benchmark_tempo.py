@@ -0,0 +1,63 @@
+"""Benchmark tempo-accelerated transcription against the 1.0x baseline.
+
+Usage:
+    python scripts/benchmark_tempo.py FIXTURE_DIR [--factors 1.0 1.25 1.5]
+
+FIXTURE_DIR holds audio files (mp3/wav/m4a) with a reference transcript
+next to each one under the same name with a .txt extension.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from pydub import AudioSegment
+from transcription import transcribe_audio_verbose
+from utils.metrics import word_error_rate
+from utils.fixtures import load_audio_fixtures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('fixture_dir')
+    parser.add_argument('--factors', type=float, nargs='+', default=[1.0, 1.25, 1.5])
+    args = parser.parse_args()
+
+    totals = {factor: {'wer': 0.0, 'billed_minutes': 0.0, 'seconds': 0.0} for factor in args.factors}
+    count = 0
+
+    for audio_path, reference in load_audio_fixtures(args.fixture_dir):
+        count += 1
+        minutes = len(AudioSegment.from_file(audio_path)) / 60000.0
+        print(f"\n{os.path.basename(audio_path)} ({minutes:.1f} min)")
+        for factor in args.factors:
+            started = time.perf_counter()
+            result = transcribe_audio_verbose(audio_path, speed_factor=factor)
+            elapsed = time.perf_counter() - started
+            hypothesis = result['text'] if result else ''
+            wer = word_error_rate(reference, hypothesis)
+
+            totals[factor]['wer'] += wer
+            totals[factor]['billed_minutes'] += minutes / factor
+            totals[factor]['seconds'] += elapsed
+            print(f"  {factor:.2f}x  WER={wer:.3f}  billed={minutes / factor:.2f} min  time={elapsed:.1f}s")
+
+    if not count:
+        print("No fixtures found")
+        return
+
+    print("\nSummary")
+    baseline = totals.get(1.0)
+    for factor, total in totals.items():
+        line = (f"  {factor:.2f}x  mean WER={total['wer'] / count:.3f}  "
+                f"billed={total['billed_minutes']:.1f} min  time={total['seconds']:.1f}s")
+        if baseline and factor != 1.0:
+            line += f"  WER delta={(total['wer'] - baseline['wer']) / count:+.3f}"
+        print(line)
+
+if __name__ == '__main__':
+    main()
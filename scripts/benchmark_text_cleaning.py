@@ -0,0 +1,126 @@
+"""Microbenchmark the precompiled text-cleaning engine.
+
+Usage:
+    python scripts/benchmark_text_cleaning.py [--sentences 10000] [--repeat 3]
+
+Compares the previous one-re.sub-per-phrase implementation against
+clean_sentence (one pass per phrase table) and clean_sentences (one pass
+per table over the whole batch) on a synthetic transcript, and reports
+the speed and token reduction of normalize_transcript on a transcript
+with typical speech disfluencies.
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from key_points_extractor import (
+    FILLER_WORDS, FILLER_PHRASES, REDUNDANT_PHRASES, VERBOSE_REPLACEMENTS, UNNECESSARY_WORDS,
+    clean_sentence, clean_sentences, shorten_sentence, normalize_transcript
+)
+from token_budget import count_tokens
+
+VOCABULARY = (
+    "so well you know i mean like basically actually really very just um uh kind of sort of "
+    "the pricing model starts at forty nine dollars per month and we see revenue growth of "
+    "forty percent in order to due to the fact that customers retention support onboarding "
+    "in spite of prior to a large number of people think believe literally quite simply"
+).split()
+
+def legacy_clean_sentence(text):
+    """The previous implementation: one re.sub call per phrase."""
+    text = ' '.join(text.split())
+    text = re.sub(r'[^\w\s.,!?-]', '', text)
+    for word in FILLER_WORDS:
+        text = re.sub(rf'\b{word}\b', '', text, flags=re.IGNORECASE)
+    text = ' '.join(text.split())
+    for phrase in FILLER_PHRASES:
+        text = re.sub(rf'\b{phrase}\b', '', text, flags=re.IGNORECASE)
+    text = ' '.join(text.split())
+    if text:
+        text = text[0].upper() + text[1:]
+    if text and text[-1] not in '.!?':
+        text += '.'
+    text = re.sub(r'([.!?])\1+', r'\1', text)
+    text = re.sub(r'\s+([.!?,])', r'\1', text)
+    return text.strip()
+
+def legacy_shorten_sentence(sentence):
+    """The previous phrase loops of shorten_sentence (without clause handling)."""
+    for phrase in REDUNDANT_PHRASES:
+        sentence = re.sub(phrase, '', sentence, flags=re.IGNORECASE).strip()
+    for verbose, concise in VERBOSE_REPLACEMENTS.items():
+        sentence = re.sub(verbose, concise, sentence, flags=re.IGNORECASE)
+    for word in UNNECESSARY_WORDS:
+        sentence = re.sub(rf'\b{word}\b', '', sentence, flags=re.IGNORECASE)
+    return ' '.join(sentence.split())
+
+def make_sentences(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        ' '.join(rng.choice(VOCABULARY) for _ in range(rng.randint(6, 30))) + '.'
+        for _ in range(count)
+    ]
+
+DISFLUENT_SENTENCES = [
+    "So, um, our pricing starts at, uh, forty nine dollars per month",
+    "The the professional tier adds, you know, analytics and white label reports",
+    "Customers save customers save forty percent on operational costs",
+    "Okay, so onboarding takes less than a week with the, um, dedicated support team",
+    "I- I think retention is, like, ninety five percent year over year",
+    "Uh, enterprise contracts include single sign on. Hmm",
+]
+
+def make_disfluent_transcript(count, seed=0):
+    rng = random.Random(seed)
+    return '. '.join(rng.choice(DISFLUENT_SENTENCES) for _ in range(count)) + '.'
+
+def best_of(repeat, fn, *args):
+    """Best wall-clock time of several runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sentences', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    sentences = make_sentences(args.sentences)
+    print(f"{len(sentences)} sentences, best of {args.repeat}")
+
+    results = [
+        ("legacy clean_sentence", best_of(args.repeat, lambda: [legacy_clean_sentence(s) for s in sentences])),
+        ("clean_sentence", best_of(args.repeat, lambda: [clean_sentence(s) for s in sentences])),
+        ("clean_sentences (batch)", best_of(args.repeat, clean_sentences, sentences)),
+        ("legacy shorten phrase loops", best_of(args.repeat, lambda: [legacy_shorten_sentence(s) for s in sentences])),
+        ("shorten_sentence", best_of(args.repeat, lambda: [shorten_sentence(s) for s in sentences])),
+    ]
+
+    baseline = results[0][1]
+    for name, seconds in results:
+        print(f"  {name:30s} {seconds * 1000:9.1f} ms  {baseline / seconds:6.1f}x vs legacy clean")
+
+    transcript = make_disfluent_transcript(args.sentences)
+    seconds = best_of(args.repeat, normalize_transcript, transcript)
+    tokens, normalized_tokens = count_tokens(transcript), count_tokens(normalize_transcript(transcript))
+    print(
+        f"  {'normalize_transcript':30s} {seconds * 1000:9.1f} ms  "
+        f"{tokens} -> {normalized_tokens} tokens ({100 * (1 - normalized_tokens / tokens):.1f}% fewer)"
+    )
+
+    mismatches = sum(a != b for a, b in zip(clean_sentences(sentences), map(legacy_clean_sentence, sentences)))
+    print(f"  clean_sentences output differs from legacy on {mismatches} sentences")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Compare local transcription backends on the same machine.
+
+Usage:
+    python scripts/benchmark_transcriber.py FIXTURE_DIR [--size base]
+        [--backends whisper ctranslate2]
+
+Reports model load time, real-time factor (processing seconds per audio
+second, lower is faster) and word error rate for each backend. FIXTURE_DIR
+holds audio files with a reference .txt transcript next to each one.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from pydub import AudioSegment
+from transcriber import get_registry, DEFAULT_MODEL_SIZE
+from utils.metrics import word_error_rate
+from utils.fixtures import load_audio_fixtures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('fixture_dir')
+    parser.add_argument('--size', default=DEFAULT_MODEL_SIZE)
+    parser.add_argument('--backends', nargs='+', default=['whisper', 'ctranslate2'])
+    args = parser.parse_args()
+
+    fixtures = [
+        (audio_path, reference, len(AudioSegment.from_file(audio_path)) / 1000.0)
+        for audio_path, reference in load_audio_fixtures(args.fixture_dir)
+    ]
+    if not fixtures:
+        print("No fixtures found")
+        return
+
+    audio_seconds = sum(duration for _, _, duration in fixtures)
+    print(f"{len(fixtures)} fixtures, {audio_seconds / 60:.1f} min of audio, model size '{args.size}'")
+
+    for backend in args.backends:
+        registry = get_registry(backend)
+
+        started = time.perf_counter()
+        registry.preload([args.size])
+        load_seconds = time.perf_counter() - started
+
+        processing_seconds = 0.0
+        total_wer = 0.0
+        print(f"\n{backend} (loaded in {load_seconds:.1f}s)")
+        for audio_path, reference, duration in fixtures:
+            started = time.perf_counter()
+            result = registry.transcribe(audio_path, args.size)
+            elapsed = time.perf_counter() - started
+            wer = word_error_rate(reference, result['text'])
+
+            processing_seconds += elapsed
+            total_wer += wer
+            print(f"  {os.path.basename(audio_path)}  RTF={elapsed / duration:.3f}  WER={wer:.3f}")
+
+        print(f"  overall  RTF={processing_seconds / audio_seconds:.3f}  "
+              f"mean WER={total_wer / len(fixtures):.3f}")
+
+        # Free the model before loading the next backend
+        registry.evict(args.size)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Rebuild the corpus IDF table from every stored transcript.
+
+Usage:
+    python scripts/build_corpus_idf.py [--mongodb-uri URI] [--database vidpoint]
+
+New transcripts are added incrementally by transcript_store.save_transcript;
+run this once to backfill transcripts stored before that, or to recount
+after transcripts were deleted or replaced. Workers pick up the new table
+within CORPUS_IDF_REFRESH_SECONDS.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from pymongo import MongoClient
+
+from corpus_idf import rebuild_document_frequencies
+from transcript_store import COLLECTION, load_transcript
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def stored_transcripts(db):
+    """Text of every stored transcript."""
+    for document in db[COLLECTION].find({}, {"video_id": 1}):
+        try:
+            transcript = load_transcript(db, video_id=document["video_id"])
+        except Exception as e:
+            logger.warning(f"Skipping transcript of video {document['video_id']}: {str(e)}")
+            continue
+        if transcript and transcript.get("text"):
+            yield transcript["text"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mongodb-uri', default=os.getenv('MONGODB_URI'))
+    parser.add_argument('--database', default='vidpoint')
+    args = parser.parse_args()
+
+    db = MongoClient(args.mongodb_uri)[args.database]
+    started = time.perf_counter()
+    documents, terms = rebuild_document_frequencies(db, stored_transcripts(db))
+    logger.info(f"Counted {terms} terms in {documents} transcripts in {time.perf_counter() - started:.1f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Export the summarization model to ONNX and quantize it to int8.
+
+Usage:
+    python scripts/export_summarizer_onnx.py [--model facebook/bart-large-cnn]
+        [--output models/bart-large-cnn-onnx-int8] [--target avx512_vnni]
+
+Writes the float32 ONNX graphs, their dynamically quantized int8 copies
+(*_quantized.onnx, loaded by the 'onnx' summarization backend) and the
+tokenizer to the output directory. Pick the target instruction set of the
+workers that will run the model: avx512_vnni, avx512, avx2 or arm64.
+Needs optimum[onnxruntime].
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import AutoTokenizer
+
+from summarization import SUMMARIZATION_MODEL, ONNX_MODEL_DIR
+
+# Graphs the export writes; the decoder with past is missing for models
+# exported without cache support
+ONNX_GRAPHS = ["encoder_model.onnx", "decoder_model.onnx", "decoder_with_past_model.onnx"]
+
+def quantization_config(target):
+    """Dynamic (weights-only, activations at runtime) int8 config for an instruction set."""
+    return getattr(AutoQuantizationConfig, target)(is_static=False, per_channel=False)
+
+def directory_megabytes(paths):
+    return sum(os.path.getsize(path) for path in paths if os.path.exists(path)) / 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--model', default=SUMMARIZATION_MODEL)
+    parser.add_argument('--output', default=ONNX_MODEL_DIR)
+    parser.add_argument('--target', default='avx512_vnni', choices=['avx512_vnni', 'avx512', 'avx2', 'arm64'])
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    model = ORTModelForSeq2SeqLM.from_pretrained(args.model, export=True)
+    model.save_pretrained(args.output)
+    AutoTokenizer.from_pretrained(args.model).save_pretrained(args.output)
+    print(f"Exported {args.model} to {args.output} in {time.perf_counter() - started:.0f}s")
+
+    graphs = [name for name in ONNX_GRAPHS if os.path.exists(os.path.join(args.output, name))]
+    config = quantization_config(args.target)
+    for name in graphs:
+        started = time.perf_counter()
+        quantizer = ORTQuantizer.from_pretrained(args.output, file_name=name)
+        quantizer.quantize(save_dir=args.output, quantization_config=config)
+        print(f"  quantized {name} in {time.perf_counter() - started:.0f}s")
+
+    float_paths = [os.path.join(args.output, name) for name in graphs]
+    quantized_paths = [path.replace('.onnx', '_quantized.onnx') for path in float_paths]
+    print(f"float32: {directory_megabytes(float_paths):.0f} MB, int8: {directory_megabytes(quantized_paths):.0f} MB")
+    print(f"Set SUMMARIZATION_BACKEND=onnx SUMMARIZATION_ONNX_DIR={args.output} to use it")
+
+if __name__ == '__main__':
+    main()
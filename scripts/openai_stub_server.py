@@ -0,0 +1,281 @@
+"""Local stand-in for the OpenAI endpoints VidPoint uses.
+
+Implements /v1/chat/completions and /v1/audio/transcriptions with
+configurable latency, injected 429/5xx errors and canned or echo
+responses, so the pipeline can be load-tested and benchmarked offline.
+
+Usage:
+    python scripts/openai_stub_server.py --port 8089 \\
+        --chat-latency lognormal:0.8:0.5 --rate-limit-rate 0.05
+
+Then point the app at it:
+    OPENAI_BASE_URL=http://localhost:8089/v1 OPENAI_API_KEY=stub python process_video.py
+
+Latency specs: fixed:SECONDS, uniform:LOW:HIGH, normal:MEAN:STDDEV or
+lognormal:MEDIAN:SIGMA (all in seconds).
+"""
+import argparse
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+import uuid
+
+from flask import Flask, jsonify, request, Response
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRANSCRIPT = (
+    "Welcome back to the channel. Today we are looking at how small businesses price their services. "
+    "The basic tier starts at forty nine dollars per month and covers most early customers. "
+    "The professional tier adds analytics and white label options for ninety nine dollars. "
+    "Enterprise customers get custom pricing and dedicated support. "
+    "Customers typically see a forty percent reduction in operational costs within three months. "
+    "Retention is the metric that matters most, and ours sits at ninety five percent. "
+    "Onboarding takes less than a week with the documentation and support we provide. "
+    "Thanks for watching, and see you in the next video."
+)
+
+# Roughly 128 kbps mp3
+AUDIO_BYTES_PER_SECOND = 16000
+
+
+class LatencyModel:
+    """Samples response delays from a distribution spec."""
+
+    def __init__(self, spec, rng):
+        self.spec = spec or 'fixed:0'
+        self.rng = rng
+        kind, *params = self.spec.split(':')
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        if kind not in ('fixed', 'uniform', 'normal', 'lognormal'):
+            raise ValueError(f"Unknown latency distribution: {kind}")
+
+    def sample(self):
+        if self.kind == 'fixed':
+            delay = self.params[0]
+        elif self.kind == 'uniform':
+            delay = self.rng.uniform(*self.params)
+        elif self.kind == 'normal':
+            delay = self.rng.gauss(*self.params)
+        else:
+            median, sigma = self.params
+            delay = self.rng.lognormvariate(math.log(median), sigma)
+        return max(0.0, delay)
+
+
+def estimate_tokens(text):
+    """Rough token count for usage reporting."""
+    return max(1, len(text) // 4)
+
+
+def sentences_of(text):
+    """Split prompt text into sentences for synthetic answers."""
+    return [s.strip() for s in re.split(r'(?<=[.!?])\s+', ' '.join(text.split())) if len(s.split()) > 3]
+
+
+class StubBehaviour:
+    """Response, latency and error-injection settings shared by all requests."""
+
+    def __init__(self, args):
+        self.rng = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.mode = args.mode
+        self.chat_latency = LatencyModel(args.chat_latency, self.rng)
+        self.audio_latency = LatencyModel(args.audio_latency, self.rng)
+        self.audio_realtime_factor = args.audio_rtf
+        self.rate_limit_rate = args.rate_limit_rate
+        self.server_error_rate = args.server_error_rate
+        self.retry_after = args.retry_after
+        self.canned = {}
+        if args.canned:
+            with open(args.canned, encoding='utf-8') as f:
+                self.canned = json.load(f)
+        self.transcript = DEFAULT_TRANSCRIPT
+        if args.transcript:
+            with open(args.transcript, encoding='utf-8') as f:
+                self.transcript = ' '.join(f.read().split())
+
+    def random(self):
+        with self.lock:
+            return self.rng.random()
+
+    def sleep(self, latency_model, extra=0.0):
+        with self.lock:
+            delay = latency_model.sample()
+        time.sleep(delay + extra)
+
+    def injected_error(self):
+        """Return an error response to inject, or None."""
+        roll = self.random()
+        if roll < self.rate_limit_rate:
+            response = jsonify({"error": {
+                "message": "Rate limit reached (stub server)",
+                "type": "requests",
+                "code": "rate_limit_exceeded"
+            }})
+            response.status_code = 429
+            response.headers['Retry-After'] = str(self.retry_after)
+            return response
+        if roll < self.rate_limit_rate + self.server_error_rate:
+            status = 500 if self.random() < 0.5 else 503
+            response = jsonify({"error": {
+                "message": "The server had an error while processing your request (stub server)",
+                "type": "server_error",
+                "code": None
+            }})
+            response.status_code = status
+            return response
+        return None
+
+
+def chat_answer(behaviour, body):
+    """Build the assistant message for a chat completion request."""
+    messages = body.get('messages', [])
+    prompt = messages[-1]['content'] if messages else ''
+    max_tokens = body.get('max_tokens') or 256
+    wants_json = (body.get('response_format') or {}).get('type') == 'json_object'
+
+    for needle, answer in behaviour.canned.items():
+        if needle in prompt:
+            return answer if isinstance(answer, str) else json.dumps(answer)
+
+    if behaviour.mode == 'echo':
+        return prompt[:max_tokens * 4]
+
+    # Prompts put the instruction first and the material after a blank line
+    material = prompt.split('\n\n', 1)[-1]
+    sentences = sentences_of(material) or ["The speaker covers the main topic of the video."]
+    points = sentences[-6:]
+    if wants_json:
+        return json.dumps({
+            "key_points": points,
+            "summary": ' '.join(sentences[:3]),
+            "titles": {
+                "transcript": "Video Transcript",
+                "key_points": "Key Points",
+                "summary": "Video Summary"
+            }
+        })
+    if 'title' in prompt.lower():
+        return ' '.join(points[0].split()[:6]).rstrip('.,')
+    if 'summar' in prompt.lower():
+        return ' '.join(sentences[:3])[:max_tokens * 4]
+    return '\n'.join(f"- {point}" for point in points)[:max_tokens * 4]
+
+
+def create_app(behaviour):
+    """Create the stub Flask app."""
+    app = Flask(__name__)
+
+    @app.route('/v1/chat/completions', methods=['POST'])
+    def chat_completions():
+        error = behaviour.injected_error()
+        behaviour.sleep(behaviour.chat_latency)
+        if error is not None:
+            return error
+
+        body = request.get_json(force=True)
+        content = chat_answer(behaviour, body)
+        prompt_text = ' '.join(m.get('content') or '' for m in body.get('messages', []))
+        prompt_tokens = estimate_tokens(prompt_text)
+        completion_tokens = estimate_tokens(content)
+        return jsonify({
+            "id": f"chatcmpl-stub-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get('model', 'gpt-3.5-turbo'),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+    @app.route('/v1/audio/transcriptions', methods=['POST'])
+    def audio_transcriptions():
+        upload = request.files.get('file')
+        size = len(upload.read()) if upload else 0
+        duration = max(1.0, size / AUDIO_BYTES_PER_SECOND)
+
+        error = behaviour.injected_error()
+        behaviour.sleep(behaviour.audio_latency, extra=duration * behaviour.audio_realtime_factor)
+        if error is not None:
+            return error
+
+        # Repeat the canned transcript at ~2.5 words per second of audio
+        words = behaviour.transcript.split()
+        word_count = max(1, int(duration * 2.5))
+        text_words = (words * (word_count // len(words) + 1))[:word_count]
+        text = ' '.join(text_words)
+
+        response_format = request.form.get('response_format', 'json')
+        if response_format == 'text':
+            return Response(text + '\n', mimetype='text/plain')
+        if response_format != 'verbose_json':
+            return jsonify({"text": text})
+
+        segments = []
+        per_segment = 12
+        for i in range(0, len(text_words), per_segment):
+            start = i / 2.5
+            segments.append({
+                "id": len(segments),
+                "start": round(start, 2),
+                "end": round(min(duration, (i + per_segment) / 2.5), 2),
+                "text": ' ' + ' '.join(text_words[i:i + per_segment])
+            })
+        return jsonify({
+            "task": "transcribe",
+            "language": "english",
+            "duration": round(duration, 2),
+            "text": text,
+            "segments": segments
+        })
+
+    @app.route('/v1/models', methods=['GET'])
+    def models():
+        return jsonify({"object": "list", "data": [
+            {"id": "gpt-3.5-turbo", "object": "model", "owned_by": "stub"},
+            {"id": "whisper-1", "object": "model", "owned_by": "stub"}
+        ]})
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--mode', choices=['synthetic', 'echo'], default='synthetic',
+                        help="synthetic builds answers from the prompt, echo returns it")
+    parser.add_argument('--canned', help="JSON file mapping prompt substrings to responses")
+    parser.add_argument('--transcript', help="Text file used for transcription responses")
+    parser.add_argument('--chat-latency', default='fixed:0')
+    parser.add_argument('--audio-latency', default='fixed:0')
+    parser.add_argument('--audio-rtf', type=float, default=0.0,
+                        help="Extra transcription delay per second of uploaded audio")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="Fraction of 429 responses")
+    parser.add_argument('--server-error-rate', type=float, default=0.0, help="Fraction of 500/503 responses")
+    parser.add_argument('--retry-after', type=float, default=1.0, help="Retry-After seconds on 429")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    app = create_app(StubBehaviour(args))
+    logger.info(f"OpenAI stub listening on http://{args.host}:{args.port}/v1")
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+import bisect
+import re
+from collections import namedtuple
+
+Sentence = namedtuple('Sentence', ['text', 'start', 'end'])
+
+# Abbreviations that never end a sentence ("Dr. Smith", "vs. them")
+TITLE_ABBREVIATIONS = {
+    'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'mt', 'rev', 'gen', 'col', 'capt', 'lt', 'sgt',
+    'vs', 'e.g', 'i.e', 'cf', 'approx', 'dept', 'fig', 'ft', 'vol', 'pp', 'ca',
+    'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec',
+}
+
+# Abbreviations that end a sentence only when a capitalized word follows
+# ("... at 5 p.m. Then" vs "5 p.m. on Monday", "No. 5" vs "No. We")
+SENTENCE_FINAL_ABBREVIATIONS = {
+    'etc', 'inc', 'ltd', 'co', 'corp', 'llc', 'no', 'a.m', 'p.m', 'u.s', 'u.k', 'ph.d',
+}
+
+# Capitalized words that start sentences far more often than they are
+# surnames: a capital letter and period before them ("Plan B. Then") ends
+# the sentence instead of being an initial
+SENTENCE_STARTERS = {
+    'i', 'it', 'its', 'we', 'you', 'he', 'she', 'they', 'me', 'us', 'my', 'our', 'your', 'his', 'her', 'their',
+    'this', 'that', 'these', 'those', 'there', 'here', 'the', 'a', 'an', 'some', 'all', 'one', 'each',
+    'then', 'now', 'so', 'and', 'but', 'or', 'also', 'however', 'next', 'first', 'finally', 'well', 'yes', 'no',
+    'if', 'when', 'what', 'why', 'how', 'where', 'who', 'which', 'while', 'because', 'since', 'after', 'before',
+    'in', 'on', 'at', 'for', 'to', 'of', 'with', 'as', 'by', 'from', 'let', 'do', 'is', 'are', 'was', 'were',
+    'not', 'just', 'maybe', 'okay', 'ok', 'thanks', 'thank',
+}
+
+# Sentence-ending punctuation (with closing quotes or brackets) and the
+# whitespace after it, or a paragraph break. Decimals like 3.5 and versions
+# like 2.0.1 never match because no whitespace follows the period.
+_BOUNDARY_RE = re.compile(r'([.!?…]+[\'")\]’”]*)(?:\s+|$)|\n\s*\n\s*')
+_NON_SPACE_RE = re.compile(r'\S')
+# "U.S", "e.g", "Ph.D" before the final period
+_DOTTED_ACRONYM_RE = re.compile(r'^(?:[A-Za-z]{1,2}\.)+[A-Za-z]{1,2}$')
+# The word after a candidate boundary, and an initial such as "K."
+_NEXT_WORD_RE = re.compile(r'\S{1,40}')
+_INITIAL_RE = re.compile(r'^[A-Z]\.$')
+
+_OPENING_QUOTES = '"\'‘“'
+
+# Characters inspected before a period to find the preceding word
+_LOOKBEHIND_CHARS = 12
+
+
+def _precedes_name(text, position, end):
+    """Whether the word at position looks like the rest of a name: an initial or a surname."""
+    following = _NEXT_WORD_RE.match(text, position, end)
+    if not following:
+        return False
+    word = following.group()
+    if _INITIAL_RE.match(word):
+        return True
+    word = word.strip(_OPENING_QUOTES + '.,;:!?\'")]’”')
+    return word[:1].isupper() and word.lower() not in SENTENCE_STARTERS
+
+
+def _is_boundary(text, match, end):
+    """Whether a candidate boundary really ends a sentence."""
+    punctuation = match.group(1)
+    if punctuation is None or '!' in punctuation or '?' in punctuation:
+        return True
+
+    following = text[match.end()] if match.end() < end else ''
+    starts_sentence = not following or following.isupper() or following in _OPENING_QUOTES
+
+    # An ellipsis continues the sentence unless a new one visibly starts
+    if punctuation.startswith('..') or punctuation[0] == '…':
+        return starts_sentence
+
+    # The word before the period, read without scanning far back
+    window = text[max(0, match.start() - _LOOKBEHIND_CHARS):match.start()].split()
+    if not window:
+        return True
+    word = window[-1].lstrip('(' + _OPENING_QUOTES)
+
+    # Initials ("J. K. Rowling"), but not the pronoun ("Neither did I.") or a
+    # letter ending a sentence ("Plan B. Then", "vitamin C. It")
+    if len(word) == 1:
+        if not word.isupper() or word == 'I':
+            return True
+        if not starts_sentence:
+            return False
+        return not _precedes_name(text, match.end(), end)
+    lowered = word.lower()
+    if lowered in TITLE_ABBREVIATIONS:
+        return False
+    if lowered in SENTENCE_FINAL_ABBREVIATIONS or ('.' in word and _DOTTED_ACRONYM_RE.match(word)):
+        return starts_sentence
+    return True
+
+
+def iter_sentence_spans(text, start=0, end=None):
+    """
+    Yield (start, end) character offsets of the sentences in text[start:end].
+
+    Spans exclude surrounding whitespace and include the closing
+    punctuation. The text is scanned in place, never copied, so this is
+    safe on very long transcripts.
+    """
+    end = len(text) if end is None else end
+    first = _NON_SPACE_RE.search(text, start, end)
+    if not first:
+        return
+    position = first.start()
+
+    for match in _BOUNDARY_RE.finditer(text, position, end):
+        if not _is_boundary(text, match, end):
+            continue
+        if match.group(1):
+            sentence_end = match.end(1)
+        else:
+            sentence_end = match.start()
+            while sentence_end > position and text[sentence_end - 1].isspace():
+                sentence_end -= 1
+        if sentence_end > position:
+            yield position, sentence_end
+        position = match.end()
+
+    if position < end:
+        last = end
+        while text[last - 1].isspace():
+            last -= 1
+        yield position, last
+
+
+def iter_sentences(text, start=0, end=None):
+    """Yield Sentence(text, start, end) tuples for the sentences of a text."""
+    for sentence_start, sentence_end in iter_sentence_spans(text, start, end):
+        yield Sentence(text[sentence_start:sentence_end], sentence_start, sentence_end)
+
+
+def split_sentences(text):
+    """List of the sentences of a text."""
+    return [text[start:end] for start, end in iter_sentence_spans(text)]
+
+
+def sentence_timestamps(text, segments):
+    """
+    Map each sentence of a transcript to its start and end time.
+
+    Segments are Whisper segments (start, end, text) whose texts appear in
+    order in the transcript. A sentence starts at the start of the segment
+    its first character falls in and ends at the end of the segment of its
+    last character.
+
+    Returns:
+        list: (Sentence, start seconds, end seconds) tuples; times are None
+        when no segment covers the sentence.
+    """
+    offsets, spans = [], []
+    cursor = 0
+    for segment in segments:
+        segment_text = (segment.get('text') or '').strip()
+        found = text.find(segment_text, cursor) if segment_text else -1
+        if found < 0:
+            continue
+        offsets.append(found)
+        spans.append((found + len(segment_text), segment.get('start'), segment.get('end')))
+        cursor = found + len(segment_text)
+
+    def segment_at(position):
+        index = bisect.bisect_right(offsets, position) - 1
+        return spans[index] if index >= 0 else None
+
+    timestamps = []
+    for sentence in iter_sentences(text):
+        first, last = segment_at(sentence.start), segment_at(sentence.end - 1)
+        timestamps.append((sentence, first[1] if first else None, last[2] if last else None))
+    return timestamps
@@ -1,7 +1,7 @@
 import nltk
 
-# Download required NLTK data
-nltk.download('punkt')
+# Download required NLTK data. Sentence splitting doesn't need punkt:
+# it uses sentence_segmenter.
 nltk.download('averaged_perceptron_tagger')
 nltk.download('maxent_ne_chunker')
 nltk.download('words')
@@ -1,15 +1,299 @@
-from transformers import pipeline
+import logging
+import math
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
 
-def summarize_text(transcript):
+from sentence_segmenter import split_sentences
+
+logger = logging.getLogger(__name__)
+
+SUMMARIZATION_MODEL = os.getenv('SUMMARIZATION_MODEL', 'facebook/bart-large-cnn')
+# -1 runs on CPU, otherwise the CUDA device index
+SUMMARIZATION_DEVICE = int(os.getenv('SUMMARIZATION_DEVICE', '-1'))
+
+# 'pytorch' (transformers, float32) or 'onnx' (ONNX Runtime, int8 model
+# written by scripts/export_summarizer_onnx.py)
+DEFAULT_BACKEND = os.getenv('SUMMARIZATION_BACKEND', 'pytorch')
+ONNX_MODEL_DIR = os.getenv('SUMMARIZATION_ONNX_DIR', 'models/bart-large-cnn-onnx-int8')
+
+# ONNX Runtime session options
+ORT_INTRA_OP_THREADS = int(os.getenv('ORT_INTRA_OP_THREADS', '0'))  # 0 lets ONNX Runtime decide
+ORT_INTER_OP_THREADS = int(os.getenv('ORT_INTER_OP_THREADS', '0'))
+ORT_EXECUTION_MODE = os.getenv('ORT_EXECUTION_MODE', 'sequential')  # or 'parallel'
+ORT_GRAPH_OPTIMIZATION = os.getenv('ORT_GRAPH_OPTIMIZATION', 'all')  # 'disabled', 'basic', 'extended' or 'all'
+
+# Quantized model files written by the export script
+ONNX_ENCODER_FILE = "encoder_model_quantized.onnx"
+ONNX_DECODER_FILE = "decoder_model_quantized.onnx"
+ONNX_DECODER_WITH_PAST_FILE = "decoder_with_past_model_quantized.onnx"
+
+# Input tokens per window. BART reads at most 1024 tokens; the rest is
+# headroom for special tokens and sentences that don't split evenly.
+WINDOW_TOKENS = int(os.getenv('SUMMARIZATION_WINDOW_TOKENS', '900'))
+
+# Requests arriving within this many milliseconds of the first one in a
+# batch share its forward pass, up to MAX_BATCH_SIZE windows
+BATCH_WAIT_MS = float(os.getenv('SUMMARIZATION_BATCH_WAIT_MS', '20'))
+MAX_BATCH_SIZE = int(os.getenv('SUMMARIZATION_MAX_BATCH_SIZE', '8'))
+
+def ort_session_options(intra_op_threads=ORT_INTRA_OP_THREADS, inter_op_threads=ORT_INTER_OP_THREADS,
+                        execution_mode=ORT_EXECUTION_MODE, graph_optimization=ORT_GRAPH_OPTIMIZATION):
+    """ONNX Runtime session options from the ORT_* settings."""
+    import onnxruntime
+
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = intra_op_threads
+    options.inter_op_num_threads = inter_op_threads
+    options.execution_mode = {
+        'sequential': onnxruntime.ExecutionMode.ORT_SEQUENTIAL,
+        'parallel': onnxruntime.ExecutionMode.ORT_PARALLEL
+    }[execution_mode]
+    options.graph_optimization_level = {
+        'disabled': onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL,
+        'basic': onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+        'extended': onnxruntime.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+        'all': onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    }[graph_optimization]
+    return options
+
+def _load_pytorch_pipeline(model=SUMMARIZATION_MODEL, device=SUMMARIZATION_DEVICE):
+    """Load a HuggingFace summarization pipeline."""
+    from transformers import pipeline
+    return pipeline("summarization", model=model, device=device)
+
+def _load_onnx_pipeline(model_dir=ONNX_MODEL_DIR):
+    """Load the quantized ONNX model behind a HuggingFace summarization pipeline."""
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    from transformers import AutoTokenizer, pipeline
+
+    if not os.path.exists(os.path.join(model_dir, ONNX_ENCODER_FILE)):
+        raise FileNotFoundError(
+            f"No quantized ONNX model in {model_dir}; run scripts/export_summarizer_onnx.py first"
+        )
+    # Without the decoder-with-past graph every step re-reads the whole prefix
+    use_cache = os.path.exists(os.path.join(model_dir, ONNX_DECODER_WITH_PAST_FILE))
+    model = ORTModelForSeq2SeqLM.from_pretrained(
+        model_dir,
+        encoder_file_name=ONNX_ENCODER_FILE,
+        decoder_file_name=ONNX_DECODER_FILE,
+        decoder_with_past_file_name=ONNX_DECODER_WITH_PAST_FILE if use_cache else None,
+        use_cache=use_cache,
+        provider="CPUExecutionProvider",
+        session_options=ort_session_options()
+    )
+    return pipeline("summarization", model=model, tokenizer=AutoTokenizer.from_pretrained(model_dir))
+
+_loaders = {
+    'pytorch': _load_pytorch_pipeline,
+    'onnx': _load_onnx_pipeline
+}
+_pipelines = {}
+_pipeline_lock = threading.Lock()
+
+def get_summarizer(backend=None):
+    """The summarization pipeline of a backend in this worker process, loaded on first use."""
+    backend = backend or DEFAULT_BACKEND
+    if backend not in _loaders:
+        raise ValueError(f"Unknown summarization backend: {backend}")
+    with _pipeline_lock:
+        if backend not in _pipelines:
+            logger.info(f"Loading summarization model '{SUMMARIZATION_MODEL}' ({backend})")
+            started = time.perf_counter()
+            _pipelines[backend] = _loaders[backend]()
+            logger.info(f"Loaded summarization model in {time.perf_counter() - started:.1f}s")
+        return _pipelines[backend]
+
+def preload_summarizer(backend=None):
+    """Load the summarization model ahead of the first job, e.g. at worker start."""
+    get_summarizer(backend)
+
+def _load_tokenizer(backend):
+    """A tokenizer of the backend's model, separate from the pipeline's."""
+    from transformers import AutoTokenizer
+    return AutoTokenizer.from_pretrained(ONNX_MODEL_DIR if backend == 'onnx' else SUMMARIZATION_MODEL)
+
+# The pipeline's tokenizer belongs to the batcher's worker thread: a fast
+# tokenizer used from two threads at once raises "Already borrowed".
+# Callers count tokens with their own copy, one thread at a time.
+_tokenizers = {}
+_tokenizer_lock = threading.Lock()
+
+def token_lengths(texts, backend=None):
+    """Number of model tokens of each text, without special tokens."""
+    backend = backend or DEFAULT_BACKEND
+    if backend not in _loaders:
+        raise ValueError(f"Unknown summarization backend: {backend}")
+    with _tokenizer_lock:
+        if backend not in _tokenizers:
+            _tokenizers[backend] = _load_tokenizer(backend)
+        encoded = _tokenizers[backend](texts, add_special_tokens=False)
+    return [len(ids) for ids in encoded['input_ids']]
+
+def split_token_windows(text, count_tokens=None, max_tokens=WINDOW_TOKENS):
+    """
+    Split a text into windows of at most about max_tokens tokens.
+
+    Windows end at sentence boundaries. A sentence longer than a window is
+    cut into even word pieces.
+
+    Args:
+        text (str): Text to split.
+        count_tokens: Function mapping a list of texts to their token
+            counts; defaults to the summarization model's tokenizer.
+        max_tokens (int): Token budget of a window.
+
+    Returns:
+        list: Window texts.
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return []
+    count_tokens = count_tokens or token_lengths
+
+    windows, current, current_tokens = [], [], 0
+    for sentence, tokens in zip(sentences, count_tokens(sentences)):
+        if tokens > max_tokens:
+            words = sentence.split()
+            pieces = math.ceil(tokens / max_tokens)
+            size = math.ceil(len(words) / pieces)
+            parts = [(' '.join(words[i:i + size]), max_tokens) for i in range(0, len(words), size)]
+        else:
+            parts = [(sentence, tokens)]
+
+        for part, part_tokens in parts:
+            if current and current_tokens + part_tokens > max_tokens:
+                windows.append(' '.join(current))
+                current, current_tokens = [], 0
+            current.append(part)
+            current_tokens += part_tokens
+
+    if current:
+        windows.append(' '.join(current))
+    return windows
+
+def _run_pipeline(texts, max_length, min_length, backend=None):
+    """Summarize texts in one batched forward pass."""
+    outputs = get_summarizer(backend)(
+        texts,
+        max_length=max_length,
+        min_length=min_length,
+        do_sample=False,
+        truncation=True,
+        batch_size=len(texts)
+    )
+    return [output['summary_text'] for output in outputs]
+
+class SummarizationBatcher:
+    """Micro-batches summarization requests from concurrent jobs.
+
+    A single worker thread owns the model. It takes the first queued
+    window, waits up to wait_ms for more, and summarizes everything it
+    collected with the same backend and generation settings in one
+    forward pass.
+    """
+
+    def __init__(self, summarize=None, max_batch_size=MAX_BATCH_SIZE, wait_ms=BATCH_WAIT_MS):
+        self.summarize = summarize or _run_pipeline
+        self.max_batch_size = max_batch_size
+        self.wait_seconds = wait_ms / 1000.0
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.worker = None
+        self.batches = 0
+
+    def _start_worker(self):
+        with self.lock:
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._work, name="summarization-batcher", daemon=True)
+                self.worker.start()
+
+    def _collect(self):
+        """The next batch: one blocking get, then whatever arrives before the deadline."""
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _work(self):
+        while True:
+            batch = self._collect()
+            groups = {}
+            for text, settings, future in batch:
+                if future.set_running_or_notify_cancel():
+                    groups.setdefault(settings, []).append((text, future))
+
+            for (max_length, min_length, backend), items in groups.items():
+                try:
+                    summaries = self.summarize([text for text, _ in items], max_length, min_length, backend)
+                    self.batches += 1
+                    for (_, future), summary in zip(items, summaries):
+                        future.set_result(summary)
+                except Exception as e:
+                    for _, future in items:
+                        future.set_exception(e)
+
+    def submit(self, text, max_length=130, min_length=30, backend=None):
+        """
+        Queue one text for summarization.
+
+        Returns:
+            Future: Resolves to the summary text.
+        """
+        if self.worker is None:
+            self._start_worker()
+        future = Future()
+        self.queue.put((text, (max_length, min_length, backend or DEFAULT_BACKEND), future))
+        return future
+
+    def summarize_all(self, texts, max_length=130, min_length=30, backend=None):
+        """Summaries of several texts, batched with any other queued requests."""
+        futures = [self.submit(text, max_length, min_length, backend) for text in texts]
+        return [future.result() for future in futures]
+
+# Shared by every job in this worker process
+batcher = SummarizationBatcher()
+
+def summarize_text(transcript, max_length=130, min_length=30, backend=None):
     """
     Summarizes the transcription using Hugging Face's transformers.
 
+    Transcripts longer than one model window are split into windows that
+    are summarized together; the joined window summaries are summarized
+    again until they fit one window.
+
     Args:
         transcript (str): The full transcription text.
+        max_length (int): Maximum summary length in tokens.
+        min_length (int): Minimum summary length in tokens.
+        backend (str): 'pytorch' or 'onnx'; defaults to SUMMARIZATION_BACKEND.
 
     Returns:
         str: Summary text.
     """
-    summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
-    summary = summarizer(transcript, max_length=130, min_length=30, do_sample=False)
-    return summary[0]['summary_text']
+    def count_tokens(texts):
+        return token_lengths(texts, backend)
+
+    windows = split_token_windows(transcript, count_tokens)
+    if not windows:
+        return ""
+
+    while len(windows) > 1:
+        logger.info(f"Summarizing {len(windows)} windows")
+        partials = batcher.summarize_all(windows, max_length, min_length, backend)
+        reduced = split_token_windows(' '.join(partials), count_tokens)
+        if len(reduced) >= len(windows):
+            # Summaries as long as the windows never converge; the model truncates the rest
+            logger.warning(f"Window summaries don't shrink with max_length={max_length}, truncating")
+            windows = [' '.join(partials)]
+            break
+        windows = reduced
+
+    return batcher.summarize_all(windows, max_length, min_length, backend)[0]
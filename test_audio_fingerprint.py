@@ -0,0 +1,69 @@
+import numpy as np
+from bson.binary import Binary
+
+import audio_fingerprint
+from audio_fingerprint import (
+    SAMPLE_RATE, MAX_BIT_ERROR_RATE, fingerprint_samples, match_fingerprints, find_matching_transcript
+)
+
+def _test_signal(seconds=60, seed=0):
+    """Generate a frequency-modulated tone with background noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(SAMPLE_RATE * seconds) / SAMPLE_RATE
+    tone = np.sin(2 * np.pi * 440 * t * (1 + 0.3 * np.sin(t)))
+    return (tone + rng.normal(0, 0.3, len(t))).astype(np.float32)
+
+def test_reupload_matches():
+    """A shifted, re-encoded copy of the same audio should match."""
+    original = _test_signal()
+    rng = np.random.default_rng(1)
+    reupload = original[1000:] + rng.normal(0, 0.05, len(original) - 1000).astype(np.float32)
+
+    ber, offset = match_fingerprints(fingerprint_samples(reupload), fingerprint_samples(original))
+    assert ber <= MAX_BIT_ERROR_RATE
+    assert offset == 4  # 1000 samples is roughly four hops
+
+def test_different_audio_does_not_match():
+    """Unrelated audio should not match."""
+    original = fingerprint_samples(_test_signal())
+    other = fingerprint_samples(np.random.default_rng(2).normal(0, 0.3, SAMPLE_RATE * 60).astype(np.float32))
+
+    ber, _ = match_fingerprints(other, original)
+    assert ber > MAX_BIT_ERROR_RATE
+
+def test_short_audio_has_no_fingerprint():
+    """Audio shorter than one frame produces an empty fingerprint."""
+    assert len(fingerprint_samples(np.zeros(100, dtype=np.float32))) == 0
+
+class FakeFingerprints:
+    """Returns every stored document as an aggregation candidate."""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def aggregate(self, pipeline):
+        return iter(self.documents)
+
+def test_shared_intro_with_different_length_does_not_match():
+    """Only the opening minutes are fingerprinted; the full lengths must agree too."""
+    intro = fingerprint_samples(_test_signal())
+    stored = {
+        "video_id": "v1", "transcript_hash": "abc",
+        "hashes": Binary(intro.astype("<u4").tobytes()), "duration": 600.0
+    }
+    db = {audio_fingerprint.COLLECTION: FakeFingerprints([stored])}
+
+    assert find_matching_transcript(db, intro, 600.5)["video_id"] == "v1"
+    # Same opening, but a trimmed or extended cut
+    assert find_matching_transcript(db, intro, 900.0) is None
+    assert find_matching_transcript(db, intro, 480.0) is None
+    # Fingerprints stored without a duration are never reused
+    db[audio_fingerprint.COLLECTION] = FakeFingerprints([dict(stored, duration=None)])
+    assert find_matching_transcript(db, intro, 600.0) is None
+
+if __name__ == "__main__":
+    test_reupload_matches()
+    test_different_audio_does_not_match()
+    test_short_audio_has_no_fingerprint()
+    test_shared_intro_with_different_length_does_not_match()
+    print("Fingerprint tests passed")
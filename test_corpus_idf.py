@@ -0,0 +1,68 @@
+from collections import Counter
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+import corpus_idf
+from corpus_idf import CorpusIDF, analyze, tfidf_matrix
+
+CORPUS = [
+    "Our pricing starts at forty nine dollars per month",
+    "Customers praise the support team and the pricing",
+    "The support team answers within one business day",
+    "Invoices sync with every major accounting tool",
+]
+
+class FakeCollection:
+    """The find/find_one subset of a pymongo collection used by CorpusIDF.load."""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def find_one(self, query):
+        return next((d for d in self.documents if d["_id"] == query["_id"]), None)
+
+    def find(self, query, projection=None):
+        return [d for d in self.documents if d["df"] >= query["df"]["$gte"]]
+
+def fake_db(texts):
+    counts = Counter(term for text in texts for term in set(analyze(text)))
+    return {
+        corpus_idf.TERMS_COLLECTION: FakeCollection([{"_id": t, "df": df} for t, df in counts.items()]),
+        corpus_idf.STATS_COLLECTION: FakeCollection([{"_id": corpus_idf.STATS_ID, "documents": len(texts)}]),
+    }
+
+def test_idf_matches_fitted_vectorizer():
+    """Corpus IDF equals the IDF TfidfVectorizer fits on the same documents."""
+    vectorizer = TfidfVectorizer(stop_words='english').fit(CORPUS)
+    corpus = CorpusIDF.load(fake_db(CORPUS), min_df=1)
+    assert np.allclose(corpus.idf(vectorizer.get_feature_names_out()), vectorizer.idf_)
+
+def test_unseen_terms_get_highest_idf():
+    """Terms missing from the table weigh as much as the rarest terms."""
+    corpus = CorpusIDF.load(fake_db(CORPUS), min_df=2)
+    unseen, common = corpus.idf(["onboarding", "pricing"])
+    assert unseen > common
+
+def test_tfidf_matrix_uses_configured_corpus():
+    """Once configured, sentences are weighted by corpus IDF, not their own."""
+    sentences = ["The pricing is simple", "Onboarding takes one week"]
+    original_min = corpus_idf.MIN_DOCUMENTS
+    corpus_idf.MIN_DOCUMENTS = 1
+    corpus_idf.configure(fake_db(CORPUS))
+    try:
+        corpus = corpus_idf.get_corpus_idf()
+        assert corpus is not None and corpus.documents == len(CORPUS)
+        matrix = tfidf_matrix(sentences)
+        assert matrix.shape[0] == 2
+        assert np.allclose(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel(), 1)
+    finally:
+        corpus_idf.configure(None)
+        corpus_idf.MIN_DOCUMENTS = original_min
+    assert corpus_idf.get_corpus_idf() is None
+
+if __name__ == "__main__":
+    test_idf_matches_fitted_vectorizer()
+    test_unseen_terms_get_highest_idf()
+    test_tfidf_matrix_uses_configured_corpus()
+    print("Corpus IDF tests passed")
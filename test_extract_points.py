@@ -0,0 +1,39 @@
+import numpy as np
+
+from extract_points import extract_key_points, top_k_indices
+
+TRANSCRIPT = (
+    "Our platform helps small businesses automate invoicing. "
+    "The weather was nice today. "
+    "Pricing starts at forty nine dollars per month for the basic tier. "
+    "We had lunch. "
+    "Enterprise customers get dedicated support and custom integrations. "
+    "Retention across all tiers is ninety five percent."
+)
+
+def test_top_k_indices_returns_transcript_order():
+    """The highest scores are selected and returned in ascending index order."""
+    scores = np.array([0.1, 0.9, 0.3, 0.8, 0.2, 0.7])
+    assert top_k_indices(scores, 3).tolist() == [1, 3, 5]
+    assert top_k_indices(scores, 10).tolist() == list(range(6))
+
+def test_top_k_indices_breaks_ties_by_position():
+    """Ties at the cut-off go to the earliest sentences, like a stable sort."""
+    scores = np.array([0.5, 0.9, 0.5, 0.5, 0.1])
+    assert top_k_indices(scores, 3).tolist() == [0, 1, 2]
+    stable = sorted(np.argsort(-scores, kind='stable')[:3].tolist())
+    assert top_k_indices(scores, 3).tolist() == stable
+
+def test_extract_key_points_keeps_original_order():
+    """Selected points appear in the order they were said."""
+    points = extract_key_points(TRANSCRIPT, num_points=3)
+    assert len(points) == 3
+    sentences = [s.strip() for s in TRANSCRIPT.split('.') if s.strip()]
+    positions = [sentences.index(point) for point in points]
+    assert positions == sorted(positions)
+
+if __name__ == "__main__":
+    test_top_k_indices_returns_transcript_order()
+    test_top_k_indices_breaks_ties_by_position()
+    test_extract_key_points_keeps_original_order()
+    print("Key point scoring tests passed")
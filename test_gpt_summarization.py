@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import gpt_summarization
+import transcript_store
+from config import SUMMARY_CONFIG
+
+class FakeRouter:
+    """routed_chat_completion stand-in answering by task and counting calls."""
+
+    def __init__(self, combined_finish_reason="stop"):
+        self.tasks = []
+        self.params = {}
+        self.combined_finish_reason = combined_finish_reason
+        self.lock = threading.Lock()
+
+    def __call__(self, task, call_site, messages, **params):
+        with self.lock:
+            self.tasks.append(task)
+            self.params[call_site] = params
+        finish_reason = "stop"
+        if task == "section_summary":
+            content = "Section about " + messages[-1]["content"].split()[3].rstrip(':')
+        elif task == "summary" and params.get("response_format"):
+            content = json.dumps({"title": "Pricing And Growth", "summary": "The talk covers pricing and growth."})
+            finish_reason = self.combined_finish_reason
+            if finish_reason == "length":
+                content = content[:40]
+        else:
+            content = "Plain answer"
+        return SimpleNamespace(choices=[
+            SimpleNamespace(message=SimpleNamespace(content=content), finish_reason=finish_reason)
+        ])
+
+class FakeTranscripts:
+    """The find_one/update_one subset of the transcripts collection."""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def _match(self, query):
+        return next((d for d in self.documents if all(d.get(k) == v for k, v in query.items())), None)
+
+    def find_one(self, query, projection=None):
+        return self._match(query)
+
+    def update_one(self, query, update):
+        document = self._match(query)
+        if document:
+            document.update(update["$set"])
+        return SimpleNamespace(matched_count=1 if document else 0)
+
+TRANSCRIPT = " ".join(f"Point {i} covers pricing, onboarding and growth for the team." for i in range(400))
+
+def run(router, **kwargs):
+    previous = gpt_summarization.routed_chat_completion, SUMMARY_CONFIG['section_tokens']
+    gpt_summarization.routed_chat_completion = router
+    SUMMARY_CONFIG['section_tokens'] = 1000
+    try:
+        return gpt_summarization.generate_summary(TRANSCRIPT, **kwargs)
+    finally:
+        gpt_summarization.routed_chat_completion, SUMMARY_CONFIG['section_tokens'] = previous
+
+def test_long_transcripts_are_summarized_hierarchically():
+    router = FakeRouter()
+    result = run(router)
+    sections = router.tasks.count("section_summary")
+    assert sections > 1 and len(result["sections"]) == sections
+    # The title comes from the final call, not a separate title call
+    assert router.tasks[-1] == "summary" and "title" not in router.tasks
+    assert result["title"] == "Pricing And Growth"
+    assert result["content"] == "The talk covers pricing and growth."
+    # The combined answer is never cut below the summary plus its title
+    assert router.params["summary_combine"]["min_tokens"] == 300 + gpt_summarization.TITLE_TOKENS
+
+def test_truncated_combined_summary_falls_back_to_flat():
+    router = FakeRouter(combined_finish_reason="length")
+    result = run(router)
+    assert router.tasks[-2:] == ["summary", "title"]
+    assert result == {"title": "Plain answer", "content": "Plain answer"}
+
+def test_stored_section_summaries_are_reused():
+    # The summarized text is normalized, so it doesn't hash like the stored transcript
+    db = {transcript_store.COLLECTION: FakeTranscripts([
+        {"video_id": "v1", "content_hash": transcript_store.content_hash("Um, " + TRANSCRIPT)}
+    ])}
+    first = run(FakeRouter(), db=db, video_id="v1")
+
+    router = FakeRouter()
+    second = run(router, db=db, video_id="v1")
+    assert router.tasks == ["summary"]
+    assert second["sections"] == first["sections"]
+
+def test_hierarchical_mode_can_be_turned_off():
+    router = FakeRouter()
+    result = run(router, hierarchical=False)
+    assert router.tasks == ["summary", "title"]
+    assert "sections" not in result
+
+if __name__ == "__main__":
+    test_long_transcripts_are_summarized_hierarchically()
+    test_truncated_combined_summary_falls_back_to_flat()
+    test_stored_section_summaries_are_reused()
+    test_hierarchical_mode_can_be_turned_off()
+    print("All GPT summarization tests passed")
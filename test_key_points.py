@@ -1,5 +1,8 @@
 import os
-from key_points_extractor import extract_key_points, generate_key_points_title, format_key_points
+from key_points_extractor import (
+    extract_key_points, generate_key_points_title, format_key_points, split_transcript_windows, prefilter_transcript
+)
+from token_budget import count_tokens
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -41,5 +44,42 @@ def test_key_points_extraction():
     print("\nFormatted Output:")
     print(formatted_output)
 
+def test_transcript_windows():
+    """Long transcripts are split into bounded windows at sentence boundaries."""
+    sentences = [f"Sentence number {i} talks about pricing and revenue growth." for i in range(200)]
+    transcript = " ".join(sentences)
+
+    windows = split_transcript_windows(transcript, window_tokens=100)
+    assert len(windows) > 1
+    assert " ".join(windows) == transcript
+    for window in windows:
+        assert count_tokens(window) <= 100
+        assert window.endswith(".")
+
+    # An unpunctuated run of words is still split
+    windows = split_transcript_windows("word " * 2000, window_tokens=100)
+    assert len(windows) > 1
+    assert all(count_tokens(window) <= 100 for window in windows)
+
+    assert split_transcript_windows("One short sentence.", window_tokens=100) == ["One short sentence."]
+
+def test_prefilter_transcript():
+    """The pre-filter keeps the best sentences in order and within budget."""
+    filler = "So yeah that is basically how it works"
+    facts = [f"Plan {i} costs {i * 10} dollars and includes {i} analytics seats" for i in range(1, 41)]
+    transcript = ". ".join(part for fact in facts for part in (filler, fact)) + "."
+
+    filtered, stats = prefilter_transcript(transcript, keep_fraction=0.5, max_tokens=200)
+    assert stats["kept_tokens"] <= 200 < stats["tokens"]
+    assert 0 < stats["kept"] <= stats["sentences"] // 2
+    kept = filtered.rstrip(".").split(". ")
+    assert kept.count(filler) < len(kept) // 4
+    assert [transcript.index(s) for s in kept] == sorted(transcript.index(s) for s in kept)
+
+    # Transcripts within the budget are sent whole
+    assert prefilter_transcript("One short sentence.", max_tokens=200)[0] == "One short sentence."
+
 if __name__ == "__main__":
+    test_transcript_windows()
+    test_prefilter_transcript()
     test_key_points_extraction()
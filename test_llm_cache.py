@@ -0,0 +1,76 @@
+import tempfile
+
+from openai.types.chat import ChatCompletion
+
+from llm_cache import LLMCache, cache_key
+
+def _response(content, finish_reason="stop"):
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-3.5-turbo",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": finish_reason
+        }],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+    })
+
+class RecordingDispatcher:
+    """Dispatcher stand-in that answers every request and counts the calls."""
+
+    def __init__(self, finish_reason="stop"):
+        self.calls = 0
+        self.finish_reason = finish_reason
+
+    def chat_completion(self, priority=None, api_key=None, **params):
+        self.calls += 1
+        return _response(f"answer {self.calls}", self.finish_reason)
+
+def _params(prompt="Create a title for these key points:\n\n- Revenue grew"):
+    return {
+        "model": "gpt-3.5-turbo",
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.7,
+        "max_tokens": 50
+    }
+
+def test_cache_key_normalizes_whitespace_only():
+    """Re-indented prompts share a key; different parameters don't."""
+    assert cache_key(_params("Create a title\n        for these")) == cache_key(_params("Create a title for these"))
+    assert cache_key(_params()) != cache_key(dict(_params(), temperature=0.2))
+    assert cache_key(_params()) != cache_key(dict(_params(), model="gpt-4o-mini"))
+
+def test_repeated_request_served_from_disk_tier():
+    """A repeated request is answered from the cache and counted as a hit."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        client = RecordingDispatcher()
+        cache = LLMCache(disk_dir=cache_dir, dispatcher=client)
+        first = cache.chat_completion("title", **_params())
+        second = LLMCache(disk_dir=cache_dir, dispatcher=client).chat_completion("title", **_params())
+        assert client.calls == 1
+        assert second.choices[0].message.content == first.choices[0].message.content
+        assert cache.stats()["title"] == {"hits": 0, "misses": 1, "hit_rate": 0.0}
+
+def test_bypass_and_truncated_responses_are_not_cached():
+    """Bypassed calls always hit the API and truncated answers aren't stored."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        client = RecordingDispatcher()
+        cache = LLMCache(disk_dir=cache_dir, dispatcher=client)
+        cache.chat_completion("title", bypass=True, **_params())
+        cache.chat_completion("title", bypass=True, **_params())
+        assert client.calls == 2
+
+        truncating = RecordingDispatcher(finish_reason="length")
+        cache = LLMCache(disk_dir=cache_dir, dispatcher=truncating)
+        cache.chat_completion("summary", **_params("Summarize"))
+        cache.chat_completion("summary", **_params("Summarize"))
+        assert truncating.calls == 2
+
+if __name__ == "__main__":
+    test_cache_key_normalizes_whitespace_only()
+    test_repeated_request_served_from_disk_tier()
+    test_bypass_and_truncated_responses_are_not_cached()
+    print("LLM cache tests passed")
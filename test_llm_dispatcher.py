@@ -0,0 +1,73 @@
+import os
+import threading
+import time
+
+# The shared client is created with a key but these calls never use it
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from types import SimpleNamespace
+
+from llm_dispatcher import (
+    LLMDispatcher, TokenBucketLimiter, AUDIO_HTTP_TIMEOUT_SECONDS, HTTP_TIMEOUT_SECONDS, PRIORITY_HIGH, PRIORITY_LOW
+)
+
+def test_token_bucket_limits_requests_and_tokens():
+    """Requests wait once either bucket is empty."""
+    limiter = TokenBucketLimiter(rpm=600, tpm=60000)
+    assert limiter._try_local(1000) == 0
+    # 59000 tokens left; 60000 more needs 1000 tokens at 1000 tokens per second
+    assert abs(limiter._try_local(60000) - 1.0) < 0.05
+
+    limiter = TokenBucketLimiter(rpm=60, tpm=60000)
+    for _ in range(60):
+        assert limiter._try_local(0) == 0
+    assert 0.9 < limiter._try_local(0) <= 1.0
+
+def test_dispatcher_runs_higher_priority_first():
+    """Queued requests are dispatched in priority order."""
+    dispatcher = LLMDispatcher(TokenBucketLimiter(rpm=10000, tpm=10**7), concurrency=1)
+    release = threading.Event()
+    order = []
+
+    # Occupy the only worker so the next requests queue up
+    blocker = dispatcher.submit(lambda client: release.wait(5))
+    time.sleep(0.1)
+    low = dispatcher.submit(lambda client: order.append("low"), priority=PRIORITY_LOW)
+    high = dispatcher.submit(lambda client: order.append("high"), priority=PRIORITY_HIGH)
+    release.set()
+    for future in (blocker, low, high):
+        future.result(timeout=5)
+    assert order == ["high", "low"]
+
+def test_dispatcher_propagates_errors():
+    """Exceptions raised by a call reach the caller."""
+    dispatcher = LLMDispatcher(TokenBucketLimiter(rpm=10000, tpm=10**7), concurrency=1)
+
+    def failing(client):
+        raise ValueError("bad request")
+
+    try:
+        dispatcher.call(failing)
+        assert False, "expected ValueError"
+    except ValueError as e:
+        assert str(e) == "bad request"
+
+def test_transcriptions_use_the_audio_timeout():
+    """Audio uploads get their own, longer timeout on the shared client."""
+    dispatcher = LLMDispatcher(TokenBucketLimiter(rpm=10000, tpm=10**7), concurrency=1)
+    timeouts = []
+
+    def with_options(timeout):
+        timeouts.append(timeout)
+        return SimpleNamespace(audio=SimpleNamespace(transcriptions=SimpleNamespace(create=lambda **params: "text")))
+
+    dispatcher.client = lambda api_key=None: SimpleNamespace(with_options=with_options)
+    assert dispatcher.transcription(model="whisper-1", file=None) == "text"
+    assert timeouts == [AUDIO_HTTP_TIMEOUT_SECONDS] and AUDIO_HTTP_TIMEOUT_SECONDS > HTTP_TIMEOUT_SECONDS
+
+if __name__ == "__main__":
+    test_token_bucket_limits_requests_and_tokens()
+    test_dispatcher_runs_higher_priority_first()
+    test_dispatcher_propagates_errors()
+    test_transcriptions_use_the_audio_timeout()
+    print("Dispatcher tests passed")
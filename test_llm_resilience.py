@@ -0,0 +1,136 @@
+import itertools
+import os
+import time
+
+# The shared client is created with a key but these calls never use it
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import openai
+
+import llm_dispatcher
+from llm_dispatcher import LLMDispatcher, TokenBucketLimiter
+from llm_resilience import CircuitBreaker, CircuitOpenError, MAX_ATTEMPTS, backoff_delay
+
+def _dispatcher(concurrency=2):
+    return LLMDispatcher(TokenBucketLimiter(rpm=10000, tpm=10**7), concurrency=concurrency)
+
+def _status_error(cls, status_code, code=None):
+    """An OpenAI status error without an HTTP response behind it."""
+    error = cls.__new__(cls)
+    Exception.__init__(error, f"HTTP {status_code}")
+    error.status_code, error.code, error.response = status_code, code, None
+    return error
+
+def _failures(dispatcher, error):
+    """Calls that always fail with error, without backoff; returns the attempts made."""
+    calls = []
+
+    def failing(client):
+        calls.append(1)
+        raise error
+
+    previous = llm_dispatcher.backoff_delay
+    llm_dispatcher.backoff_delay = lambda attempt, retry_after=None: 0
+    try:
+        dispatcher.call(failing)
+        assert False, "expected the error to be raised"
+    except (type(error), CircuitOpenError):
+        pass
+    finally:
+        llm_dispatcher.backoff_delay = previous
+    return len(calls)
+
+def test_backoff_is_jittered_and_honors_retry_after():
+    """Delays stay within the exponential envelope and never undercut Retry-After."""
+    for attempt in range(4):
+        assert 0 <= backoff_delay(attempt) <= 0.5 * 2 ** attempt
+    assert backoff_delay(0, retry_after=3) >= 3
+
+def test_circuit_breaker_opens_and_recovers():
+    """The breaker fails fast after repeated failures and closes after a good trial."""
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_seconds=0.1)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    time.sleep(0.15)
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial request at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+def test_open_circuit_fails_fast():
+    """Calls are not sent while the endpoint's circuit is open."""
+    dispatcher = _dispatcher()
+    breaker = dispatcher.breaker("chat")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    calls = []
+    try:
+        dispatcher.call(lambda client: calls.append(1))
+        assert False, "expected CircuitOpenError"
+    except CircuitOpenError:
+        pass
+    assert calls == []
+
+def test_non_retryable_errors_are_not_retried():
+    """Bad requests are raised immediately and don't trip the breaker."""
+    dispatcher = _dispatcher()
+    calls = []
+
+    def bad_request(client):
+        calls.append(1)
+        raise ValueError("invalid request")
+
+    try:
+        dispatcher.call(bad_request)
+    except ValueError:
+        pass
+    assert len(calls) == 1
+    assert dispatcher.breaker("chat").state == "closed"
+
+def test_rate_limits_do_not_open_the_circuit():
+    """429s are retried but only 5xx, timeouts and connection errors count as provider failures."""
+    dispatcher = _dispatcher()
+    breaker = dispatcher.breaker("chat")
+    breaker.failure_threshold = 2
+
+    assert _failures(dispatcher, _status_error(openai.RateLimitError, 429)) == MAX_ATTEMPTS
+    assert breaker.state == "closed" and breaker.failures == 0
+    # An exhausted quota won't clear by retrying
+    assert _failures(dispatcher, _status_error(openai.RateLimitError, 429, "insufficient_quota")) == 1
+    assert breaker.state == "closed"
+
+    # Server errors open it, and the attempts after that fail fast
+    assert _failures(dispatcher, _status_error(openai.InternalServerError, 503)) == 2
+    assert breaker.state == "open"
+
+def test_hedged_request_beats_slow_primary():
+    """A duplicate sent after the latency percentile answers a stuck request."""
+    dispatcher = _dispatcher()
+    dispatcher.breaker("chat")
+    for _ in range(50):
+        dispatcher.latencies["chat"].add(0.05)
+
+    attempts = itertools.count()
+
+    def sometimes_slow(client):
+        if next(attempts) == 0:
+            time.sleep(2)
+            return "slow"
+        return "fast"
+
+    started = time.monotonic()
+    assert dispatcher.call(sometimes_slow, hedge=True) == "fast"
+    assert time.monotonic() - started < 1
+
+if __name__ == "__main__":
+    test_backoff_is_jittered_and_honors_retry_after()
+    test_circuit_breaker_opens_and_recovers()
+    test_open_circuit_fails_fast()
+    test_non_retryable_errors_are_not_retried()
+    test_rate_limits_do_not_open_the_circuit()
+    test_hedged_request_beats_slow_primary()
+    print("Resilience tests passed")
@@ -0,0 +1,203 @@
+import json
+import os
+import tempfile
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from openai.types.chat import ChatCompletion
+
+import llm_router
+from llm_cache import LLMCache
+from llm_router import RoutingTable, RouteMetrics, routed_chat_completion
+from chatgpt_extractor import ChatGPTExtractor, analysis_tokens
+from models.database import Database
+from token_budget import completion_cost, plan_max_tokens, usage_context
+
+class RecordingDispatcher:
+    """Dispatcher stand-in that answers every request and keeps its parameters."""
+
+    def __init__(self, content="A title", finish_reason="stop"):
+        self.requests = []
+        self.content = content
+        self.finish_reason = finish_reason
+
+    def chat_completion(self, priority=None, api_key=None, **params):
+        self.requests.append(params)
+        return ChatCompletion.model_validate({
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": 0,
+            "model": params["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": self.content},
+                "finish_reason": self.finish_reason
+            }],
+            "usage": {"prompt_tokens": 1000, "completion_tokens": 100, "total_tokens": 1100}
+        })
+
+ROUTES = {
+    "free": {
+        "title": {"model": "gpt-4o-mini", "temperature": 0.7, "max_tokens": 50},
+        "key_points": {"model": "gpt-4o-mini", "temperature": 0.5, "max_tokens": 500},
+        "analysis": {"model": "gpt-4o-mini", "temperature": 0.3, "max_tokens": 700}
+    },
+    "pro": {
+        "key_points": {"model": "gpt-4o", "temperature": 0.5, "max_tokens": 600}
+    }
+}
+
+def test_routes_by_task_and_plan():
+    table = RoutingTable(ROUTES, path=None)
+    assert table.route("title", "free")["model"] == "gpt-4o-mini"
+    assert table.route("key_points", "pro")["model"] == "gpt-4o"
+    # Tasks a plan doesn't list, and unknown plans, use the default plan
+    assert table.route("title", "pro")["max_tokens"] == 50
+    assert table.route("key_points", "enterprise")["plan"] == "free"
+    with usage_context(plan="pro"):
+        assert table.route("key_points")["model"] == "gpt-4o"
+
+def test_routing_file_is_hot_reloaded():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "routes.json")
+        table = RoutingTable(ROUTES, path=path, reload_seconds=0)
+        assert table.route("title", "free")["model"] == "gpt-4o-mini"
+
+        with open(path, "w") as f:
+            json.dump({"free": {"title": {"model": "gpt-3.5-turbo"}}}, f)
+        route = table.route("title", "free")
+        assert route["model"] == "gpt-3.5-turbo" and route["max_tokens"] == 50
+
+        # A broken file keeps the last good routes
+        with open(path, "w") as f:
+            f.write("{not json")
+        os.utime(path, (1, 1))
+        assert table.route("title", "free")["model"] == "gpt-3.5-turbo"
+
+        os.remove(path)
+        assert table.route("title", "free")["model"] == "gpt-4o-mini"
+
+def test_routed_calls_record_latency_and_cost():
+    dispatcher = RecordingDispatcher()
+    cache_dir = tempfile.TemporaryDirectory()
+    previous = (llm_router.llm_cache, llm_router.routing_table, llm_router.route_metrics)
+    llm_router.llm_cache = LLMCache(disk_dir=cache_dir.name, dispatcher=dispatcher)
+    llm_router.routing_table = RoutingTable(ROUTES, path=None)
+    llm_router.route_metrics = RouteMetrics()
+    try:
+        messages = [{"role": "user", "content": "Create a title for these key points"}]
+        with usage_context(plan="pro"):
+            routed_chat_completion("key_points", "key_points", messages)
+            routed_chat_completion("key_points", "key_points", messages)
+        assert len(dispatcher.requests) == 1
+        assert dispatcher.requests[0]["model"] == "gpt-4o"
+        assert dispatcher.requests[0]["temperature"] == 0.5
+        assert dispatcher.requests[0]["max_tokens"] == 600
+
+        stats = llm_router.route_metrics.stats()["key_points:pro:gpt-4o"]
+        assert stats["calls"] == 2 and stats["cache_hits"] == 1
+        # Only the API call is charged
+        assert stats["cost"] == round(completion_cost("gpt-4o", 1000, 100), 6)
+        assert stats["latency_p95"] is not None
+    finally:
+        llm_router.llm_cache, llm_router.routing_table, llm_router.route_metrics = previous
+        cache_dir.cleanup()
+
+ANALYSIS = json.dumps({
+    "key_points": [f"Point {i} about pricing." for i in range(6)],
+    "summary": "A talk about pricing.",
+    "titles": {"transcript": "Pricing", "key_points": "Pricing Points", "summary": "Pricing Summary"}
+})
+
+def analyze(dispatcher):
+    """Run the structured analysis on the free plan (200 token cap) through the dispatcher."""
+    cache_dir = tempfile.TemporaryDirectory()
+    previous = (llm_router.llm_cache, llm_router.routing_table, llm_router.route_metrics)
+    llm_router.llm_cache = LLMCache(disk_dir=cache_dir.name, dispatcher=dispatcher)
+    llm_router.routing_table = RoutingTable(ROUTES, path=None)
+    llm_router.route_metrics = RouteMetrics()
+    try:
+        assert plan_max_tokens("free") == 200
+        with usage_context(plan="free"):
+            return ChatGPTExtractor().analyze_transcript("We talked about pricing for an hour.", 6)
+    finally:
+        llm_router.llm_cache, llm_router.routing_table, llm_router.route_metrics = previous
+        cache_dir.cleanup()
+
+def test_structured_analysis_is_not_cut_by_the_plan_cap():
+    dispatcher = RecordingDispatcher(ANALYSIS)
+    analysis = analyze(dispatcher)
+    assert dispatcher.requests[0]["max_tokens"] == analysis_tokens(6) > 200
+    assert len(analysis["key_points"]) == 6 and analysis["titles"]["summary"] == "Pricing Summary"
+
+def test_truncated_analysis_is_not_parsed():
+    # Even content that happens to parse is not trusted once the limit was hit
+    dispatcher = RecordingDispatcher(ANALYSIS, finish_reason="length")
+    assert analyze(dispatcher) == {"key_points": [], "summary": "", "titles": {}}
+
+class FakeUsageCollection:
+    """The insert_one/aggregate subset of the token_usage collection."""
+
+    def __init__(self):
+        self.documents = []
+
+    def insert_one(self, document):
+        self.documents.append(document)
+
+    def aggregate(self, pipeline):
+        match, group = pipeline[0]['$match'], pipeline[1]['$group']
+        documents = [d for d in self.documents if all(d.get(k) == v for k, v in match.items())]
+        if not documents:
+            return []
+        result = {'_id': None}
+        for name, spec in group.items():
+            if name != '_id':
+                result[name] = sum(d[spec['$sum'].lstrip('$')] for d in documents)
+        return [result]
+
+class FakeDatabase:
+    """pymongo database stand-in, indexable and with collection attributes."""
+
+    def __init__(self):
+        self.token_usage = FakeUsageCollection()
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+def test_usage_is_stored_for_the_dashboard():
+    dispatcher = RecordingDispatcher()
+    db = FakeDatabase()
+    cache_dir = tempfile.TemporaryDirectory()
+    previous = (llm_router.llm_cache, llm_router.routing_table, llm_router.route_metrics)
+    llm_router.llm_cache = LLMCache(disk_dir=cache_dir.name, dispatcher=dispatcher)
+    llm_router.routing_table = RoutingTable(ROUTES, path=None)
+    llm_router.route_metrics = RouteMetrics()
+    try:
+        with usage_context(db, user_id="user-1", plan="free"):
+            routed_chat_completion("title", "summary_title", [{"role": "user", "content": "Title this"}])
+    finally:
+        llm_router.llm_cache, llm_router.routing_table, llm_router.route_metrics = previous
+        cache_dir.cleanup()
+
+    # The dashboard reads it back through Database, without a connection
+    database = object.__new__(Database)
+    database.db = db
+    assert database.get_user_token_usage("user-1") == {
+        "prompt_tokens": 1000, "completion_tokens": 100, "total_tokens": 1100
+    }
+    assert database.get_user_token_usage("user-2")["total_tokens"] == 0
+
+def test_completion_cost_matches_dated_models():
+    assert completion_cost("gpt-4o-mini-2024-07-18", 1000, 1000) == completion_cost("gpt-4o-mini", 1000, 1000)
+    assert completion_cost("gpt-4o-mini", 1000, 1000) < completion_cost("gpt-4o", 1000, 1000)
+    assert completion_cost("unknown-model", 1000, 1000) == 0.0
+
+if __name__ == "__main__":
+    test_routes_by_task_and_plan()
+    test_routing_file_is_hot_reloaded()
+    test_routed_calls_record_latency_and_cost()
+    test_structured_analysis_is_not_cut_by_the_plan_cap()
+    test_truncated_analysis_is_not_parsed()
+    test_usage_is_stored_for_the_dashboard()
+    test_completion_cost_matches_dated_models()
+    print("All LLM router tests passed")
@@ -0,0 +1,56 @@
+from sentence_segmenter import iter_sentence_spans, iter_sentences, sentence_timestamps, split_sentences
+
+def test_abbreviations_numbers_and_initials():
+    """Periods in abbreviations, decimals and initials don't end sentences."""
+    text = ("Dr. Smith paid $3.50 for v2.0.1 at 5 p.m. on Monday. J. K. Rowling agreed! "
+            "We grew in the U.S. Europe is next. No. 5 is best. Is it?")
+    assert split_sentences(text) == [
+        "Dr. Smith paid $3.50 for v2.0.1 at 5 p.m. on Monday.",
+        "J. K. Rowling agreed!",
+        "We grew in the U.S.",
+        "Europe is next.",
+        "No. 5 is best.",
+        "Is it?",
+    ]
+
+def test_single_letters_ending_sentences():
+    """A capital letter before a sentence-starting word ends the sentence; before a name it's an initial."""
+    assert split_sentences("We went with Plan B. Then we shipped it.") == \
+        ["We went with Plan B.", "Then we shipped it."]
+    assert split_sentences("Take vitamin C. It helps. Ask George R. R. Martin. Or John F. Kennedy.") == \
+        ["Take vitamin C.", "It helps.", "Ask George R. R. Martin.", "Or John F. Kennedy."]
+
+def test_ellipses_quotes_and_paragraphs():
+    """Ellipses only end a sentence before a capital; paragraph breaks always do."""
+    assert split_sentences("Prices start at $49... and go up. Wait... \"Really?\" Yes") == \
+        ["Prices start at $49... and go up.", "Wait...", "\"Really?\"", "Yes"]
+    assert split_sentences("  Para one  \n\n  Para two. Last  ") == ["Para one", "Para two.", "Last"]
+    assert split_sentences("   ") == []
+
+def test_offsets_point_into_the_text():
+    """Spans are offsets into the original string, also within a sub-range."""
+    text = "  First one.   Second one?  Third"
+    for sentence in iter_sentences(text):
+        assert text[sentence.start:sentence.end] == sentence.text
+    assert [text[s:e] for s, e in iter_sentence_spans(text, 14, 27)] == ["Second one?"]
+
+def test_sentence_timestamps():
+    """Sentences are mapped to the times of the segments they span."""
+    segments = [
+        {"start": 0.0, "end": 2.0, "text": " Hello there. How"},
+        {"start": 2.0, "end": 4.0, "text": " are you? Fine."},
+    ]
+    text = "Hello there. How are you? Fine."
+    assert [(s.text, start, end) for s, start, end in sentence_timestamps(text, segments)] == [
+        ("Hello there.", 0.0, 2.0),
+        ("How are you?", 0.0, 4.0),
+        ("Fine.", 2.0, 4.0),
+    ]
+
+if __name__ == "__main__":
+    test_abbreviations_numbers_and_initials()
+    test_single_letters_ending_sentences()
+    test_ellipses_quotes_and_paragraphs()
+    test_offsets_point_into_the_text()
+    test_sentence_timestamps()
+    print("Sentence segmenter tests passed")
@@ -0,0 +1,99 @@
+import threading
+
+import summarization
+from summarization import SummarizationBatcher, split_token_windows
+
+def word_counts(texts, backend=None):
+    return [len(text.split()) for text in texts]
+
+class RecordingSummarizer:
+    """Summarize stand-in that keeps the first words of each text and logs batch sizes."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def __call__(self, texts, max_length, min_length, backend=None):
+        self.batch_sizes.append(len(texts))
+        return [' '.join(text.split()[:5]).rstrip('.') + '.' for text in texts]
+
+def test_windows_end_at_sentences_within_budget():
+    text = ' '.join(f"Sentence number {i} talks about pricing." for i in range(100))
+    windows = split_token_windows(text, word_counts, max_tokens=50)
+    assert len(windows) > 1
+    assert all(len(window.split()) <= 50 for window in windows)
+    assert all(window.endswith('pricing.') for window in windows)
+    assert ' '.join(windows) == text
+
+    # A sentence longer than a window is cut into pieces
+    long_sentence = ' '.join(['word'] * 120) + '.'
+    pieces = split_token_windows(long_sentence, word_counts, max_tokens=50)
+    assert len(pieces) == 3 and all(len(piece.split()) <= 50 for piece in pieces)
+
+def test_concurrent_requests_share_a_forward_pass():
+    summarizer = RecordingSummarizer()
+    batcher = SummarizationBatcher(summarizer, max_batch_size=8, wait_ms=200)
+    results = {}
+    barrier = threading.Barrier(3)
+
+    def request(i):
+        barrier.wait()
+        results[i] = batcher.summarize_all([f"Request {i} talks about revenue growth this quarter."])[0]
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert summarizer.batch_sizes == [3]
+    assert results == {i: f"Request {i} talks about revenue." for i in range(3)}
+
+def test_long_transcripts_are_reduced_to_one_summary():
+    summarizer = RecordingSummarizer()
+    previous = summarization.token_lengths, summarization.batcher
+    summarization.token_lengths = word_counts
+    summarization.batcher = SummarizationBatcher(summarizer, wait_ms=0)
+    try:
+        transcript = ' '.join(f"Point {i} is about onboarding and retention today." for i in range(300))
+        summary = summarization.summarize_text(transcript)
+    finally:
+        summarization.token_lengths, summarization.batcher = previous
+
+    # 2400 words: three windows in one batch, then the final summary
+    assert summarizer.batch_sizes == [3, 1]
+    assert summary == "Point 0 is about onboarding."
+
+def test_token_counting_does_not_share_the_pipeline_tokenizer():
+    """Caller threads count tokens without touching the batcher's pipeline."""
+    def whitespace_tokenizer(texts, add_special_tokens=True):
+        return {"input_ids": [text.split() for text in texts]}
+
+    def no_pipeline(backend=None):
+        raise AssertionError("the pipeline belongs to the batcher thread")
+
+    previous = summarization._load_tokenizer, summarization.get_summarizer, dict(summarization._tokenizers)
+    summarization._load_tokenizer = lambda backend: whitespace_tokenizer
+    summarization.get_summarizer = no_pipeline
+    summarization._tokenizers.clear()
+    try:
+        assert summarization.token_lengths(["one two", "three"], backend="pytorch") == [2, 1]
+    finally:
+        summarization._load_tokenizer, summarization.get_summarizer = previous[:2]
+        summarization._tokenizers.clear()
+        summarization._tokenizers.update(previous[2])
+
+def test_unknown_backend_is_rejected():
+    try:
+        summarization.get_summarizer("tensorrt")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+if __name__ == "__main__":
+    test_windows_end_at_sentences_within_budget()
+    test_concurrent_requests_share_a_forward_pass()
+    test_long_transcripts_are_reduced_to_one_summary()
+    test_token_counting_does_not_share_the_pipeline_tokenizer()
+    test_unknown_backend_is_rejected()
+    print("All summarization tests passed")
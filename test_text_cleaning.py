@@ -0,0 +1,64 @@
+from key_points_extractor import clean_sentence, clean_sentences, shorten_sentence, normalize_transcript, normalize_for_llm
+
+SENTENCES = [
+    "so um basically the pricing model is, like, really simple",
+    "Well you know I mean the   basic tier starts at $49 per month",
+    "",
+    "uh retention is kind of the metric that matters!!",
+    "This solution scales well."
+]
+
+def test_batch_matches_single_sentence_cleaning():
+    """clean_sentences gives the same output as clean_sentence per sentence."""
+    assert clean_sentences(SENTENCES) == [clean_sentence(s) for s in SENTENCES]
+
+def test_clean_sentence_removes_fillers():
+    """Filler phrases are removed and the sentence is tidied."""
+    assert clean_sentence("so um basically the pricing model is, like, really simple") == \
+        "The pricing model is,, simple."
+    assert clean_sentence("uh retention is kind of the metric that matters!!") == \
+        "Retention is the metric that matters!"
+
+def test_phrases_only_match_whole_words():
+    """Phrases inside longer words are left alone."""
+    assert shorten_sentence("Solutions sort data quickly") == "Solutions sort data quickly."
+    assert clean_sentence("Wellness software justifies the price") == "Wellness software justifies the price."
+
+def test_shorten_sentence_replaces_verbose_phrases():
+    """Verbose phrases are replaced with their concise forms."""
+    assert "Before" in shorten_sentence("Prior to launch we made a decision to raise prices for customers")
+    assert "decide" in shorten_sentence("We need to make a decision on pricing for all of our customers")
+
+def test_normalize_transcript_strips_disfluencies():
+    """Hesitations, stutters, repeated phrases and false starts are removed."""
+    assert normalize_transcript("Um, we offer we offer three tiers. The the basic tier is, uh, $49.") == \
+        "We offer three tiers. The basic tier is $49."
+    assert normalize_transcript("So, you know, the pri- pricing is simple. Hmm. Thank you.") == \
+        "The pricing is simple. Thank you."
+
+def test_normalize_transcript_keeps_meaning():
+    """Words that carry meaning, and legitimate repeats, are kept."""
+    text = "Like I said, we like it. I know that that works. Version 2.0 is so much faster."
+    assert normalize_transcript(text) == text
+    # Number ranges are not false starts
+    text = "Teams of 5- 50 people and pages 1- 10 are covered."
+    assert normalize_transcript(text) == text
+
+def test_normalize_for_llm_modes():
+    """Auto mode leaves short transcripts alone and reports token counts."""
+    text = "Um, the the price is fair."
+    assert normalize_for_llm(text, mode="auto")[0] == text
+    assert normalize_for_llm(text, mode="off")[0] == text
+    normalized, stats = normalize_for_llm(text, mode="always")
+    assert normalized == "The price is fair."
+    assert stats["normalized_tokens"] < stats["tokens"]
+
+if __name__ == "__main__":
+    test_batch_matches_single_sentence_cleaning()
+    test_clean_sentence_removes_fillers()
+    test_phrases_only_match_whole_words()
+    test_shorten_sentence_replaces_verbose_phrases()
+    test_normalize_transcript_strips_disfluencies()
+    test_normalize_transcript_keeps_meaning()
+    test_normalize_for_llm_modes()
+    print("Text cleaning tests passed")
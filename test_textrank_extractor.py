@@ -0,0 +1,39 @@
+import numpy as np
+
+from textrank_extractor import centrality_scores, extract_key_points, sentence_vectors, similarity_graph
+
+TRANSCRIPT = (
+    "Our pricing starts at forty nine dollars per month for the basic tier. "
+    "The basic tier pricing starts at forty nine dollars every month. "
+    "Pricing for the basic tier starts at forty nine dollars per month. "
+    "Enterprise customers get dedicated support and custom integrations. "
+    "Retention across all plans is ninety five percent every year. "
+    "Okay. "
+    "Onboarding takes less than a week with the dedicated support team."
+)
+
+def test_centrality_is_a_distribution():
+    """Centrality scores are positive and sum to one."""
+    sentences = [s for s in TRANSCRIPT.split('. ') if s]
+    scores = centrality_scores(similarity_graph(sentence_vectors(sentences)))
+    assert np.all(scores > 0)
+    assert abs(scores.sum() - 1) < 1e-6
+
+def test_selected_points_are_not_near_duplicates():
+    """MMR picks one of the repeated pricing sentences, not all three."""
+    points = extract_key_points(TRANSCRIPT, num_points=3)
+    assert len(points) == 3
+    assert sum('forty nine dollars' in point for point in points) == 1
+    assert "Okay" not in points
+
+def test_points_keep_transcript_order():
+    """Points appear in the order they were said."""
+    points = extract_key_points(TRANSCRIPT, num_points=4)
+    positions = [TRANSCRIPT.index(point) for point in points]
+    assert positions == sorted(positions)
+
+if __name__ == "__main__":
+    test_centrality_is_a_distribution()
+    test_selected_points_are_not_near_duplicates()
+    test_points_keep_transcript_order()
+    print("TextRank extractor tests passed")
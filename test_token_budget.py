@@ -0,0 +1,56 @@
+from token_budget import (
+    count_tokens, count_message_tokens, trim_to_tokens, fit_chat_request,
+    plan_max_tokens, record_usage, usage_context, context_limit
+)
+
+def _messages(transcript):
+    return [
+        {"role": "system", "content": "Extract the key points."},
+        {"role": "user", "content": transcript}
+    ]
+
+def test_plan_budget_caps_completion_tokens():
+    """Completion limits never exceed the plan's max_tokens."""
+    _, max_tokens = fit_chat_request(_messages("Short transcript."), max_tokens=300, plan="free")
+    assert max_tokens == plan_max_tokens("free") == 200
+    _, max_tokens = fit_chat_request(_messages("Short transcript."), max_tokens=300, plan="pro")
+    assert max_tokens == 300
+
+def test_plan_comes_from_usage_context():
+    """Calls inside a usage context use that job's plan."""
+    with usage_context(plan="starter"):
+        _, max_tokens = fit_chat_request(_messages("Short transcript."), max_tokens=1000)
+    assert max_tokens == plan_max_tokens("starter")
+
+def test_oversized_prompt_is_trimmed_to_context():
+    """A prompt that would overflow the context window is trimmed to fit."""
+    transcript = "Revenue grew forty percent this quarter. " * 5000
+    messages, max_tokens = fit_chat_request(_messages(transcript), "gpt-3.5-turbo", 300, plan="pro")
+    assert count_message_tokens(messages) + max_tokens <= context_limit("gpt-3.5-turbo")
+    assert messages[0]["content"] == "Extract the key points."
+    assert messages[1]["content"].endswith(".")
+
+def test_trim_to_tokens():
+    """Trimmed text fits the budget and short text is unchanged."""
+    text = "One sentence here. " * 100
+    trimmed = trim_to_tokens(text, 50)
+    assert count_tokens(trimmed) <= 50
+    assert text.startswith(trimmed)
+    assert trim_to_tokens("Short.", 50) == "Short."
+
+def test_record_usage_reads_response_usage():
+    """Exact usage is taken from the API response."""
+    response = {"usage": {"prompt_tokens": 120, "completion_tokens": 30, "total_tokens": 150}}
+    with usage_context(user_id="user-1", plan="free", video_id="abc123"):
+        document = record_usage(response, "key_points", "gpt-3.5-turbo")
+    assert document["total_tokens"] == 150
+    assert document["user_id"] == "user-1"
+    assert record_usage({}, "key_points") is None
+
+if __name__ == "__main__":
+    test_plan_budget_caps_completion_tokens()
+    test_plan_comes_from_usage_context()
+    test_oversized_prompt_is_trimmed_to_context()
+    test_trim_to_tokens()
+    test_record_usage_reads_response_usage()
+    print("Token budget tests passed")
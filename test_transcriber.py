@@ -0,0 +1,96 @@
+import threading
+import time
+
+import transcriber
+from transcriber import ModelRegistry
+
+class FakeModel:
+    """Whisper model stand-in that records how many transcriptions overlap."""
+
+    def __init__(self, size):
+        self.size = size
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def transcribe(self, audio_path, **options):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        return {"text": f"{self.size}:{audio_path}", "segments": []}
+
+def test_least_recently_used_model_is_evicted_under_pressure():
+    registry = ModelRegistry(FakeModel, min_available_mb=1024)
+    previous = transcriber._available_memory_mb
+    # Memory is low once two models are loaded
+    transcriber._available_memory_mb = lambda: 512 if len(registry.loaded_sizes()) >= 2 else 4096
+    try:
+        registry.get("tiny")
+        registry.get("base")
+        registry.get("tiny")  # base is now the least recently used
+        registry.get("small")
+        assert registry.loaded_sizes() == ["tiny", "small"]
+    finally:
+        transcriber._available_memory_mb = previous
+
+def test_busy_models_are_not_evicted():
+    registry = ModelRegistry(FakeModel, min_available_mb=1024)
+    previous = transcriber._available_memory_mb
+    transcriber._available_memory_mb = lambda: 512
+    try:
+        registry.get("tiny")
+        with registry._model_lock("tiny"):
+            registry.get("base")
+        assert registry.loaded_sizes() == ["tiny", "base"]
+    finally:
+        transcriber._available_memory_mb = previous
+
+def test_models_are_loaded_once_and_locked_per_model():
+    loads = []
+
+    def loader(size):
+        loads.append(size)
+        return FakeModel(size)
+
+    registry = ModelRegistry(loader, min_available_mb=0)
+    sizes = ["tiny"] * 4 + ["base"] * 2
+    results = [None] * len(sizes)
+
+    def job(i):
+        results[i] = registry.transcribe(f"audio{i}.mp3", sizes[i])["text"]
+
+    threads = [threading.Thread(target=job, args=(i,)) for i in range(len(sizes))]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    assert sorted(loads) == ["base", "tiny"]
+    assert results == [f"{size}:audio{i}.mp3" for i, size in enumerate(sizes)]
+    # One job at a time per model, but different models run side by side
+    assert registry.get("tiny").max_active == 1
+    assert registry.get("base").max_active == 1
+    assert elapsed < 0.05 * len(sizes)
+
+def test_concurrent_registry_runs_jobs_on_one_model_at_once():
+    registry = ModelRegistry(FakeModel, min_available_mb=0, concurrent=True)
+    threads = [threading.Thread(target=registry.transcribe, args=(f"audio{i}.mp3", "tiny")) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert registry.get("tiny").max_active > 1
+    assert registry._active == {"tiny": 0}
+
+if __name__ == "__main__":
+    test_least_recently_used_model_is_evicted_under_pressure()
+    test_busy_models_are_not_evicted()
+    test_models_are_loaded_once_and_locked_per_model()
+    test_concurrent_registry_runs_jobs_on_one_model_at_once()
+    print("All transcriber tests passed")
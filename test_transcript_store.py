@@ -0,0 +1,103 @@
+import itertools
+from types import SimpleNamespace
+
+import transcript_store
+from transcript_store import compress_transcript, decompress_transcript, load_transcript, save_transcript
+
+class FakeCollection:
+    """The find_one/update_one subset of a pymongo collection, keyed by video_id."""
+
+    def __init__(self):
+        self.documents = {}
+
+    def find_one(self, query, projection=None):
+        return next(
+            (dict(d) for d in self.documents.values() if all(d.get(k) == v for k, v in query.items())),
+            None
+        )
+
+    def update_one(self, query, update, upsert=False):
+        document = self.documents.get(query["video_id"])
+        if document is None:
+            if not upsert:
+                return SimpleNamespace(matched_count=0)
+            document = self.documents[query["video_id"]] = {}
+        document.update(update.get("$set", {}))
+        for key in update.get("$unset", {}):
+            document.pop(key, None)
+        return SimpleNamespace(matched_count=1)
+
+class FakeGridFS:
+    """In-memory GridFS bucket shared by every GridFS() of the test."""
+
+    files = {}
+    ids = itertools.count(1)
+
+    def __init__(self, db, collection=None):
+        pass
+
+    def put(self, data, filename=None):
+        file_id = next(self.ids)
+        self.files[file_id] = data
+        return file_id
+
+    def get(self, file_id):
+        return SimpleNamespace(read=lambda: self.files[file_id])
+
+    def delete(self, file_id):
+        del self.files[file_id]
+
+SEGMENTS = [{"start": i * 2.0, "end": i * 2.0 + 2.0, "text": f"Segment {i} about pricing."} for i in range(500)]
+TEXT = " ".join(segment["text"] for segment in SEGMENTS)
+
+def with_fake_storage(test, threshold):
+    db = {transcript_store.COLLECTION: FakeCollection()}
+    previous = transcript_store.gridfs, transcript_store.GRIDFS_THRESHOLD_BYTES, transcript_store.update_document_frequencies
+    transcript_store.gridfs = SimpleNamespace(GridFS=FakeGridFS)
+    transcript_store.GRIDFS_THRESHOLD_BYTES = threshold
+    transcript_store.update_document_frequencies = lambda db, text: None
+    FakeGridFS.files.clear()
+    try:
+        test(db)
+    finally:
+        transcript_store.gridfs, transcript_store.GRIDFS_THRESHOLD_BYTES, transcript_store.update_document_frequencies = previous
+
+def test_zstd_round_trip():
+    data = compress_transcript(TEXT, SEGMENTS)
+    assert len(data) < len(TEXT) / 4
+    assert decompress_transcript(data) == {"text": TEXT, "segments": SEGMENTS}
+
+def test_small_transcripts_are_stored_inline():
+    def check(db):
+        digest = save_transcript(db, "v1", TEXT, SEGMENTS, language="en")
+        stored = db[transcript_store.COLLECTION].documents["v1"]
+        assert "data" in stored and "gridfs_id" not in stored
+        assert not FakeGridFS.files
+
+        loaded = load_transcript(db, content_hash=digest)
+        assert loaded["text"] == TEXT and loaded["segments"] == SEGMENTS
+        assert "data" not in loaded
+
+    with_fake_storage(check, threshold=1024 * 1024)
+
+def test_large_transcripts_spill_to_gridfs():
+    def check(db):
+        save_transcript(db, "v1", TEXT, SEGMENTS)
+        stored = db[transcript_store.COLLECTION].documents["v1"]
+        assert "data" not in stored and stored["gridfs_id"] in FakeGridFS.files
+
+        loaded = load_transcript(db, video_id="v1")
+        assert loaded["text"] == TEXT and loaded["segments"] == SEGMENTS
+
+        # Replacing the transcript drops the old blob
+        first_blob = stored["gridfs_id"]
+        save_transcript(db, "v1", TEXT + " One more.", SEGMENTS)
+        assert first_blob not in FakeGridFS.files and len(FakeGridFS.files) == 1
+
+    with_fake_storage(check, threshold=64)
+
+if __name__ == "__main__":
+    test_zstd_round_trip()
+    test_small_transcripts_are_stored_inline()
+    test_large_transcripts_spill_to_gridfs()
+    print("All transcript store tests passed")
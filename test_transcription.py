@@ -0,0 +1,113 @@
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import transcription
+from config import TRANSCRIPTION_CONFIG
+from preprocess_audio import atempo_filter
+from transcription import choose_speed_factor, iter_transcribe_chunks, rescale_segments, stitch_segments
+
+def _stages(chain):
+    return [float(stage.split('=')[1]) for stage in chain.split(',')]
+
+def test_atempo_chain_above_two():
+    """Factors beyond atempo's 0.5-2.0 range are split into chained stages."""
+    assert atempo_filter(1.5) == "atempo=1.5000"
+    stages = _stages(atempo_filter(3.0))
+    assert stages == [2.0, 1.5]
+    stages = _stages(atempo_filter(5.0))
+    assert all(0.5 <= stage <= 2.0 for stage in stages)
+    product = 1.0
+    for stage in stages:
+        product *= stage
+    assert abs(product - 5.0) < 1e-3
+    assert _stages(atempo_filter(0.25)) == [0.5, 0.5]
+
+def test_rescale_segments_to_original_time():
+    """Timestamps of accelerated audio map back to the original timeline."""
+    segments = [{"start": 0.0, "end": 10.0, "text": "a"}, {"start": 10.0, "end": 12.5, "text": "b"}]
+    rescaled = rescale_segments(segments, 1.5)
+    assert [(s["start"], s["end"]) for s in rescaled] == [(0.0, 15.0), (15.0, 18.75)]
+    # The input is left untouched
+    assert segments[1]["end"] == 12.5
+
+def test_choose_speed_factor_modes():
+    """Plan mode uses the plan's speed; auto mode targets a speech rate, clamped and rounded."""
+    previous_config = dict(TRANSCRIPTION_CONFIG)
+    previous_estimate = transcription.estimate_speech_rate
+    try:
+        TRANSCRIPTION_CONFIG.update(speed_mode='plan', max_speed_factor=1.5)
+        assert choose_speed_factor("audio.mp3", "starter") == 1.25
+
+        TRANSCRIPTION_CONFIG.update(speed_mode='auto', target_speech_rate=6.5)
+        transcription.estimate_speech_rate = lambda path: 5.0
+        assert choose_speed_factor("audio.mp3") == 1.3
+        # Fast speakers are never slowed down, slow ones are capped
+        transcription.estimate_speech_rate = lambda path: 8.0
+        assert choose_speed_factor("audio.mp3") == 1.0
+        transcription.estimate_speech_rate = lambda path: 2.0
+        assert choose_speed_factor("audio.mp3") == 1.5
+
+        TRANSCRIPTION_CONFIG.update(speed_mode='off')
+        assert choose_speed_factor("audio.mp3") == 1.0
+    finally:
+        TRANSCRIPTION_CONFIG.clear()
+        TRANSCRIPTION_CONFIG.update(previous_config)
+        transcription.estimate_speech_rate = previous_estimate
+
+def test_stitch_segments_drops_overlap_duplicates():
+    segments = [
+        {"start": 298.0, "end": 301.0, "text": "the end of a sentence"},
+        {"start": 301.0, "end": 304.0, "text": "a new one"},
+        {"start": 304.0, "end": 308.0, "text": "continues here"}
+    ]
+    # The previous chunk already kept everything up to 301.0
+    assert [s["text"] for s in stitch_segments(segments, last_end=301.0)] == ["a new one", "continues here"]
+    # Segments starting after the cut are left to the next chunk
+    assert [s["text"] for s in stitch_segments(segments, cut=304.0)] == ["the end of a sentence", "a new one"]
+    assert stitch_segments(segments) == segments
+
+def test_chunks_are_stitched_with_full_audio_offsets():
+    """Chunks overlap by two seconds; timestamps are offset and the overlap is transcribed once."""
+    # Whisper segments of the full audio, five seconds each
+    speech = [(start, start + 5.0, f"words at {start:g}") for start in range(0, 25, 5)]
+    extracted = []
+
+    def extract(audio_file, output_file, start, duration):
+        extracted.append((start, duration))
+        with open(output_file, "w") as f:
+            f.write(f"{start},{duration}")
+
+    def transcribe(chunk_file, speed_factor):
+        with open(chunk_file) as f:
+            start, duration = map(float, f.read().split(","))
+        # Segments heard in the chunk, relative to its start
+        segments = [
+            {"start": max(s, start) - start, "end": min(e, start + duration) - start, "text": text}
+            for s, e, text in speech if e > start and s < start + duration
+        ]
+        return {"text": " ".join(s["text"] for s in segments), "segments": segments, "language": "en"}
+
+    previous = transcription.probe_duration, transcription.extract_audio_segment, transcription.transcribe_audio_verbose
+    transcription.probe_duration = lambda path: 25.0
+    transcription.extract_audio_segment = extract
+    transcription.transcribe_audio_verbose = transcribe
+    try:
+        chunks = list(iter_transcribe_chunks("audio.mp3", chunk_seconds=10, overlap_seconds=2))
+    finally:
+        transcription.probe_duration, transcription.extract_audio_segment, transcription.transcribe_audio_verbose = previous
+
+    assert extracted == [(0.0, 12), (10.0, 12), (20.0, 12)]
+    assert [chunk["offset"] for chunk in chunks] == [0.0, 10.0, 20.0]
+    assert all(chunk["count"] == 3 and chunk["duration"] == 25.0 for chunk in chunks)
+    segments = [segment for chunk in chunks for segment in chunk["segments"]]
+    assert [(s["start"], s["end"], s["text"]) for s in segments] == speech
+    assert " ".join(chunk["text"] for chunk in chunks) == " ".join(text for _, _, text in speech)
+
+if __name__ == "__main__":
+    test_atempo_chain_above_two()
+    test_rescale_segments_to_original_time()
+    test_choose_speed_factor_modes()
+    test_stitch_segments_drops_overlap_duplicates()
+    test_chunks_are_stitched_with_full_audio_offsets()
+    print("All transcription tests passed")
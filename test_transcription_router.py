@@ -0,0 +1,61 @@
+from transcription_router import route_transcription, caption_track
+from config.transcription_routing import TRANSCRIPTION_ENGINES
+
+def _metadata(**overrides):
+    """Probe metadata for a ten minute English video without captions."""
+    metadata = {
+        'video_id': 'abc123',
+        'duration': 600,
+        'language': 'en',
+        'manual_captions': [],
+        'automatic_captions': []
+    }
+    metadata.update(overrides)
+    return metadata
+
+def test_captions_replace_transcription():
+    """Captions in the video's language are used when the plan allows them."""
+    decision = route_transcription(_metadata(automatic_captions=['en', 'fr']), 'free')
+    assert decision['engine'] == 'captions'
+    assert decision['caption_language'] == 'en'
+
+def test_pro_plan_ignores_automatic_captions():
+    """Pro jobs only accept manual caption tracks."""
+    decision = route_transcription(_metadata(automatic_captions=['en']), 'pro')
+    assert decision['engine'] != 'captions'
+    assert route_transcription(_metadata(manual_captions=['en-US']), 'pro')['engine'] == 'captions'
+
+def test_translated_captions_are_not_used():
+    """Caption tracks in another language are never used as the transcript."""
+    assert caption_track(_metadata(language='de', automatic_captions=['en']), 'any') is None
+
+def test_short_clips_get_best_engine():
+    """Short clips go to the highest quality engine regardless of plan."""
+    decision = route_transcription(_metadata(duration=30), 'free')
+    assert decision['model'] == 'whisper-1'
+
+def test_non_english_avoids_english_only_models():
+    """English-only local models are not used for other languages."""
+    for duration in (600, 7200):
+        decision = route_transcription(_metadata(language='fr', duration=duration), 'free')
+        assert decision['model'] not in ('tiny.en', 'base.en')
+
+def test_english_only_engines_load_english_checkpoints():
+    """Engines marked English-only load the .en Whisper checkpoints."""
+    for name, engine in TRANSCRIPTION_ENGINES.items():
+        if engine['engine'] == 'local' and not engine['multilingual']:
+            assert engine['model'].endswith('.en'), name
+
+def test_unknown_plan_uses_free_policy():
+    """Jobs without a known plan are routed with the free policy."""
+    assert route_transcription(_metadata(), None)['plan'] == 'free'
+
+if __name__ == "__main__":
+    test_captions_replace_transcription()
+    test_pro_plan_ignores_automatic_captions()
+    test_translated_captions_are_not_used()
+    test_short_clips_get_best_engine()
+    test_non_english_avoids_english_only_models()
+    test_english_only_engines_load_english_checkpoints()
+    test_unknown_plan_uses_free_policy()
+    print("Routing tests passed")
@@ -0,0 +1,125 @@
+import logging
+import os
+
+import numpy as np
+from scipy import sparse
+
+from corpus_idf import tfidf_matrix
+from extract_points import split_into_sentences
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# LexRank: sentences less similar than this are not linked in the graph
+SIMILARITY_THRESHOLD = float(os.getenv('TEXTRANK_SIMILARITY_THRESHOLD', '0.1'))
+DAMPING = 0.85
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-6
+
+# Maximal Marginal Relevance: 1.0 ranks by centrality only, lower values
+# trade centrality for diversity among the selected points
+MMR_LAMBDA = float(os.getenv('TEXTRANK_MMR_LAMBDA', '0.7'))
+
+# Fragments shorter than this are not offered as key points
+MIN_SENTENCE_WORDS = 5
+
+def sentence_vectors(sentences):
+    """L2-normalized sparse TF-IDF rows, so dot products are cosine similarities."""
+    return tfidf_matrix(sentences, sublinear_tf=True).tocsr()
+
+def similarity_graph(vectors, threshold=SIMILARITY_THRESHOLD):
+    """
+    Sparse sentence similarity graph.
+
+    Edges below the threshold and self-loops are dropped, which keeps the
+    graph sparse and stops long sentences from ranking themselves.
+    """
+    graph = (vectors @ vectors.T).tocsr()
+    graph.setdiag(0)
+    graph.data[graph.data < threshold] = 0
+    graph.eliminate_zeros()
+    return graph
+
+def centrality_scores(graph, damping=DAMPING, prior=None):
+    """
+    PageRank centrality of each sentence by power iteration.
+
+    Edges are weighted by similarity (continuous LexRank). The random jump,
+    and the rank of sentences with no edges, is spread according to prior
+    (uniform by default).
+
+    Returns:
+        numpy.ndarray: Scores summing to 1.
+    """
+    count = graph.shape[0]
+    prior = np.full(count, 1.0 / count) if prior is None else prior / prior.sum()
+    out_weight = np.asarray(graph.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    # Row-normalized transition matrix, transposed for the update
+    transition = (sparse.diags(1.0 / np.where(dangling, 1.0, out_weight)) @ graph).T.tocsr()
+
+    scores = np.full(count, 1.0 / count)
+    for _ in range(MAX_ITERATIONS):
+        updated = damping * (transition @ scores + scores[dangling].sum() * prior) + (1 - damping) * prior
+        converged = np.abs(updated - scores).sum() < TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores
+
+def mmr_select(vectors, relevance, k, mmr_lambda=MMR_LAMBDA, candidates=None):
+    """
+    Select k sentences by Maximal Marginal Relevance.
+
+    Each pick maximizes mmr_lambda * relevance minus (1 - mmr_lambda) times
+    the highest similarity to an already selected sentence.
+
+    Returns:
+        list: Selected indices, in selection order.
+    """
+    relevance = relevance / relevance.max() if relevance.max() > 0 else relevance
+    available = np.zeros(len(relevance), dtype=bool)
+    available[np.arange(len(relevance)) if candidates is None else candidates] = True
+    redundancy = np.zeros(len(relevance))
+    selected = []
+
+    while len(selected) < k and available.any():
+        marginal = np.where(available, mmr_lambda * relevance - (1 - mmr_lambda) * redundancy, -np.inf)
+        best = int(np.argmax(marginal))
+        selected.append(best)
+        available[best] = False
+        similarity = np.asarray((vectors @ vectors[best].T).todense()).ravel()
+        redundancy = np.maximum(redundancy, similarity)
+    return selected
+
+def extract_key_points(transcript, num_points=5):
+    """
+    Extract key points with a LexRank sentence graph and MMR selection.
+
+    CPU-only engine for when no LLM is available: the most central
+    sentences are picked without near-duplicates and returned in transcript
+    order.
+    """
+    try:
+        sentences = split_into_sentences(transcript)
+        if len(sentences) <= num_points:
+            return sentences
+
+        vectors = sentence_vectors(sentences)
+        # Jump to sentences in proportion to their content, so short
+        # transcripts with few links still favor informative sentences
+        content = np.asarray(vectors.sum(axis=1)).ravel() + 1e-9
+        scores = centrality_scores(similarity_graph(vectors), prior=content)
+
+        word_counts = np.fromiter((s.count(' ') + 1 for s in sentences), dtype=np.int64, count=len(sentences))
+        candidates = np.flatnonzero(word_counts >= MIN_SENTENCE_WORDS)
+        if len(candidates) < num_points:
+            candidates = None
+
+        selected = mmr_select(vectors, scores, num_points, candidates=candidates)
+        return [sentences[i] for i in sorted(selected)]
+
+    except Exception as e:
+        logger.error(f"Error in graph key point extraction: {str(e)}")
+        return []
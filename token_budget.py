@@ -0,0 +1,237 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from functools import lru_cache
+
+import tiktoken
+from pymongo import ASCENDING
+
+from config.llm_routing import LLM_MODELS
+from config.pricing import PRICING_PLANS
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+COLLECTION = "token_usage"
+
+# Context window (prompt + completion tokens) of the chat models we call
+MODEL_CONTEXT_TOKENS = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-4": 8192,
+    "gpt-4-turbo": 128000,
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000
+}
+DEFAULT_CONTEXT_TOKENS = 4096
+
+# Tokens the chat format adds per message and to prime the reply
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+
+# Who the LLM calls of the current job are billed to
+_usage_context = ContextVar('token_usage_context', default=None)
+
+
+@lru_cache(maxsize=None)
+def get_encoder(model="gpt-3.5-turbo"):
+    """
+    BPE encoder for a model, loaded once per process.
+
+    Returns None when the encoding can't be loaded (e.g. a worker without
+    access to the tiktoken cache), in which case counts are estimated.
+    """
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"Could not load tokenizer for {model}, estimating token counts: {str(e)}")
+        return None
+
+
+def count_tokens(text, model="gpt-3.5-turbo"):
+    """Number of tokens in a text for a model."""
+    if not text:
+        return 0
+    encoder = get_encoder(model)
+    if encoder is None:
+        # Rough estimation: 1 token is about 4 characters
+        return max(1, len(text) // 4)
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages, model="gpt-3.5-turbo"):
+    """Number of prompt tokens a list of chat messages will use."""
+    total = TOKENS_PER_REPLY
+    for message in messages:
+        total += TOKENS_PER_MESSAGE + count_tokens(message.get('content') or '', model)
+    return total
+
+
+def trim_to_tokens(text, max_tokens, model="gpt-3.5-turbo"):
+    """
+    Cut a text down to at most max_tokens, preferring a sentence boundary.
+
+    Returns:
+        str: The text itself if it fits, otherwise its longest prefix that does.
+    """
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+
+    encoder = get_encoder(model)
+    if encoder is None:
+        trimmed = text[:max_tokens * 4]
+    else:
+        trimmed = encoder.decode(encoder.encode(text, disallowed_special=())[:max_tokens])
+
+    # Drop a partial trailing sentence unless that would lose most of the text
+    cut = max(trimmed.rfind('. '), trimmed.rfind('? '), trimmed.rfind('! '))
+    if cut > len(trimmed) // 2:
+        trimmed = trimmed[:cut + 1]
+    return trimmed
+
+
+def context_limit(model):
+    """Context window size of a model."""
+    for name in sorted(MODEL_CONTEXT_TOKENS, key=len, reverse=True):
+        if model.startswith(name):
+            return MODEL_CONTEXT_TOKENS[name]
+    return DEFAULT_CONTEXT_TOKENS
+
+
+def completion_cost(model, prompt_tokens, completion_tokens):
+    """USD cost of a chat completion, or 0.0 for models without a price."""
+    for name in sorted(LLM_MODELS, key=len, reverse=True):
+        if model and model.startswith(name):
+            prices = LLM_MODELS[name]
+            return (prompt_tokens * prices['prompt_cost_per_1k']
+                    + completion_tokens * prices['completion_cost_per_1k']) / 1000.0
+    return 0.0
+
+
+def current_plan():
+    """Pricing plan of the current usage context, or None outside one."""
+    context = _usage_context.get()
+    return context['plan'] if context else None
+
+
+def plan_max_tokens(plan):
+    """Completion token limit per call for a pricing plan (free plan if unknown)."""
+    return PRICING_PLANS.get(plan, PRICING_PLANS['free'])['max_tokens']
+
+
+def fits_context(text, model="gpt-3.5-turbo", reserve_tokens=1000):
+    """Whether a text fits in one prompt, leaving reserve_tokens for instructions and the reply."""
+    return count_tokens(text, model) <= context_limit(model) - reserve_tokens
+
+
+def fit_chat_request(messages, model="gpt-3.5-turbo", max_tokens=None, plan=None, min_tokens=None):
+    """
+    Fit a chat request to the model context and the user's plan budget.
+
+    The completion limit is capped at the plan's max_tokens, and if the
+    prompt plus completion would overflow the context window the longest
+    message is trimmed. Plan defaults to the current usage context.
+    min_tokens is the size a structured answer (e.g. a JSON object) needs
+    to be complete; the plan cap never cuts the limit below it, since a
+    truncated answer can't be parsed and only costs a fallback.
+
+    Returns:
+        tuple: (messages, max_tokens) to send.
+    """
+    if plan is None:
+        plan = current_plan()
+
+    budget = plan_max_tokens(plan)
+    max_tokens = min(max_tokens, budget) if max_tokens else budget
+    if min_tokens:
+        max_tokens = max(max_tokens, min_tokens)
+
+    available = context_limit(model) - max_tokens
+    prompt_tokens = count_message_tokens(messages, model)
+    if prompt_tokens <= available:
+        return messages, max_tokens
+
+    messages = [dict(message) for message in messages]
+    longest = max(messages, key=lambda message: len(message.get('content') or ''))
+    overflow = prompt_tokens - available
+    keep = count_tokens(longest['content'], model) - overflow
+    logger.warning(f"Prompt of {prompt_tokens} tokens exceeds {model} budget by {overflow}, trimming")
+    longest['content'] = trim_to_tokens(longest['content'], keep, model)
+    return messages, max_tokens
+
+
+@contextmanager
+def usage_context(db=None, user_id=None, plan=None, video_id=None):
+    """
+    Attribute LLM calls made inside the block to a user, plan and video.
+
+    Worker threads started inside the block need a copy of the context
+    (contextvars.copy_context().run) to inherit it.
+    """
+    token = _usage_context.set({'db': db, 'user_id': user_id, 'plan': plan, 'video_id': video_id})
+    try:
+        yield
+    finally:
+        _usage_context.reset(token)
+
+
+def ensure_indexes(db):
+    """Create the token usage indexes."""
+    db[COLLECTION].create_index([("user_id", ASCENDING), ("created_at", ASCENDING)])
+    db[COLLECTION].create_index([("video_id", ASCENDING)])
+
+
+def record_usage(response, call_site, model=None):
+    """
+    Record the exact token usage reported in a chat completion response.
+
+    Usage is logged and, inside a usage_context with a database, stored for
+    billing and the dashboard. Never raises.
+
+    Returns:
+        dict: The usage document, or None if the response has no usage.
+    """
+    try:
+        usage = getattr(response, 'usage', None)
+        if usage is None and isinstance(response, dict):
+            usage = response.get('usage')
+        if usage is None:
+            return None
+        if not isinstance(usage, dict):
+            usage = {
+                'prompt_tokens': usage.prompt_tokens,
+                'completion_tokens': usage.completion_tokens,
+                'total_tokens': usage.total_tokens
+            }
+
+        context = _usage_context.get() or {}
+        model = model or getattr(response, 'model', None)
+        document = {
+            'call_site': call_site,
+            'model': model,
+            'prompt_tokens': usage['prompt_tokens'],
+            'completion_tokens': usage['completion_tokens'],
+            'total_tokens': usage['total_tokens'],
+            'cost': completion_cost(model, usage['prompt_tokens'], usage['completion_tokens']),
+            'user_id': context.get('user_id'),
+            'plan': context.get('plan'),
+            'video_id': context.get('video_id'),
+            'created_at': datetime.utcnow()
+        }
+        logger.info(
+            f"{call_site}: {document['prompt_tokens']} prompt + "
+            f"{document['completion_tokens']} completion tokens"
+        )
+        if context.get('db') is not None:
+            context['db'][COLLECTION].insert_one(dict(document))
+        return document
+
+    except Exception as e:
+        logger.warning(f"Error recording token usage for {call_site}: {str(e)}")
+        return None
@@ -1,20 +1,222 @@
 import os
 import logging
-import whisper
+import threading
+import time
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
-def transcribe_audio(audio_path: str) -> str:
+DEFAULT_MODEL_SIZE = os.getenv('WHISPER_MODEL_SIZE', 'base')
+
+# 'whisper' (openai-whisper, float32 PyTorch) or 'ctranslate2' (faster-whisper, int8)
+DEFAULT_BACKEND = os.getenv('WHISPER_BACKEND', 'whisper')
+
+# CTranslate2 backend options
+CT2_COMPUTE_TYPE = os.getenv('CT2_COMPUTE_TYPE', 'int8')
+CT2_CPU_THREADS = int(os.getenv('CT2_CPU_THREADS', '0'))  # 0 lets CTranslate2 decide
+# Jobs a CTranslate2 model transcribes at once; above 1 the registry stops serializing them
+CT2_NUM_WORKERS = int(os.getenv('CT2_NUM_WORKERS', '1'))
+CT2_BATCH_SIZE = int(os.getenv('CT2_BATCH_SIZE', '1'))
+CT2_BEAM_SIZE = int(os.getenv('CT2_BEAM_SIZE', '5'))
+
+# Evict idle models when available memory drops below this many MB
+MIN_AVAILABLE_MEMORY_MB = int(os.getenv('WHISPER_MIN_AVAILABLE_MB', '1024'))
+
+class ModelRegistry:
+    """Process-wide cache of loaded Whisper models.
+
+    Each model size is loaded once per worker process and shared across
+    jobs. A per-model lock serializes inference, since a single model
+    instance is not safe to use from several threads at once. Models that
+    are (CTranslate2 with num_workers > 1) are registered as concurrent and
+    transcribe without the lock.
+    """
+
+    def __init__(self, loader, min_available_mb=MIN_AVAILABLE_MEMORY_MB, concurrent=False):
+        self._loader = loader
+        self._min_available_mb = min_available_mb
+        self._concurrent = concurrent
+        self._models = OrderedDict()  # size -> model, least recently used first
+        self._locks = {}
+        self._active = {}  # size -> transcriptions in progress
+        self._last_used = {}
+        self._registry_lock = threading.Lock()
+
+    def _model_lock(self, size):
+        with self._registry_lock:
+            return self._locks.setdefault(size, threading.Lock())
+
+    def get(self, size=DEFAULT_MODEL_SIZE):
+        """Return the model for a size, loading it on first use."""
+        with self._model_lock(size):
+            with self._registry_lock:
+                model = self._models.get(size)
+                if model is not None:
+                    self._models.move_to_end(size)
+                    self._last_used[size] = time.monotonic()
+                    return model
+
+            self.evict_under_pressure(keep=size)
+            logger.info(f"Loading Whisper model '{size}'")
+            started = time.perf_counter()
+            model = self._loader(size)
+            logger.info(f"Loaded Whisper model '{size}' in {time.perf_counter() - started:.1f}s")
+
+            with self._registry_lock:
+                self._models[size] = model
+                self._last_used[size] = time.monotonic()
+            return model
+
+    def transcribe(self, audio_path, size=DEFAULT_MODEL_SIZE, **options):
+        """Run transcription on a shared model, one job at a time per model unless concurrent."""
+        model = self.get(size)
+        if not self._concurrent:
+            with self._model_lock(size):
+                self._last_used[size] = time.monotonic()
+                return model.transcribe(audio_path, **options)
+
+        with self._registry_lock:
+            self._active[size] = self._active.get(size, 0) + 1
+            self._last_used[size] = time.monotonic()
+        try:
+            return model.transcribe(audio_path, **options)
+        finally:
+            with self._registry_lock:
+                self._active[size] -= 1
+
+    def preload(self, sizes=None):
+        """Load models ahead of the first job, e.g. at worker start."""
+        for size in sizes or [DEFAULT_MODEL_SIZE]:
+            self.get(size)
+
+    def evict(self, size):
+        """Drop a model so its memory can be reclaimed."""
+        with self._registry_lock:
+            model = self._models.pop(size, None)
+            self._last_used.pop(size, None)
+        if model is not None:
+            logger.info(f"Evicted Whisper model '{size}'")
+        return model is not None
+
+    def evict_under_pressure(self, keep=None):
+        """Evict least recently used models while available memory is low."""
+        while _available_memory_mb() < self._min_available_mb:
+            with self._registry_lock:
+                candidates = [size for size in self._models if size != keep and not self._active.get(size)]
+            # Never evict a model that is in the middle of a transcription
+            idle = [size for size in candidates if not self._model_lock(size).locked()]
+            if not idle:
+                break
+            self.evict(idle[0])
+
+    def loaded_sizes(self):
+        """Sizes currently held in memory, least recently used first."""
+        with self._registry_lock:
+            return list(self._models)
+
+def _available_memory_mb():
+    """Available system memory in MB (infinite if it cannot be read)."""
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return float('inf')
+
+def _load_whisper_model(size):
+    """Load an openai-whisper model."""
+    import whisper
+    return whisper.load_model(size)
+
+class CTranslate2Model:
+    """faster-whisper model exposing the openai-whisper transcribe() result shape."""
+
+    def __init__(self, size, compute_type=CT2_COMPUTE_TYPE, cpu_threads=CT2_CPU_THREADS,
+                 num_workers=CT2_NUM_WORKERS, batch_size=CT2_BATCH_SIZE, beam_size=CT2_BEAM_SIZE):
+        from faster_whisper import WhisperModel
+
+        self.model = WhisperModel(
+            size,
+            device="cpu",
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+            num_workers=num_workers
+        )
+        self.batch_size = batch_size
+        self.beam_size = beam_size
+        self.pipeline = None
+        if batch_size > 1:
+            from faster_whisper import BatchedInferencePipeline
+            self.pipeline = BatchedInferencePipeline(model=self.model)
+
+    def transcribe(self, audio_path, **options):
+        options.setdefault("beam_size", self.beam_size)
+        if self.pipeline is not None:
+            segments, info = self.pipeline.transcribe(audio_path, batch_size=self.batch_size, **options)
+        else:
+            segments, info = self.model.transcribe(audio_path, **options)
+
+        # Segments are generated lazily; decoding happens while iterating
+        segments = [
+            {"start": segment.start, "end": segment.end, "text": segment.text.strip()}
+            for segment in segments
+        ]
+        return {
+            "text": " ".join(segment["text"] for segment in segments).strip(),
+            "segments": segments,
+            "language": info.language,
+            "duration": info.duration
+        }
+
+# Shared by every job in this worker process, one registry per backend
+model_registries = {
+    'whisper': ModelRegistry(_load_whisper_model),
+    'ctranslate2': ModelRegistry(CTranslate2Model, concurrent=CT2_NUM_WORKERS > 1)
+}
+
+def get_registry(backend=None):
+    """Return the model registry for a backend."""
+    backend = backend or DEFAULT_BACKEND
+    if backend not in model_registries:
+        raise ValueError(f"Unknown transcription backend: {backend}")
+    return model_registries[backend]
+
+def preload_models(sizes=None, backend=None):
+    """Warm the model cache at worker start."""
+    get_registry(backend).preload(sizes)
+
+def transcribe_audio_verbose(audio_path: str, model_size: str = DEFAULT_MODEL_SIZE, backend: str = None) -> dict:
+    """Transcribe audio using Whisper, keeping segment timestamps."""
+    try:
+        result = get_registry(backend).transcribe(audio_path, model_size)
+
+        return {
+            "text": result["text"].strip(),
+            "segments": [
+                {"start": segment["start"], "end": segment["end"], "text": segment["text"].strip()}
+                for segment in result.get("segments", [])
+            ],
+            "language": result.get("language"),
+            "duration": result.get("duration") or (result["segments"][-1]["end"] if result.get("segments") else None)
+        }
+
+    except Exception as e:
+        logger.error(f"Error transcribing audio: {str(e)}")
+        return None
+
+def transcribe_audio(audio_path: str, model_size: str = DEFAULT_MODEL_SIZE, backend: str = None) -> str:
     """Transcribe audio using Whisper."""
     try:
-        # Load Whisper model
-        model = whisper.load_model("base")
-        
-        # Transcribe audio
-        result = model.transcribe(audio_path)
-        
+        # Transcribe audio on the cached model
+        result = get_registry(backend).transcribe(audio_path, model_size)
+
         return result["text"]
-        
+
     except Exception as e:
         logger.error(f"Error transcribing audio: {str(e)}")
         return None
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+
+import gridfs
+import zstandard as zstd
+from bson.binary import Binary
+from pymongo import ASCENDING
+
+from corpus_idf import update_document_frequencies
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+COLLECTION = "transcripts"
+GRIDFS_BUCKET = "transcript_blobs"
+
+COMPRESSION_LEVEL = int(os.getenv('TRANSCRIPT_ZSTD_LEVEL', '10'))
+
+# Compressed payloads above this size go to GridFS (documents are capped at 16 MB)
+GRIDFS_THRESHOLD_BYTES = int(os.getenv('TRANSCRIPT_GRIDFS_THRESHOLD', str(4 * 1024 * 1024)))
+
+
+def content_hash(text):
+    """Stable hash of the transcript text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def compress_transcript(text, segments=None):
+    """Serialize text and segments to a zstd-compressed payload."""
+    payload = json.dumps({"text": text, "segments": segments or []}, separators=(',', ':'))
+    return zstd.ZstdCompressor(level=COMPRESSION_LEVEL).compress(payload.encode('utf-8'))
+
+
+def decompress_transcript(data):
+    """Inverse of compress_transcript."""
+    return json.loads(zstd.ZstdDecompressor().decompress(data).decode('utf-8'))
+
+
+def ensure_indexes(db):
+    """Create the transcript collection indexes."""
+    db[COLLECTION].create_index([("video_id", ASCENDING)], unique=True)
+    db[COLLECTION].create_index([("content_hash", ASCENDING)])
+
+
+def save_transcript(db, video_id, text, segments=None, language=None, duration=None, **extra):
+    """
+    Persist a transcript with its timestamped segments.
+
+    Args:
+        db: pymongo database handle.
+        video_id (str): Video the transcript belongs to.
+        text (str): Full transcript text.
+        segments (list): Whisper segments with start, end and text.
+        language (str): Detected language.
+        duration (float): Audio duration in seconds.
+        **extra: Additional metadata fields to store.
+
+    Returns:
+        str: Content hash of the transcript.
+    """
+    digest = content_hash(text)
+    data = compress_transcript(text, segments)
+
+    document = {
+        "video_id": video_id,
+        "content_hash": digest,
+        "codec": "zstd",
+        "size": len(text),
+        "compressed_size": len(data),
+        "segment_count": len(segments or []),
+        "language": language,
+        "duration": duration,
+        "updated_at": datetime.utcnow(),
+        **extra
+    }
+
+    existing = db[COLLECTION].find_one({"video_id": video_id}, {"gridfs_id": 1, "content_hash": 1})
+
+    fs = gridfs.GridFS(db, collection=GRIDFS_BUCKET)
+    unset = {}
+    if len(data) > GRIDFS_THRESHOLD_BYTES:
+        document["gridfs_id"] = fs.put(data, filename=f"{video_id}.json.zst")
+        unset["data"] = ""
+    else:
+        document["data"] = Binary(data)
+        unset["gridfs_id"] = ""
+    # Section summaries describe the text they were made from
+    if existing and existing.get("content_hash") != digest:
+        unset["section_summaries"] = ""
+
+    update = {"$set": document, "$unset": unset}
+    db[COLLECTION].update_one({"video_id": video_id}, update, upsert=True)
+
+    # Drop the blob of the transcript we just replaced
+    if existing and existing.get("gridfs_id") and existing["gridfs_id"] != document.get("gridfs_id"):
+        fs.delete(existing["gridfs_id"])
+
+    # New videos extend the corpus IDF table; re-saves aren't counted twice
+    if existing is None:
+        try:
+            update_document_frequencies(db, text)
+        except Exception as e:
+            logger.warning(f"Error updating corpus IDF for video {video_id}: {str(e)}")
+
+    logger.info(
+        f"Saved transcript for video {video_id}: {len(text)} chars -> "
+        f"{len(data)} bytes ({'gridfs' if 'gridfs_id' in document else 'inline'})"
+    )
+    return digest
+
+
+def load_transcript(db, video_id=None, content_hash=None):
+    """
+    Load a stored transcript by video ID or content hash.
+
+    Returns:
+        dict: Stored metadata plus "text" and "segments", or None.
+    """
+    if video_id:
+        query = {"video_id": video_id}
+    elif content_hash:
+        query = {"content_hash": content_hash}
+    else:
+        raise ValueError("video_id or content_hash is required")
+
+    document = db[COLLECTION].find_one(query)
+    if not document:
+        return None
+
+    if document.get("gridfs_id"):
+        data = gridfs.GridFS(db, collection=GRIDFS_BUCKET).get(document["gridfs_id"]).read()
+    else:
+        data = document["data"]
+
+    document.update(decompress_transcript(data))
+    document.pop("data", None)
+    return document
+
+
+def load_content_hash(db, video_id):
+    """Content hash of a video's stored transcript, or None."""
+    document = db[COLLECTION].find_one({"video_id": video_id}, {"content_hash": 1})
+    return (document or {}).get("content_hash")
+
+
+def save_section_summaries(db, video_id, transcript_hash, sections, section_tokens):
+    """
+    Store the section summaries of a stored transcript.
+
+    They are only stored if the transcript still has this content hash,
+    and are dropped when save_transcript replaces its text.
+
+    Args:
+        db: pymongo database handle.
+        video_id (str): Video the transcript belongs to.
+        transcript_hash (str): Content hash of the summarized text.
+        sections (list): Section summaries in transcript order.
+        section_tokens (int): Section size the transcript was split with.
+
+    Returns:
+        bool: Whether a transcript was updated.
+    """
+    result = db[COLLECTION].update_one(
+        {"video_id": video_id, "content_hash": transcript_hash},
+        {"$set": {
+            "section_summaries": {
+                "section_tokens": section_tokens,
+                "sections": sections,
+                "created_at": datetime.utcnow()
+            }
+        }}
+    )
+    return result.matched_count > 0
+
+
+def load_section_summaries(db, video_id, transcript_hash, section_tokens):
+    """
+    Section summaries stored for this exact transcript text and section size.
+
+    Returns:
+        list: Section summaries in transcript order, or None.
+    """
+    document = db[COLLECTION].find_one(
+        {"video_id": video_id, "content_hash": transcript_hash},
+        {"section_summaries": 1}
+    )
+    stored = (document or {}).get("section_summaries")
+    if not stored or stored.get("section_tokens") != section_tokens:
+        return None
+    return stored.get("sections")
@@ -1,8 +1,13 @@
 import os
 import logging
+import math
+import tempfile
 from pydub import AudioSegment
-from openai import OpenAI
 from dotenv import load_dotenv
+from config import TRANSCRIPTION_CONFIG
+from config.pricing import PRICING_PLANS
+from preprocess_audio import speed_up_audio, estimate_speech_rate, extract_audio_segment, probe_duration
+from llm_dispatcher import dispatcher
 
 # Load environment variables
 load_dotenv()
@@ -11,9 +16,6 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-
 def convert_to_wav(input_file, output_file):
     """Convert audio file to WAV format."""
     try:
@@ -26,16 +28,210 @@ def convert_to_wav(input_file, output_file):
         logger.error(f"Error converting audio: {e}")
         return False
 
-def transcribe_audio(audio_file):
+def choose_speed_factor(audio_file, plan=None):
+    """
+    Pick the tempo factor to apply before transcription.
+
+    Args:
+        audio_file (str): Path to the audio file.
+        plan (str): Pricing plan id of the requesting user.
+
+    Returns:
+        float: Speed factor (1.0 means unchanged audio).
+    """
+    mode = TRANSCRIPTION_CONFIG['speed_mode']
+    max_factor = TRANSCRIPTION_CONFIG['max_speed_factor']
+    try:
+        if mode == 'plan':
+            factor = PRICING_PLANS.get(plan or 'free', {}).get('transcription_speed', 1.0)
+        elif mode == 'auto':
+            rate = estimate_speech_rate(audio_file)
+            if rate <= 0:
+                return 1.0
+            factor = TRANSCRIPTION_CONFIG['target_speech_rate'] / rate
+            logger.info(f"Estimated speech rate: {rate:.2f} syllables/s")
+        else:
+            return 1.0
+    except Exception as e:
+        logger.warning(f"Error choosing speed factor, using 1.0: {e}")
+        return 1.0
+
+    # Round down to 0.05 steps and clamp to the configured range
+    factor = int(min(max(factor, 1.0), max_factor) * 20) / 20.0
+    logger.info(f"Transcription speed factor: {factor}x")
+    return factor
+
+def rescale_segments(segments, speed_factor):
+    """Map segment timestamps of accelerated audio back to real time."""
+    rescaled = []
+    for segment in segments:
+        segment = dict(segment)
+        segment['start'] = round(segment['start'] * speed_factor, 3)
+        segment['end'] = round(segment['end'] * speed_factor, 3)
+        rescaled.append(segment)
+    return rescaled
+
+def transcribe_audio_verbose(audio_file, speed_factor=1.0):
+    """
+    Transcribes an audio file with segment timestamps.
+    
+    Args:
+        audio_file (str): Path to the audio file.
+        speed_factor (float): Tempo applied with ffmpeg atempo before upload.
+        
+    Returns:
+        dict: {"text", "segments", "language", "duration"}, with timestamps
+        in real (unaccelerated) time, or None on failure.
+    """
+    sped_up_file = None
+    try:
+        if not os.path.exists(audio_file):
+            logger.error(f"Audio file not found: {audio_file}")
+            return None
+
+        upload_file = audio_file
+        if speed_factor and speed_factor != 1.0:
+            fd, sped_up_file = tempfile.mkstemp(suffix=".mp3")
+            os.close(fd)
+            upload_file = speed_up_audio(audio_file, sped_up_file, speed_factor)
+            logger.info(f"Accelerated audio {speed_factor}x for transcription")
+        else:
+            speed_factor = 1.0
+
+        logger.info(f"Transcribing {upload_file}...")
+        with open(upload_file, "rb") as audio:
+            response = dispatcher.transcription(
+                model="whisper-1",
+                file=audio,
+                response_format="verbose_json"
+            )
+
+        text = (response.text or "").strip()
+        if not text:
+            logger.error("Empty transcript generated")
+            return None
+
+        segments = [
+            {"start": s.start, "end": s.end, "text": s.text.strip()}
+            for s in (response.segments or [])
+        ]
+        logger.info(f"Transcription successful. Length: {len(text)} chars, {len(segments)} segments")
+        return {
+            "text": text,
+            "segments": rescale_segments(segments, speed_factor),
+            "language": getattr(response, "language", None),
+            "duration": (getattr(response, "duration", None) or 0) * speed_factor
+        }
+
+    except Exception as e:
+        logger.error(f"Error transcribing audio: {e}")
+        return None
+    finally:
+        if sped_up_file and os.path.exists(sped_up_file):
+            os.remove(sped_up_file)
+
+def stitch_segments(segments, last_end=None, cut=None):
+    """
+    Segments of one chunk that belong in the stitched transcript.
+
+    Args:
+        segments (list): Chunk segments with timestamps in full-audio time.
+        last_end (float): End of the last segment kept from earlier chunks;
+            segments mostly before it were already transcribed there.
+        cut (float): Start of the next chunk; segments starting in the
+            overlap after it are left to that chunk, which hears them whole.
+
+    Returns:
+        list: Kept segments, in order.
+    """
+    kept = []
+    for segment in segments:
+        if cut is not None and segment["start"] >= cut:
+            continue
+        if last_end is not None and (segment["start"] + segment["end"]) / 2 <= last_end:
+            continue
+        kept.append(segment)
+    return kept
+
+def iter_transcribe_chunks(audio_file, chunk_seconds=None, speed_factor=1.0, overlap_seconds=None):
+    """
+    Transcribes an audio file chunk by chunk, yielding each as it completes.
+
+    Each chunk is cut from the file with ffmpeg, so the whole audio is never
+    decoded in memory, and overlaps the next one by overlap_seconds;
+    segments transcribed twice in an overlap are only kept once.
+
+    Args:
+        audio_file (str): Path to the audio file.
+        chunk_seconds (int): Chunk length, defaults to TRANSCRIPTION_CONFIG.
+        speed_factor (float): Tempo applied before upload.
+        overlap_seconds (float): Overlap between chunks, defaults to
+            TRANSCRIPTION_CONFIG.
+        
+    Yields:
+        dict: {"index", "count", "offset", "text", "segments", "language",
+        "duration"} with segment timestamps relative to the start of the
+        full audio and duration of the full audio.
+    """
+    chunk_seconds = chunk_seconds or TRANSCRIPTION_CONFIG['chunk_seconds']
+    if overlap_seconds is None:
+        overlap_seconds = TRANSCRIPTION_CONFIG['chunk_overlap_seconds']
+    duration = probe_duration(audio_file)
+    count = max(1, math.ceil(duration / chunk_seconds))
+    logger.info(f"Transcribing {audio_file} in {count} chunk(s)")
+
+    last_end = None
+    for index in range(count):
+        offset = float(index * chunk_seconds)
+        cut = offset + chunk_seconds if index < count - 1 else None
+        fd, chunk_file = tempfile.mkstemp(suffix=".mp3")
+        os.close(fd)
+        try:
+            extract_audio_segment(audio_file, chunk_file, offset, chunk_seconds + overlap_seconds)
+            result = transcribe_audio_verbose(chunk_file, speed_factor)
+        finally:
+            os.remove(chunk_file)
+
+        if not result:
+            raise Exception(f"Failed to transcribe chunk {index + 1}/{count}")
+
+        segments = [
+            dict(segment, start=segment["start"] + offset, end=segment["end"] + offset)
+            for segment in result["segments"]
+        ]
+        if segments:
+            segments = stitch_segments(segments, last_end, cut)
+            text = " ".join(segment["text"] for segment in segments)
+            if segments:
+                last_end = segments[-1]["end"]
+        else:
+            text = result["text"]
+        logger.info(f"Transcribed chunk {index + 1}/{count}")
+        yield {
+            "index": index,
+            "count": count,
+            "offset": offset,
+            "text": text,
+            "segments": segments,
+            "language": result["language"],
+            "duration": duration
+        }
+
+def transcribe_audio(audio_file, speed_factor=1.0):
     """
     Transcribes an audio file using OpenAI's Whisper API.
     
     Args:
         audio_file (str): Path to the audio file.
+        speed_factor (float): Optional tempo applied before upload.
         
     Returns:
         str: Transcription text.
     """
+    if speed_factor and speed_factor != 1.0:
+        result = transcribe_audio_verbose(audio_file, speed_factor)
+        return result["text"] if result else ""
+
     try:
         if not os.path.exists(audio_file):
             logger.error(f"Audio file not found: {audio_file}")
@@ -44,7 +240,7 @@ def transcribe_audio(audio_file):
         logger.info(f"Transcribing {audio_file}...")
         
         with open(audio_file, "rb") as audio:
-            response = client.audio.transcriptions.create(
+            response = dispatcher.transcription(
                 model="whisper-1",
                 file=audio,
                 response_format="text"
@@ -0,0 +1,168 @@
+import logging
+from datetime import datetime
+
+from pymongo import ASCENDING
+from youtube_transcript_api import YouTubeTranscriptApi
+
+from config.transcription_routing import TRANSCRIPTION_ENGINES, TRANSCRIPTION_ROUTING, SHORT_CLIP_SECONDS
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+COLLECTION = "transcription_routing"
+
+
+def _base_language(language):
+    """Primary language subtag, e.g. 'en' for 'en-US'."""
+    return language.lower().split('-')[0] if language else None
+
+
+def caption_track(metadata, caption_policy):
+    """
+    Pick a caption track in the video's own language, if the policy allows it.
+
+    Returns:
+        str: Caption language code to fetch, or None.
+    """
+    language = _base_language(metadata.get('language'))
+    if caption_policy == 'none' or not language:
+        return None
+
+    tracks = list(metadata.get('manual_captions', []))
+    if caption_policy == 'any':
+        tracks += metadata.get('automatic_captions', [])
+
+    for track in tracks:
+        if _base_language(track) == language:
+            return track
+    return None
+
+
+def estimate_engine(engine, duration):
+    """Estimated (cost in USD, latency in seconds) of an engine for a job."""
+    cost = engine['cost_per_minute'] * duration / 60.0
+    latency = engine['overhead_seconds'] + engine['realtime_factor'] * duration
+    return cost, latency
+
+
+def route_transcription(metadata, plan=None):
+    """
+    Choose the transcription engine and model size for a job.
+
+    Args:
+        metadata (dict): Probe metadata (duration, language, caption tracks).
+        plan (str): Pricing plan id of the requesting user.
+
+    Returns:
+        dict: Routing decision with engine, model, reason and estimates.
+    """
+    plan = plan if plan in TRANSCRIPTION_ROUTING else 'free'
+    policy = TRANSCRIPTION_ROUTING[plan]
+    duration = metadata.get('duration') or 0
+    english = _base_language(metadata.get('language')) == 'en'
+
+    track = caption_track(metadata, policy['captions'])
+    if track:
+        route = 'captions'
+        reason = f"captions available in {track}"
+    else:
+        candidates = []
+        for name, engine in TRANSCRIPTION_ENGINES.items():
+            if engine['engine'] == 'captions':
+                continue
+            # English-only models need a confirmed English source
+            if not engine['multilingual'] and not english:
+                continue
+            cost, latency = estimate_engine(engine, duration)
+            candidates.append((name, engine, cost, latency))
+
+        acceptable = [c for c in candidates if c[1]['quality'] >= policy['min_quality']] or candidates
+        within_cost = [c for c in acceptable if c[2] <= policy['max_cost_per_job']]
+        within_targets = [c for c in within_cost if c[3] <= policy['target_latency_seconds']]
+
+        if duration <= SHORT_CLIP_SECONDS:
+            chosen = max(acceptable, key=lambda c: (c[1]['quality'], -c[2]))
+            reason = "short clip, highest quality"
+        elif within_targets:
+            chosen = max(within_targets, key=lambda c: (c[1]['quality'], -c[2]))
+            reason = "highest quality within cost and latency targets"
+        elif within_cost:
+            chosen = min(within_cost, key=lambda c: c[3])
+            reason = "no engine meets latency target, fastest within cost"
+        else:
+            chosen = min(acceptable, key=lambda c: c[2])
+            reason = "no engine within cost target, cheapest"
+        route = chosen[0]
+
+    engine = TRANSCRIPTION_ENGINES[route]
+    cost, latency = estimate_engine(engine, duration)
+    decision = {
+        'route': route,
+        'engine': engine['engine'],
+        'model': engine['model'],
+        'caption_language': track,
+        'plan': plan,
+        'reason': reason,
+        'estimated_cost': round(cost, 5),
+        'estimated_latency': round(latency, 1),
+        'video_id': metadata.get('video_id'),
+        'duration': duration,
+        'language': metadata.get('language'),
+        'manual_captions': bool(metadata.get('manual_captions')),
+        'automatic_captions': bool(metadata.get('automatic_captions'))
+    }
+    logger.info(
+        f"Routing video {decision['video_id']} to {route} ({reason}); "
+        f"estimated ${decision['estimated_cost']}, {decision['estimated_latency']}s"
+    )
+    return decision
+
+
+def ensure_indexes(db):
+    """Create the routing log indexes."""
+    db[COLLECTION].create_index([("video_id", ASCENDING)])
+    db[COLLECTION].create_index([("route", ASCENDING), ("created_at", ASCENDING)])
+
+
+def log_routing_decision(db, decision):
+    """Store a routing decision so the policy can be tuned later."""
+    document = dict(decision, created_at=datetime.utcnow())
+    return db[COLLECTION].insert_one(document).inserted_id
+
+
+def record_routing_outcome(db, decision_id, success, latency_seconds, error=None, word_count=None):
+    """Attach the actual outcome of a routed job to its decision."""
+    outcome = {
+        'success': success,
+        'latency_seconds': round(latency_seconds, 2),
+        'error': error,
+        'word_count': word_count,
+        'completed_at': datetime.utcnow()
+    }
+    db[COLLECTION].update_one({'_id': decision_id}, {'$set': {'outcome': outcome}})
+    logger.info(f"Routing outcome for {decision_id}: success={success}, latency={latency_seconds:.1f}s")
+
+
+def fetch_captions(video_id, language):
+    """
+    Fetch a caption track in the same shape as a transcription result.
+
+    Returns:
+        dict: {"text", "segments", "language", "duration"}
+    """
+    entries = YouTubeTranscriptApi.get_transcript(video_id, languages=[language])
+    segments = [
+        {
+            'start': entry['start'],
+            'end': entry['start'] + entry['duration'],
+            'text': ' '.join(entry['text'].split())
+        }
+        for entry in entries if entry['text'].strip()
+    ]
+    return {
+        'text': ' '.join(segment['text'] for segment in segments),
+        'segments': segments,
+        'language': language,
+        'duration': segments[-1]['end'] if segments else 0
+    }
@@ -0,0 +1,41 @@
+"""Benchmark fixture loading."""
+import os
+
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.m4a')
+
+def load_audio_fixtures(fixture_dir):
+    """
+    Yield (audio_path, reference_text) pairs from a fixture directory.
+
+    Each audio file needs a reference transcript next to it with the same
+    name and a .txt extension.
+    """
+    for name in sorted(os.listdir(fixture_dir)):
+        if not name.lower().endswith(AUDIO_EXTENSIONS):
+            continue
+        audio_path = os.path.join(fixture_dir, name)
+        reference_path = os.path.splitext(audio_path)[0] + '.txt'
+        if not os.path.exists(reference_path):
+            print(f"Skipping {name}: no reference transcript")
+            continue
+        with open(reference_path, encoding='utf-8') as f:
+            yield audio_path, f.read()
+
+def load_summary_fixtures(fixture_dir):
+    """
+    Yield (name, transcript, reference_summary) triples from a fixture directory.
+
+    Each transcript NAME.txt may have a reference summary next to it in
+    NAME.summary.txt; the reference is None without one.
+    """
+    for name in sorted(os.listdir(fixture_dir)):
+        if not name.endswith('.txt') or name.endswith('.summary.txt'):
+            continue
+        with open(os.path.join(fixture_dir, name), encoding='utf-8') as f:
+            transcript = f.read()
+        reference_path = os.path.join(fixture_dir, name[:-len('.txt')] + '.summary.txt')
+        reference = None
+        if os.path.exists(reference_path):
+            with open(reference_path, encoding='utf-8') as f:
+                reference = f.read()
+        yield name, transcript, reference
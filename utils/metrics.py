@@ -0,0 +1,81 @@
+"""Quality metrics used by the benchmark scripts."""
+import re
+
+def normalize_words(text):
+    """Lowercase and strip punctuation before comparing transcripts."""
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+def word_error_rate(reference, hypothesis):
+    """
+    Word error rate between a reference and a hypothesis transcript.
+
+    Args:
+        reference (str): Ground-truth transcript.
+        hypothesis (str): Transcript to score.
+
+    Returns:
+        float: (substitutions + deletions + insertions) / reference words.
+    """
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    # Single-row Levenshtein distance over words
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+def _f1(overlap, reference_count, candidate_count):
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / candidate_count, overlap / reference_count
+    return 2 * precision * recall / (precision + recall)
+
+def rouge_n(reference, candidate, n=1):
+    """
+    ROUGE-N F1 between a reference and a candidate summary.
+
+    Args:
+        reference (str): Reference summary.
+        candidate (str): Summary to score.
+        n (int): N-gram size.
+
+    Returns:
+        float: F1 of the clipped n-gram overlap.
+    """
+    def ngrams(words):
+        counts = {}
+        for i in range(len(words) - n + 1):
+            gram = tuple(words[i:i + n])
+            counts[gram] = counts.get(gram, 0) + 1
+        return counts
+
+    ref = ngrams(normalize_words(reference))
+    cand = ngrams(normalize_words(candidate))
+    overlap = sum(min(count, ref.get(gram, 0)) for gram, count in cand.items())
+    return _f1(overlap, sum(ref.values()), sum(cand.values()))
+
+def rouge_l(reference, candidate):
+    """ROUGE-L F1 (longest common word subsequence) between two summaries."""
+    ref = normalize_words(reference)
+    cand = normalize_words(candidate)
+    if not ref or not cand:
+        return 0.0
+
+    # Single-row LCS table over words
+    previous = [0] * (len(cand) + 1)
+    for ref_word in ref:
+        current = [0]
+        for j, cand_word in enumerate(cand, 1):
+            current.append(previous[j - 1] + 1 if ref_word == cand_word else max(previous[j], current[j - 1]))
+        previous = current
+    return _f1(previous[-1], len(ref), len(cand))
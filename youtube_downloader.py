@@ -70,3 +70,36 @@ def download_audio(video_url):
     except Exception as e:
         logger.error(f"Error in download_audio: {str(e)}", exc_info=True)
         raise Exception(f"Failed to download audio: {str(e)}")
+
+def probe_video(video_url):
+    """
+    Fetch video metadata without downloading anything.
+
+    Args:
+        video_url (str): URL of the YouTube video.
+
+    Returns:
+        dict: video_id, title, duration (seconds), language, and the
+        languages of manual and automatic caption tracks.
+    """
+    ydl_opts = {
+        'quiet': True,
+        'no_warnings': True,
+        'skip_download': True,
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(video_url, download=False)
+
+    metadata = {
+        'video_id': info.get('id'),
+        'title': info.get('title'),
+        'duration': info.get('duration') or 0,
+        'language': info.get('language'),
+        'manual_captions': sorted((info.get('subtitles') or {}).keys()),
+        'automatic_captions': sorted((info.get('automatic_captions') or {}).keys()),
+    }
+    logger.info(
+        f"Probed video {metadata['video_id']}: {metadata['duration']}s, "
+        f"language={metadata['language']}, manual captions={metadata['manual_captions']}"
+    )
+    return metadata